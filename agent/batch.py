@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Aria Batch Generation - Generates documents for many job postings in one go.
+
+Reads postings from a JSON file (a list, or {"items": [...]}) or a JSON Lines file,
+using the same fields as POST /api/generate/: jobDescription, companyName,
+positionTitle and, for a cover letter only, resumePdfFile. Results are printed and
+appended to the output file as each posting finishes.
+"""
+
+import sys
+import json
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.config.settings import settings
+from src.workflows.batch import BatchRunner
+from src.api.utils.request_parsers import parse_generation_item
+
+
+def load_postings(path: str) -> list:
+    with open(path, "r") as f:
+        content = f.read()
+
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        # JSON Lines: one posting per line
+        return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    if isinstance(data, dict):
+        data = data.get("items", [])
+    return data
+
+
+def to_item(posting: dict) -> dict:
+    if not isinstance(posting, dict):
+        raise ValueError("must be an object with the posting's fields")
+    kind, payload = parse_generation_item(posting)
+    return {"kind": kind, "payload": payload, "generation_id": posting.get("generationId")}
+
+
+def main():
+    """
+    Main entry point for batch generation.
+    """
+    parser = argparse.ArgumentParser(description="Generate resumes and cover letters for many postings")
+    parser.add_argument("postings", help="JSON or JSON Lines file of postings")
+    parser.add_argument("--concurrency", type=int, default=settings.batch_max_concurrency,
+                        help=f"Generations to run at once (at most BATCH_MAX_CONCURRENCY={settings.batch_max_concurrency})")
+    parser.add_argument("--output", default="batch_results.jsonl",
+                        help="File to append one JSON result per posting to")
+    args = parser.parse_args()
+
+    try:
+        postings = load_postings(args.postings)
+        items = []
+        for index, posting in enumerate(postings):
+            try:
+                items.append(to_item(posting))
+            except ValueError as e:
+                raise ValueError(f"Posting {index}: {e}")
+    except Exception as e:
+        print(f"❌ Could not read postings: {e}")
+        sys.exit(1)
+
+    print(f"📦 Generating documents for {len(items)} postings ({args.concurrency} at a time)")
+    failures = 0
+    try:
+        with open(args.output, "a") as output:
+            for result in BatchRunner.run(items, concurrency=args.concurrency):
+                posting = postings[result["index"]]
+                label = f"{posting['positionTitle']} at {posting['companyName']}"
+                if result["status"] == "success":
+                    print(f"✅ [{result['index']}] {label} ({result['seconds']}s)")
+                else:
+                    failures += 1
+                    print(f"❌ [{result['index']}] {label}: {result.get('message', result['status'])}")
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+    except KeyboardInterrupt:
+        print("\n🛑 Batch interrupted, unfinished postings were cancelled")
+        sys.exit(130)
+
+    print(f"🏁 Batch finished: {len(items) - failures} succeeded, {failures} failed. Results in {args.output}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark resume compilation with and without the precompiled preamble format.
+
+Compiles the same sample resume several times in each mode and prints the
+per-document compile time. The PDF build cache is turned off so every run really
+invokes pdflatex. The first compile with the format also builds it; that one-off
+cost is reported separately.
+"""
+
+import time
+import argparse
+import tempfile
+import statistics
+from src.config.settings import settings
+from src.format.latex_formatter import LatexFormatter
+from src.format.latex_compiler import LatexCompiler
+from src.format.latex_format import preamble_formats
+
+SAMPLE_EXPERIENCE = """
+\\resumeSubheading
+{Software Engineer}{Jan 2024 -- Present}
+{Example Corp}{Toronto, Canada}
+\\resumeItemListStart
+    \\resumeItem{Built and operated services handling millions of requests per day.}
+    \\resumeItem{Cut build times in half by caching intermediate artifacts.}
+\\resumeItemListEnd
+"""
+
+SAMPLE_PROJECT = """
+\\resumeProjectHeading
+{\\textbf{Aria} $|$ \\emph{Python, LangGraph, PostgreSQL}}{2025}
+\\resumeItemListStart
+    \\resumeItem{Generates tailored resumes and cover letters from job postings.}
+\\resumeItemListEnd
+"""
+
+
+def sample_resume() -> str:
+    return LatexFormatter.format_resume(
+        highlights="\\resumeItem{Five years of backend and ML engineering.}\n" * 4,
+        experiences=SAMPLE_EXPERIENCE * 3,
+        skills="\\textbf{Languages}: Python, Go, SQL \\\\",
+        projects=SAMPLE_PROJECT * 3
+    )
+
+
+def time_compiles(latex_code: str, runs: int, preamble=None) -> list:
+    timings = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            result = LatexCompiler.compile_latex(latex_code, output_dir, "benchmark.tex", preamble=preamble)
+            timings.append(time.perf_counter() - start_time)
+            if result["pdf_file"] is None:
+                raise RuntimeError("Compilation failed, see the output above")
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    print(f"{label:<22} mean {statistics.mean(timings):.3f}s  "
+          f"median {statistics.median(timings):.3f}s  "
+          f"min {min(timings):.3f}s  ({len(timings)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume PDF compilation")
+    parser.add_argument("--runs", type=int, default=5, help="Compiles per mode")
+    args = parser.parse_args()
+
+    latex_code = sample_resume()
+    preamble = LatexFormatter.resume_preamble()
+
+    # Every run compiles the same source, which the PDF cache would otherwise serve
+    # after the first one; time pdflatex, not a file copy
+    settings.latex_pdf_cache_enabled = False
+
+    print("📏 Compiling without the precompiled format...")
+    baseline = time_compiles(latex_code, args.runs)
+
+    if not settings.latex_precompiled_format:
+        print("⚠️ LATEX_PRECOMPILED_FORMAT is disabled, enable it to compare")
+        report("full preamble", baseline)
+        return
+
+    print("⚙️ Building the preamble format...")
+    start_time = time.perf_counter()
+    if preamble_formats.get_format(preamble) is None:
+        print("❌ Could not build the format (is mylatexformat installed?)")
+        report("full preamble", baseline)
+        return
+    build_seconds = time.perf_counter() - start_time
+
+    print("📏 Compiling with the precompiled format...")
+    precompiled = time_compiles(latex_code, args.runs, preamble=preamble)
+
+    print()
+    report("full preamble", baseline)
+    report("precompiled format", precompiled)
+    print(f"{'format build':<22} {build_seconds:.3f}s (once per template)")
+    speedup = statistics.median(baseline) / statistics.median(precompiled)
+    print(f"🚀 Median speedup: {speedup:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -30,11 +30,17 @@ def main():
     if not db.backfill_embeddings():
         print("⚠️ Warning: Failed to backfill embeddings (this is OK if no existing jobs)")
     
+    # Move similarity search into Postgres
+    print("5️⃣ Enabling pgvector nearest-neighbour search...")
+    if not db.enable_pgvector():
+        print("⚠️ Warning: pgvector unavailable, similarity search will run in Python")
+    
     print("✅ Database setup completed successfully!")
     print("\n📋 Available API endpoints:")
     print("  GET  /api/db/test                - Test database connection")
     print("  POST /api/db/init               - Initialize database schema")
     print("  POST /api/db/add-unique-constraint - Add unique constraint for company+position")
+    print("  POST /api/db/pgvector           - Migrate embeddings to pgvector with an HNSW index")
     print("  POST /api/jobs/save             - Save a job application")
     print("  POST /api/jobs/similar          - Find similar job applications (vector embeddings)")
     print("  POST /api/jobs/backfill         - Generate embeddings for existing jobs")
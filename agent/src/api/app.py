@@ -3,7 +3,6 @@ Flask application factory and configuration.
 """
 
 import os
-import concurrent.futures
 from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
@@ -11,6 +10,11 @@ from dotenv import load_dotenv
 from .routes import register_blueprints
 from .middleware.error_handlers import register_error_handlers
 from .middleware.logging import setup_logging
+from src.workflows.registry import workflow_registry
+from src.workflows.job_manager import GenerationJobManager
+from src.workflows.shared_storage import SharedStorage
+from src.config.settings import settings
+from src.database import db
 
 
 def create_app(config_name='development'):
@@ -41,8 +45,23 @@ def create_app(config_name='development'):
     # Register all blueprints
     register_blueprints(app)
     
-    # Create thread pool executor for async operations
-    app.config['EXECUTOR'] = concurrent.futures.ThreadPoolExecutor(3)
+    # Background generations run either on an in-process worker pool or, with
+    # GENERATION_QUEUE_BACKEND=postgres, on separate worker.py processes
+    if settings.generation_queue_backend == "postgres":
+        app.config['GENERATION_JOBS'] = db.generation_queue
+        # Workers refuse to start unless they can see this marker
+        SharedStorage.mark()
+    else:
+        app.config['GENERATION_JOBS'] = GenerationJobManager(
+            max_workers=settings.generation_workers,
+            max_queue_depth=settings.generation_max_queue_depth,
+            job_ttl_seconds=settings.generation_job_ttl_seconds
+        )
+    
+    # Compile the LangGraph workflows once at startup instead of on every request
+    if os.getenv('WORKFLOW_PRECOMPILE', 'true').lower() == 'true':
+        compile_seconds = workflow_registry.warm_up()
+        print(f"⚙️ Workflows compiled in {compile_seconds:.3f}s")
     
     return app
 
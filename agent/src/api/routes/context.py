@@ -3,7 +3,7 @@ Context and vector store management API routes.
 """
 
 import os
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from src.chains.context_retrieval_chain import ContextRetrievalChain
 from src.config.settings import settings
 
@@ -13,15 +13,25 @@ context_routes = Blueprint('context', __name__, url_prefix='/api/context')
 
 @context_routes.route('/', methods=['POST'])
 def setup_vector_store():
-    """Setup and populate the vector store with documents"""
+    """
+    Setup and populate the vector store with documents.
+
+    Only new and changed files are ingested; pass {"rebuild": true} to delete the
+    data file chunks (cover letters are kept) and ingest everything again.
+    """
     try:
         print("🚀 Setting up vector store...")
         context_chain = ContextRetrievalChain()
+
+        data = request.get_json(silent=True) or {}
+        if data.get("rebuild"):
+            context_chain.rebuild()
         
         setup_results = {
             "papers": False,
             "projects": False,
             "transcripts": False,
+            "sync": {},
             "errors": []
         }
         
@@ -29,7 +39,7 @@ def setup_vector_store():
         if os.path.exists(settings.papers_dir):
             try:
                 print("📄 Adding papers...")
-                context_chain.add_papers()
+                setup_results["sync"]["papers"] = context_chain.add_papers()
                 setup_results["papers"] = True
             except Exception as e:
                 setup_results["errors"].append(f"Papers: {str(e)}")
@@ -38,7 +48,7 @@ def setup_vector_store():
         if os.path.exists(settings.projects_dir):
             try:
                 print("🔧 Adding projects...")
-                context_chain.add_projects()
+                setup_results["sync"]["projects"] = context_chain.add_projects()
                 setup_results["projects"] = True
             except Exception as e:
                 setup_results["errors"].append(f"Projects: {str(e)}")
@@ -47,7 +57,7 @@ def setup_vector_store():
         if os.path.exists(settings.transcripts_dir):
             try:
                 print("📝 Adding transcripts...")
-                context_chain.add_transcripts()
+                setup_results["sync"]["transcripts"] = context_chain.add_transcripts()
                 setup_results["transcripts"] = True
             except Exception as e:
                 setup_results["errors"].append(f"Transcripts: {str(e)}")
@@ -2,7 +2,8 @@
 Database management API routes.
 """
 
-from flask import Blueprint, jsonify
+import threading
+from flask import Blueprint, request, jsonify
 from src.database import db
 
 # Create blueprint for database routes
@@ -53,20 +54,79 @@ def initialize_database():
 
 @db_routes.route('/backfill', methods=['POST'])
 def backfill_embeddings():
-    """Generate embeddings for existing jobs that don't have them"""
+    """Start generating embeddings for existing jobs that don't have them"""
     try:
-        if db.backfill_embeddings():
+        data = request.get_json(silent=True) or {}
+        
+        if db.is_backfill_running():
+            return jsonify({
+                "status": "error", 
+                "message": "Embedding backfill is already running",
+                "progress": db.get_backfill_progress()
+            }), 409
+        
+        # Synchronous mode for scripts that want the final result
+        if data.get('wait'):
+            if db.backfill_embeddings():
+                return jsonify({
+                    "status": "success", 
+                    "message": "Embeddings backfilled successfully",
+                    "progress": db.get_backfill_progress()
+                })
+            else:
+                return jsonify({
+                    "status": "error", 
+                    "message": "Failed to backfill embeddings",
+                    "progress": db.get_backfill_progress()
+                }), 500
+        
+        threading.Thread(target=db.backfill_embeddings, name="embedding-backfill", daemon=True).start()
+        return jsonify({
+            "status": "success", 
+            "message": "Embedding backfill started",
+            "progress": db.get_backfill_progress()
+        }), 202
+    except Exception as e:
+        return jsonify({
+            "status": "error", 
+            "message": str(e)
+        }), 500
+
+
+@db_routes.route('/backfill', methods=['GET'])
+def get_backfill_progress():
+    """Get progress of the current or last embedding backfill (rows/sec, ETA)"""
+    try:
+        return jsonify({
+            "status": "success",
+            "progress": db.get_backfill_progress()
+        })
+    except Exception as e:
+        return jsonify({
+            "status": "error", 
+            "message": str(e)
+        }), 500
+
+
+@db_routes.route('/pgvector', methods=['POST'])
+def enable_pgvector():
+    """Migrate embeddings to a pgvector column with an ANN index"""
+    try:
+        data = request.get_json(silent=True) or {}
+        index_type = data.get('index_type', 'hnsw')
+        
+        if db.enable_pgvector(index_type):
             return jsonify({
                 "status": "success", 
-                "message": "Embeddings backfilled successfully"
+                "message": f"pgvector enabled with {index_type} index"
             })
         else:
             return jsonify({
                 "status": "error", 
-                "message": "Failed to backfill embeddings"
+                "message": "Failed to enable pgvector"
             }), 500
     except Exception as e:
         return jsonify({
             "status": "error", 
             "message": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
@@ -2,76 +2,102 @@
 Document generation API routes for resumes and cover letters.
 """
 
-import os
-from flask import Blueprint, request, jsonify
-from src.workflows.workflows import Worlflows
-from src.workflows.states import ResumeState, CoverLetterState
-from src.database import db
-from ..utils.file_helpers import validate_resume_file, resolve_resume_path
+import json
+import time
+import uuid
+import queue
+import threading
+from flask import Blueprint, Response, request, jsonify, current_app, url_for, stream_with_context
+from src.workflows.runner import GenerationRunner, GenerationCancelled
+from src.workflows.job_manager import QueueFullError
+from src.workflows.batch import BatchRunner
+from src.config.settings import settings
+from ..utils.request_parsers import (
+    parse_flag, parse_resume_request, parse_cover_letter_request, parse_generation_item
+)
 
 # Create blueprint for generation routes
 generation_routes = Blueprint('generation', __name__, url_prefix='/api/generate')
 
 
+def _parse_resume_request(data):
+    """Validate a resume + cover letter request; returns (payload, error_response)"""
+    try:
+        return parse_resume_request(data, request.args), None
+    except ValueError as e:
+        return None, _bad_request(str(e))
+
+
+def _parse_cover_letter_request(data):
+    """Validate a cover-letter-only request; returns (payload, error_response)"""
+    try:
+        return parse_cover_letter_request(data), None
+    except ValueError as e:
+        return None, _bad_request(str(e))
+
+
+def _bad_request(message):
+    return jsonify({
+        "status": "error",
+        "message": message
+    }), 400
+
+
+def _generation_id(data):
+    """Reuse the client's generationId so a retry resumes a failed run from its checkpoint"""
+    return data.get("generationId") or uuid.uuid4().hex
+
+
+def _wants_async(data):
+    """Generations run in the background when the body or query string asks for it"""
+    return parse_flag(data, "async", False, request.args)
+
+
+def _submit(kind, payload, generation_id=None):
+    """
+    Queue a generation on the app's job backend and answer 202 with its status URL.
+
+    Resubmitting a finished generation's id queues it again, resuming from its
+    checkpoint if it failed part-way.
+    """
+    try:
+        generation_id = current_app.config['GENERATION_JOBS'].submit(kind, payload, generation_id)
+    except QueueFullError as e:
+        response = jsonify({
+            "status": "error",
+            "message": str(e)
+        })
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    return jsonify({
+        "status": "accepted",
+        "generation_id": generation_id,
+        "status_url": url_for('generation.get_generation_job', generation_id=generation_id)
+    }), 202
+
+
 @generation_routes.route('/', methods=['POST'])
 def generate_resume_and_cover_letter():
     """Generate both resume and cover letter from job posting"""
     try:
         data = request.get_json()
-        job_posting = data.get("jobDescription")
-        company = data.get("companyName")
-        position = data.get("positionTitle")
-
-        # Validate required fields
-        if not all([job_posting, company, position]):
-            return jsonify({
-                "status": "error",
-                "message": "Missing required fields: jobDescription, companyName, positionTitle"
-            }), 400
+        payload, error = _parse_resume_request(data)
+        if error:
+            return error
 
-        # Save the job application to database with resume_generated = True
-        try:
-            job_id = db.save_job_application(company, position, job_posting, True)
-            print(f"💾 Saved job application to database with ID: {job_id}")
-        except Exception as e:
-            print(f"⚠️ Failed to save job application: {e}")
-
-        # Create ResumeState for workflow
-        state = ResumeState(
-            job_posting=job_posting,
-            company=company,
-            position=position,
-            experiences="",
-            skills="", 
-            project_names=[],
-            project_summaries="",
-            highlights="",
-            resume_latex="",
-            tex_file=None,
-            pdf_file=None,
-            context=[],
-            generation_metadata={}
-        )
-
-        # Execute workflow
-        resume_cover_letter_workflow = Worlflows.create_resume_cover_letter_workflow()
-        print(f"🚀 Generating resume and cover letter for {position} at {company}")
-        result = resume_cover_letter_workflow.invoke(state)
-        cwd = os.getcwd()
-        print("🎁 Resume and cover letter created.")
+        if _wants_async(data):
+            return _submit("resume_cover_letter", payload, data.get("generationId"))
 
-        return jsonify({
-            "status": "success",
-            "resume_path": os.path.abspath(os.path.join(cwd, result["resume_pdf_file"])),
-            "cover_letter_path": os.path.abspath(os.path.join(cwd, result["cover_letter_pdf_file"])),
-            "job_id": job_id if 'job_id' in locals() else None
-        })
+        generation_id = _generation_id(data)
+        return jsonify(GenerationRunner.run_job("resume_cover_letter", payload, generation_id=generation_id))
 
     except Exception as e:
         print(f"❌ Error generating documents: {e}")
         return jsonify({
             "status": "error",
-            "message": f"Failed to generate documents: {str(e)}"
+            "message": f"Failed to generate documents: {str(e)}",
+            "generation_id": generation_id if 'generation_id' in locals() else None
         }), 500
 
 
@@ -80,66 +106,233 @@ def generate_cover_letter_only():
     """Generate only a cover letter using an existing resume"""
     try:
         data = request.get_json()
-        job_posting = data.get("jobDescription")
-        company = data.get("companyName")
-        position = data.get("positionTitle")
-        resume_pdf_file = data.get("resumePdfFile")
+        payload, error = _parse_cover_letter_request(data)
+        if error:
+            return error
+
+        if _wants_async(data):
+            return _submit("cover_letter", payload, data.get("generationId"))
+
+        generation_id = _generation_id(data)
+        return jsonify(GenerationRunner.run_job("cover_letter", payload, generation_id=generation_id))
+
+    except Exception as e:
+        print(f"❌ Error generating cover letter: {e}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to generate cover letter: {str(e)}",
+            "generation_id": generation_id if 'generation_id' in locals() else None
+        }), 500
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream(kind, payload, generation_id):
+    """
+    Run a generation in a background thread and relay its progress as Server-Sent Events.
+
+    Emits node_started / node_finished for every workflow node, token events while
+    the cover letter is written, then a final result (or error) event. Closing the
+    connection cancels the generation at its next step.
+    """
+    events = queue.Queue()
+    disconnected = threading.Event()
+
+    def work():
+        try:
+            result = GenerationRunner.run_job(
+                kind, payload,
+                generation_id=generation_id,
+                should_cancel=disconnected.is_set,
+                on_event=lambda event, data: events.put((event, data))
+            )
+            events.put(("result", result))
+        except GenerationCancelled:
+            print(f"🛑 Streaming {kind} generation cancelled by client")
+        except Exception as e:
+            print(f"❌ Error in streaming generation: {e}")
+            events.put(("error", {"status": "error", "message": str(e), "generation_id": generation_id}))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=work, name="generation-stream", daemon=True).start()
+
+    def generate():
+        try:
+            while True:
+                try:
+                    item = events.get(timeout=15)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield _sse(*item)
+        finally:
+            disconnected.set()
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+
+@generation_routes.route('/stream', methods=['POST'])
+def stream_resume_and_cover_letter():
+    """Generate resume and cover letter, streaming node progress and cover letter tokens"""
+    try:
+        data = request.get_json()
+        payload, error = _parse_resume_request(data)
+        if error:
+            return error
+        return _stream("resume_cover_letter", payload, _generation_id(data))
+
+    except Exception as e:
+        print(f"❌ Error starting generation stream: {e}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to generate documents: {str(e)}"
+        }), 500
+
+
+@generation_routes.route('/cover-letter/stream', methods=['POST'])
+def stream_cover_letter_only():
+    """Generate only a cover letter, streaming node progress and tokens"""
+    try:
+        data = request.get_json()
+        payload, error = _parse_cover_letter_request(data)
+        if error:
+            return error
+        return _stream("cover_letter", payload, _generation_id(data))
+
+    except Exception as e:
+        print(f"❌ Error starting cover letter stream: {e}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to generate cover letter: {str(e)}"
+        }), 500
+
 
-        # Validate required fields
-        if not all([job_posting, company, position, resume_pdf_file]):
+@generation_routes.route('/batch', methods=['POST'])
+def generate_batch():
+    """
+    Generate documents for many postings, streaming each item's result as it finishes.
+
+    Items take the same fields as the single-item routes; those with resumePdfFile
+    get a cover letter only. Answers with text/event-stream: one item event per
+    posting (with its index in the request), then a done event with totals.
+    """
+    try:
+        data = request.get_json() or {}
+        raw_items = data.get("items")
+        if not isinstance(raw_items, list) or not raw_items:
             return jsonify({
-                "status": "error", 
-                "message": "Missing required fields: jobDescription, companyName, positionTitle, resumePdfFile"
+                "status": "error",
+                "message": "Missing required field: items (a non-empty list of postings)"
             }), 400
 
-        # Resolve resume file path (handles URLs and local paths)
-        resume_file_path = resolve_resume_path(resume_pdf_file)
-        
-        # Validate resume file exists
-        if not validate_resume_file(resume_file_path):
+        if len(raw_items) > settings.batch_max_items:
             return jsonify({
                 "status": "error",
-                "message": f"Resume file not found: {resume_file_path}"
+                "message": f"Too many items: {len(raw_items)} (maximum {settings.batch_max_items})"
             }), 400
 
-        # Save the job application to database with resume_generated = False (cover letter only)
+        concurrency = data.get("concurrency", settings.batch_max_concurrency)
         try:
-            job_id = db.save_job_application(company, position, job_posting, False)
-            print(f"💾 Saved cover letter job application to database with ID: {job_id}")
-        except Exception as e:
-            print(f"⚠️ Failed to save job application: {e}")
-
-        # Create CoverLetterState
-        state = CoverLetterState(
-            job_posting=job_posting,
-            company=company,
-            position=position,
-            resume_pdf_file=resume_file_path,  # Use the local file path
-            resume="",
-            cover_letter="",
-            cover_letter_latex="",
-            cover_letter_latex_file=None,
-            cover_letter_pdf_file=None,
-            context=[]
-        )
-
-        # Execute cover letter workflow
-        cover_letter_workflow = Worlflows.create_cover_letter_worklflow()
-        print(f"📝 Generating cover letter for {position} at {company}")
-        result = cover_letter_workflow.invoke(state)
-        cwd = os.getcwd()
-        print("📄 Cover letter created.")
+            if isinstance(concurrency, bool) or int(concurrency) != float(concurrency):
+                raise ValueError(concurrency)
+            concurrency = int(concurrency)
+        except (TypeError, ValueError, OverflowError):
+            concurrency = 0
+        if concurrency < 1:
+            return jsonify({
+                "status": "error",
+                "message": "concurrency must be a positive integer"
+            }), 400
+        concurrency = min(concurrency, settings.batch_max_concurrency)
 
-        return jsonify({
-            "status": "success",
-            "cover_letter_path": os.path.abspath(os.path.join(cwd, result["cover_letter_pdf_file"])),
-            "resume_path": resume_pdf_file,  # Return the original URL for frontend use
-            "job_id": job_id if 'job_id' in locals() else None
+        items = []
+        for index, raw_item in enumerate(raw_items):
+            if not isinstance(raw_item, dict):
+                return jsonify({
+                    "status": "error",
+                    "message": f"Item {index}: must be an object with the posting's fields"
+                }), 400
+            try:
+                kind, payload = parse_generation_item(raw_item, request.args)
+            except ValueError as e:
+                return _bad_request(f"Item {index}: {e}")
+            items.append({"kind": kind, "payload": payload, "generation_id": raw_item.get("generationId")})
+
+        print(f"📦 Starting batch of {len(items)} generations ({concurrency} at a time)")
+
+        def generate():
+            start_time = time.perf_counter()
+            counts = {}
+            # Closing the stream closes the batch, which cancels unfinished items
+            for result in BatchRunner.run(items, concurrency=concurrency, keep_alive_seconds=15):
+                if result is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                yield _sse("item", result)
+
+            print(f"📦 Batch finished: {counts}")
+            yield _sse("done", {
+                "total": len(items),
+                "counts": counts,
+                "seconds": round(time.perf_counter() - start_time, 2)
+            })
+
+        return Response(stream_with_context(generate()), mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
         })
 
     except Exception as e:
-        print(f"❌ Error generating cover letter: {e}")
+        print(f"❌ Error starting batch generation: {e}")
         return jsonify({
             "status": "error",
-            "message": f"Failed to generate cover letter: {str(e)}"
-        }), 500
\ No newline at end of file
+            "message": f"Failed to start batch: {str(e)}"
+        }), 500
+
+
+@generation_routes.route('/jobs/<generation_id>', methods=['GET'])
+def get_generation_job(generation_id):
+    """Get the status, completed nodes and result of a background generation"""
+    job = current_app.config['GENERATION_JOBS'].get(generation_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Generation {generation_id} not found"
+        }), 404
+
+    return jsonify({
+        "status": "success",
+        "job": job
+    })
+
+
+@generation_routes.route('/jobs/<generation_id>', methods=['DELETE'])
+def cancel_generation_job(generation_id):
+    """Cancel a queued or running background generation"""
+    jobs = current_app.config['GENERATION_JOBS']
+    if not jobs.cancel(generation_id):
+        job = jobs.get(generation_id)
+        if job is None:
+            return jsonify({
+                "status": "error",
+                "message": f"Generation {generation_id} not found"
+            }), 404
+        return jsonify({
+            "status": "error",
+            "message": f"Generation {generation_id} already {job['status']}"
+        }), 409
+
+    return jsonify({
+        "status": "success",
+        "job": jobs.get(generation_id)
+    })
@@ -2,8 +2,9 @@
 Job application management API routes.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from src.database import db
+from src.config.settings import settings
 
 # Create blueprint for job routes
 jobs_routes = Blueprint('jobs', __name__, url_prefix='/api/jobs')
@@ -103,4 +104,84 @@ def get_all_jobs():
         return jsonify({
             "status": "error", 
             "message": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+@jobs_routes.route('/similarity-matrix', methods=['POST'])
+def get_similarity_matrix():
+    """Pairwise similarity between past applications, as dense float32 or top-k sparse"""
+    try:
+        data = request.get_json() or {}
+        job_ids = data.get('job_ids')
+        output_format = data.get('format', 'topk')
+        k = data.get('k', 10)
+        
+        if not job_ids or not isinstance(job_ids, list):
+            return jsonify({
+                "status": "error", 
+                "message": "Missing required field: job_ids"
+            }), 400
+        
+        try:
+            if isinstance(k, bool) or int(k) != float(k):
+                raise ValueError(k)
+            k = int(k)
+        except (TypeError, ValueError, OverflowError):
+            k = 0
+        if not 1 <= k <= settings.similarity_topk_max_k:
+            return jsonify({
+                "status": "error", 
+                "message": f"k must be an integer between 1 and {settings.similarity_topk_max_k}"
+            }), 400
+        
+        if output_format == 'dense' and len(job_ids) > settings.similarity_dense_max_jobs:
+            return jsonify({
+                "status": "error", 
+                "message": f"format 'dense' is limited to {settings.similarity_dense_max_jobs} job_ids "
+                           f"(got {len(job_ids)}); use format 'topk' for larger sets"
+            }), 400
+        
+        if output_format == 'dense':
+            result = db.get_job_similarity_array(job_ids)
+            if result is None:
+                return jsonify({
+                    "status": "error", 
+                    "message": "Need at least 2 jobs with embeddings for similarity matrix"
+                }), 400
+            
+            ids, matrix = result
+            # Row-major little-endian float32; row/column i belongs to X-Job-Ids[i]
+            response = Response(matrix.astype('<f4', copy=False).tobytes(), mimetype='application/octet-stream')
+            response.headers['X-Matrix-Shape'] = f"{matrix.shape[0]},{matrix.shape[1]}"
+            response.headers['X-Matrix-Dtype'] = 'float32'
+            response.headers['X-Job-Ids'] = ','.join(str(job_id) for job_id in ids.tolist())
+            return response
+        
+        if output_format == 'topk':
+            neighbours = db.get_job_similarity_topk(job_ids, k)
+            if neighbours is None:
+                return jsonify({
+                    "status": "error", 
+                    "message": "Need at least 2 jobs with embeddings for similarity matrix"
+                }), 400
+            
+            return jsonify({
+                "status": "success",
+                "format": "topk",
+                "k": k,
+                "count": len(neighbours),
+                "neighbours": {
+                    str(job_id): [[neighbour_id, score] for neighbour_id, score in pairs]
+                    for job_id, pairs in neighbours.items()
+                }
+            })
+        
+        return jsonify({
+            "status": "error", 
+            "message": "format must be 'dense' or 'topk'"
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            "status": "error", 
+            "message": str(e)
+        }), 500
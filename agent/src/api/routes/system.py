@@ -4,7 +4,12 @@ System administration and utility API routes.
 
 import os
 import signal
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
+from src.workflows.registry import workflow_registry
+from src.chains.clients import clients
+from src.chains.response_cache import response_cache
+from src.format.latex_format import preamble_formats
+from src.format.pdf_cache import pdf_build_cache
 
 # Create blueprint for system routes
 system_routes = Blueprint('system', __name__, url_prefix='/api/system')
@@ -44,7 +49,13 @@ def system_info():
                 "data_exists": os.path.exists('data'),
                 "output_exists": os.path.exists('output'),
                 "src_exists": os.path.exists('src')
-            }
+            },
+            "workflows": workflow_registry.get_metrics(),
+            "clients": clients.get_status(),
+            "llm_cache": response_cache.get_stats(),
+            "latex_formats": preamble_formats.get_stats(),
+            "pdf_cache": pdf_build_cache.get_stats(),
+            "generation_jobs": current_app.config['GENERATION_JOBS'].get_stats()
         }
         
         return jsonify({
@@ -10,6 +10,12 @@ from .file_helpers import (
     ensure_output_directory,
     RESUME_TEMPLATE_MAPPING
 )
+from .request_parsers import (
+    parse_flag,
+    parse_resume_request,
+    parse_cover_letter_request,
+    parse_generation_item
+)
 
 __all__ = [
     'resolve_resume_path',
@@ -17,5 +23,9 @@ __all__ = [
     'sanitize_file_path',
     'get_file_info',
     'ensure_output_directory',
-    'RESUME_TEMPLATE_MAPPING'
+    'RESUME_TEMPLATE_MAPPING',
+    'parse_flag',
+    'parse_resume_request',
+    'parse_cover_letter_request',
+    'parse_generation_item'
 ]
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Parsing of generation requests, shared by the API routes and the batch CLI.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Tuple
+from .file_helpers import resolve_resume_path, validate_resume_file
+
+
+def parse_flag(data: Mapping[str, Any], name: str, default: bool,
+               fallback: Optional[Mapping[str, Any]] = None) -> bool:
+    """Boolean option from data (then fallback, e.g. the query string); accepts true/1/yes"""
+    flag = data.get(name, (fallback or {}).get(name, default))
+    return flag is True or str(flag).lower() in ("1", "true", "yes")
+
+
+def parse_resume_request(data: Mapping[str, Any],
+                         fallback: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Payload for a resume + cover letter generation; raises ValueError when invalid"""
+    job_posting = data.get("jobDescription")
+    company = data.get("companyName")
+    position = data.get("positionTitle")
+
+    # Validate required fields
+    if not all([job_posting, company, position]):
+        raise ValueError("Missing required fields: jobDescription, companyName, positionTitle")
+
+    payload = {
+        "job_posting": job_posting,
+        "company": company,
+        "position": position
+    }
+    # Only set when disabled, so default requests keep their single-flight key
+    if not parse_flag(data, "reuse", True, fallback):
+        payload["reuse"] = False
+    return payload
+
+
+def parse_cover_letter_request(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Payload for a cover-letter-only generation; raises ValueError when invalid"""
+    job_posting = data.get("jobDescription")
+    company = data.get("companyName")
+    position = data.get("positionTitle")
+    resume_pdf_file = data.get("resumePdfFile")
+
+    # Validate required fields
+    if not all([job_posting, company, position, resume_pdf_file]):
+        raise ValueError("Missing required fields: jobDescription, companyName, positionTitle, resumePdfFile")
+
+    # Resolve resume file path (handles URLs and local paths)
+    resume_file_path = resolve_resume_path(resume_pdf_file)
+
+    # Validate resume file exists
+    if not validate_resume_file(resume_file_path):
+        raise ValueError(f"Resume file not found: {resume_file_path}")
+
+    return {
+        "job_posting": job_posting,
+        "company": company,
+        "position": position,
+        "resume_file_path": resume_file_path,
+        "resume_pdf_file": resume_pdf_file
+    }
+
+
+def parse_generation_item(data: Mapping[str, Any],
+                          fallback: Optional[Mapping[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    """(kind, payload) for a batch posting: a cover letter only when it names a resume"""
+    if data.get("resumePdfFile"):
+        return "cover_letter", parse_cover_letter_request(data)
+    return "resume_cover_letter", parse_resume_request(data, fallback)
@@ -2,21 +2,23 @@
 
 from abc import ABC, abstractmethod
 from typing import Any, Dict
-from langchain.chat_models import init_chat_model
-from langchain_openai import OpenAIEmbeddings
 from langchain.prompts import PromptTemplate
 from ..workflows.states import ResumeState
+from .clients import clients
+from .response_cache import ResponseCache, response_cache
 from ..config.settings import settings
 
 
 class BaseChain(ABC):
     """Abstract base class for all resume generation chains"""
+
+    # Set to False on chains whose output should never be served from the response cache
+    use_response_cache = True
     
-    def __init__(self):
-        self.llm = init_chat_model(
-            settings.openai_model, 
-            model_provider="openai"
-        )
+    def __init__(self, llm=None, cache: ResponseCache = None):
+        # Chains are cheap to build per node; the model client itself is shared
+        self.llm = llm or clients.get_chat_model()
+        self.cache = cache or response_cache
     
     @abstractmethod
     def get_prompt(self) -> PromptTemplate:
@@ -32,11 +34,25 @@ class BaseChain(ABC):
         """Execute the chain with given inputs"""
         prompt = self.get_prompt()
         messages = prompt.invoke(state)
-        response = self.llm.invoke(messages)
-        processed_content = self.process_response(response.content)
+
+        use_cache = settings.llm_cache_enabled and self.use_response_cache
+        if use_cache:
+            model = getattr(self.llm, "model_name", None) or settings.openai_model
+            temperature = getattr(self.llm, "temperature", None)
+            rendered_prompt = messages.to_string()
+            raw_response = self.cache.get(model, rendered_prompt, temperature)
+        else:
+            raw_response = None
+
+        if raw_response is None:
+            raw_response = self.llm.invoke(messages).content
+            if use_cache:
+                self.cache.put(model, rendered_prompt, temperature, raw_response)
+
+        processed_content = self.process_response(raw_response)
         
         return {
             "content": processed_content,
-            "raw_response": response.content,
+            "raw_response": raw_response,
             "inputs": state
         }
\ No newline at end of file
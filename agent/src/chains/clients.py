@@ -0,0 +1,132 @@
+"""Process-wide LLM, embeddings and vector store clients shared by all chains"""
+
+import threading
+from typing import Any, Dict, Optional
+import httpx
+from langchain.chat_models import init_chat_model
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_openai import OpenAIEmbeddings
+from langchain_chroma import Chroma
+from ..config.settings import settings
+
+
+class ClientRegistry:
+    """Creates the chat model, embeddings client and Chroma store once per process.
+
+    The OpenAI clients share one keep-alive httpx connection pool, so requests
+    after the first reuse open connections instead of repeating the TCP/TLS setup.
+    Chat requests go through one rate limiter per provider, shared by every
+    concurrent generation in the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._chat_model = None
+        self._embeddings: Optional[OpenAIEmbeddings] = None
+        self._vector_stores: Dict[str, Chroma] = {}
+        self._chroma_client = None
+        self._rate_limiters: Dict[str, Optional[InMemoryRateLimiter]] = {}
+
+    def get_http_client(self) -> httpx.Client:
+        """Shared HTTP client with connection pooling and keep-alive"""
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=settings.http_max_connections,
+                            max_keepalive_connections=settings.http_max_keepalive_connections,
+                            keepalive_expiry=settings.http_keepalive_expiry
+                        ),
+                        timeout=settings.http_timeout
+                    )
+        return self._http_client
+
+    def get_chat_model(self):
+        """Shared chat model used by every chain"""
+        if self._chat_model is None:
+            http_client = self.get_http_client()
+            with self._lock:
+                if self._chat_model is None:
+                    self._chat_model = init_chat_model(
+                        settings.openai_model,
+                        model_provider="openai",
+                        http_client=http_client,
+                        rate_limiter=self._get_rate_limiter_locked("openai")
+                    )
+        return self._chat_model
+
+    def _get_rate_limiter_locked(self, provider: str) -> Optional[InMemoryRateLimiter]:
+        """Token bucket for a provider's requests per minute (None when unlimited)"""
+        if provider not in self._rate_limiters:
+            requests_per_minute = {
+                "openai": settings.openai_requests_per_minute
+            }.get(provider, 0)
+            self._rate_limiters[provider] = InMemoryRateLimiter(
+                requests_per_second=requests_per_minute / 60,
+                check_every_n_seconds=0.1,
+                max_bucket_size=max(settings.llm_rate_limit_burst, 1)
+            ) if requests_per_minute > 0 else None
+        return self._rate_limiters[provider]
+
+    def get_embeddings(self) -> OpenAIEmbeddings:
+        """Shared embeddings client for the vector store"""
+        if self._embeddings is None:
+            http_client = self.get_http_client()
+            with self._lock:
+                if self._embeddings is None:
+                    self._embeddings = OpenAIEmbeddings(
+                        model=settings.openai_embedding_model,
+                        http_client=http_client
+                    )
+        return self._embeddings
+
+    def get_vector_store(self, collection_name: Optional[str] = None) -> Chroma:
+        """Shared Chroma store for a collection, backed by a single Chroma HTTP client"""
+        collection_name = collection_name or settings.chroma_collection
+        vector_store = self._vector_stores.get(collection_name)
+        if vector_store is None:
+            embeddings = self.get_embeddings()
+            with self._lock:
+                vector_store = self._vector_stores.get(collection_name)
+                if vector_store is None:
+                    if self._chroma_client is None:
+                        import chromadb
+                        self._chroma_client = chromadb.HttpClient(
+                            host=settings.chroma_host,
+                            port=settings.chroma_port
+                        )
+                    vector_store = Chroma(
+                        collection_name=collection_name,
+                        embedding_function=embeddings,
+                        client=self._chroma_client
+                    )
+                    self._vector_stores[collection_name] = vector_store
+        return vector_store
+
+    def get_status(self) -> Dict[str, Any]:
+        """Which clients have been created so far"""
+        return {
+            "http_client": self._http_client is not None,
+            "chat_model": self._chat_model is not None,
+            "embeddings": self._embeddings is not None,
+            "vector_stores": list(self._vector_stores),
+            "rate_limited_providers": [provider for provider, limiter in self._rate_limiters.items() if limiter]
+        }
+
+    def close(self) -> None:
+        """Close pooled connections; clients are recreated on next use"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._chat_model = None
+            self._embeddings = None
+            self._vector_stores = {}
+            self._chroma_client = None
+            self._rate_limiters = {}
+
+
+# Global client registry instance
+clients = ClientRegistry()
@@ -1,12 +1,14 @@
 import os
+import hashlib
+import threading
 from glob import glob
 from .base import BaseChain
-from typing import List
-from uuid import uuid4
+from typing import Callable, List, Optional
 from langchain.prompts import PromptTemplate
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
+from .clients import clients
+from .ingestion_manifest import IngestionManifest, ingestion_manifest
 from ..workflows.states import ResumeState
 from ..config.settings import settings
 from langchain_community.document_loaders import PyPDFLoader
@@ -15,51 +17,145 @@ from langchain_community.document_loaders import UnstructuredMarkdownLoader, JSO
 from typing import Dict, Any
 
 
+# Source of the cover letters the workflow adds as context (see Nodes.add_cover_letter_context_node)
+COVER_LETTER_SOURCE = "cover letter"
+REBUILD_PAGE_SIZE = 5000
+
+
 class ContextRetrievalChain(BaseChain):
-    def __init__(self):
-        super().__init__()
-
-        self.embeddings = OpenAIEmbeddings(
-            model=settings.openai_embedding_model)
-        self.vector_store = Chroma(
-            collection_name="aria-vs",
-            embedding_function=self.embeddings,
-            host="localhost",
-        )
+    # One sync at a time, so two setup requests don't ingest the same file twice
+    _sync_lock = threading.Lock()
+
+    def __init__(self, llm=None, vector_store: Chroma = None, collection_name: Optional[str] = None,
+                 manifest: IngestionManifest = None):
+        super().__init__(llm)
+
+        self.collection_name = collection_name or settings.chroma_collection
+        self.vector_store = vector_store or clients.get_vector_store(self.collection_name)
+        self.embeddings = self.vector_store.embeddings
+        self.manifest = manifest or ingestion_manifest
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
             add_start_index=True,
         )
 
-    def add_context(self, documents: List[Document]) -> None:
+    @staticmethod
+    def chunk_ids(source: str, content_hash: str, count: int) -> List[str]:
+        """Deterministic chunk ids: the same content from the same source maps to the same ids"""
+        source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return [f"{source_hash}-{content_hash[:16]}-{index}" for index in range(count)]
+
+    def add_context(self, documents: List[Document]) -> List[str]:
+        """Split and upsert documents; adding the same documents again is a no-op"""
         splits = self.text_splitter.split_documents(documents)
-        self.vector_store.add_documents(documents=splits)
-
-    def add_papers(self) -> None:
-        paths = glob(os.path.join(settings.papers_dir, "*.pdf"))
-        for path in paths:
-            loader = PyPDFLoader(path)
-            documents = loader.load()
-            self.add_context(documents)
-
-    def add_projects(self) -> None:
-        paths = glob(os.path.join(settings.papers_dir, "*.md"))
-        for path in paths:
-            loader = UnstructuredMarkdownLoader(path)
-            documents = loader.load()
-            self.add_context(documents)
-
-    def add_transcripts(self) -> None:
-        paths = glob(os.path.join(settings.transcripts_dir, "*.json"))
-        for path in paths:
-            loader = JSONLoader(
-                file_path=path,
-                jq_schema=".courses[]",
-                text_content=False
-            )
-            documents = loader.load()
-            self.add_context(documents)
+        content_hash = hashlib.sha256(
+            "\x00".join(split.page_content for split in splits).encode("utf-8")
+        ).hexdigest()
+        source = str(documents[0].metadata.get("source", "")) if documents else ""
+        ids = self.chunk_ids(source, content_hash, len(splits))
+        if splits:
+            self.vector_store.add_documents(documents=splits, ids=ids)
+        return ids
+
+    def add_papers(self) -> Dict[str, int]:
+        return self.sync_files("papers", os.path.join(settings.papers_dir, "*.pdf"),
+                               lambda path: PyPDFLoader(path).load())
+
+    def add_projects(self) -> Dict[str, int]:
+        return self.sync_files("projects", os.path.join(settings.projects_dir, "*.md"),
+                               lambda path: UnstructuredMarkdownLoader(path).load())
+
+    def add_transcripts(self) -> Dict[str, int]:
+        return self.sync_files("transcripts", os.path.join(settings.transcripts_dir, "*.json"),
+                               lambda path: JSONLoader(
+                                   file_path=path,
+                                   jq_schema=".courses[]",
+                                   text_content=False
+                               ).load())
+
+    def sync_files(self, group: str, pattern: str, load: Callable[[str], List[Document]]) -> Dict[str, int]:
+        """
+        Bring the vector store in line with the files matching pattern.
+
+        Files whose size and mtime (or, failing that, sha256) match the manifest are
+        skipped. Changed files have their old chunks deleted and the new ones added;
+        files that disappeared have their chunks deleted.
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0,
+                 "chunks_added": 0, "chunks_deleted": 0}
+
+        with ContextRetrievalChain._sync_lock:
+            paths = sorted(os.path.normpath(path) for path in glob(pattern))
+            for path in paths:
+                self._sync_file(group, path, load, stats)
+
+            for path in set(self.manifest.paths(self.collection_name, group)) - set(paths):
+                entry = self.manifest.get(self.collection_name, path)
+                if entry["chunk_ids"]:
+                    self.vector_store.delete(ids=entry["chunk_ids"])
+                self.manifest.remove(self.collection_name, path)
+                stats["removed"] += 1
+                stats["chunks_deleted"] += len(entry["chunk_ids"])
+
+        print(f"📚 Synced {group}: {stats}")
+        return stats
+
+    def _sync_file(self, group: str, path: str, load: Callable[[str], List[Document]],
+                   stats: Dict[str, int]) -> None:
+        stat = os.stat(path)
+        entry = self.manifest.get(self.collection_name, path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            stats["unchanged"] += 1
+            return
+
+        file_hash = IngestionManifest.file_sha256(path)
+        if entry and entry["sha256"] == file_hash:
+            # Touched but not changed
+            self.manifest.set(self.collection_name, path, {**entry, "size": stat.st_size, "mtime": stat.st_mtime})
+            stats["unchanged"] += 1
+            return
+
+        splits = self.text_splitter.split_documents(load(path))
+        ids = self.chunk_ids(path, file_hash, len(splits))
+
+        new_ids = set(ids)
+        stale_ids = [chunk_id for chunk_id in (entry or {}).get("chunk_ids", []) if chunk_id not in new_ids]
+        if stale_ids:
+            self.vector_store.delete(ids=stale_ids)
+        if splits:
+            self.vector_store.add_documents(documents=splits, ids=ids)
+
+        self.manifest.set(self.collection_name, path, {
+            "group": group,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": file_hash,
+            "chunk_ids": ids
+        })
+        stats["updated" if entry else "added"] += 1
+        stats["chunks_added"] += len(ids)
+        stats["chunks_deleted"] += len(stale_ids)
+
+    def rebuild(self) -> None:
+        """
+        Delete every data-file chunk and forget the manifest, so the next sync ingests everything.
+
+        Cover letters added by the workflow (source "cover letter") aren't backed by a
+        data file, so they are kept: a sync could never bring them back.
+        """
+        deleted = 0
+        with ContextRetrievalChain._sync_lock:
+            # Paged, since Chroma caps how many ids one delete may take
+            while True:
+                ids = self.vector_store.get(where={"source": {"$ne": COVER_LETTER_SOURCE}},
+                                            limit=REBUILD_PAGE_SIZE, include=[])["ids"]
+                if not ids:
+                    break
+                self.vector_store.delete(ids=ids)
+                deleted += len(ids)
+            self.manifest.clear(self.collection_name)
+        print(f"🧹 Deleted {deleted} data file chunks from collection {self.collection_name}")
 
     def retrieve_context(self, state: ResumeState) -> Dict[str, Any]:
         query_parts = []
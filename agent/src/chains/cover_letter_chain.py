@@ -6,8 +6,8 @@ from ..workflows.states import ResumeState
 from typing import Dict, Any
 
 class CoverLetterChain(BaseChain):
-    def __init__(self, withResume=True):
-        super().__init__()
+    def __init__(self, withResume=True, llm=None):
+        super().__init__(llm)
         self.withResume = withResume
 
     def get_prompt(self) -> PromptTemplate:
@@ -0,0 +1,54 @@
+"""Shared, change-aware cache of the personal data files read by the chains"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, Tuple
+
+
+class DataFileCache:
+    """Reads each data file once and hands the parsed content to every caller.
+
+    experiences.json, projects.json, technical_skills.json and the project READMEs
+    are read by several chains on every generation; a batch of postings would
+    otherwise parse them dozens of times. Entries are keyed by the file's size and
+    mtime, so editing a file takes effect on the next read. Callers must treat the
+    returned objects as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Tuple[int, float], Any]] = {}
+        self._reads = 0
+        self._hits = 0
+
+    def load_json(self, path: str) -> Any:
+        return self._load(path, json.load)
+
+    def read_text(self, path: str) -> str:
+        return self._load(path, lambda f: f.read())
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"files": len(self._entries), "reads": self._reads, "hits": self._hits}
+
+    def _load(self, path: str, parse) -> Any:
+        stat = os.stat(path)
+        version = (stat.st_size, stat.st_mtime)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self._hits += 1
+                return entry[1]
+
+        with open(path, "r") as f:
+            content = parse(f)
+
+        with self._lock:
+            self._entries[path] = (version, content)
+            self._reads += 1
+        return content
+
+
+# Global data file cache instance
+data_files = DataFileCache()
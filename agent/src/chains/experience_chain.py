@@ -6,6 +6,7 @@ from typing import Dict, Any
 from langchain.prompts import PromptTemplate
 
 from .base import BaseChain
+from .data_files import data_files
 from ..config.prompts import PromptTemplates
 from ..config.settings import settings
 from ..extractors.latex_extractor import LaTeXExtractor
@@ -24,8 +25,7 @@ class ExperienceChain(BaseChain):
     
     def load_experiences_data(self) -> dict:
         """Load experiences data from JSON file"""
-        with open(settings.experiences_path, "r") as f:
-            return json.load(f)
+        return data_files.load_json(settings.experiences_path)
     
     def invoke(self, state: ResumeState) -> Dict[str, Any]:
         """Generate experiences based on job posting"""
@@ -0,0 +1,86 @@
+"""Record of which source files are in the vector store, and as which chunks"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+from ..config.settings import settings
+
+
+class IngestionManifest:
+    """Maps each ingested file to its size, mtime, sha256 and Chroma chunk ids.
+
+    Entries are grouped per collection and per source group (papers, projects,
+    transcripts), so a sync of one group can tell which of its files disappeared.
+    The manifest is a JSON file rewritten atomically after each change.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.ingestion_manifest_path
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, collection: str, path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._load().get(collection, {}).get(path)
+            return dict(entry) if entry else None
+
+    def paths(self, collection: str, group: str) -> List[str]:
+        """Files of a source group recorded for a collection"""
+        with self._lock:
+            return [path for path, entry in self._load().get(collection, {}).items()
+                    if entry.get("group") == group]
+
+    def set(self, collection: str, path: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._load().setdefault(collection, {})[path] = entry
+            self._save()
+
+    def remove(self, collection: str, path: str) -> None:
+        with self._lock:
+            if self._load().get(collection, {}).pop(path, None) is not None:
+                self._save()
+
+    def clear(self, collection: str) -> None:
+        with self._lock:
+            if self._load().pop(collection, None) is not None:
+                self._save()
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if self._data is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ingestion manifest unreadable ({e}), re-ingesting everything")
+                self._data = {}
+        return self._data
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".manifest-", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Global ingestion manifest instance
+ingestion_manifest = IngestionManifest()
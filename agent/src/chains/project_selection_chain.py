@@ -3,6 +3,7 @@ from ..workflows.states import ResumeState
 from langchain.prompts import PromptTemplate
 from typing import Dict, Any
 from .base import BaseChain
+from .data_files import data_files
 from ..config.settings import settings
 from ..config.prompts import PromptTemplates
 from ..extractors.json_extractor import JSONExtractor
@@ -16,8 +17,7 @@ class ProjectSelectionChain(BaseChain):
         return JSONExtractor.extract_project_list(response)
 
     def load_projects_data(self) -> dict:
-        with open(settings.projects_path, "r") as f:
-            return json.load(f)
+        return data_files.load_json(settings.projects_path)
 
     def invoke(self, state: ResumeState) -> Dict[str, Any]:
         projects_data = self.load_projects_data()
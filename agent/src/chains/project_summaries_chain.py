@@ -1,8 +1,9 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
 from ..workflows.states import ResumeState
 from langchain.prompts import PromptTemplate
 from typing import Dict, Any, List
 from .base import BaseChain
+from .data_files import data_files
 from ..config.settings import settings
 from ..config.prompts import PromptTemplates
 from ..extractors.latex_extractor import LaTeXExtractor
@@ -15,8 +16,7 @@ class ProjectSummariesChain(BaseChain):
         return LaTeXExtractor.extract_projects(response)
     
     def load_projects_data(self) -> dict:
-        with open(settings.projects_path, "r") as f:
-            return json.load(f)
+        return data_files.load_json(settings.projects_path)
 
     def load_project_context(self, project_name : str, projects_data : List[dict]) -> dict:
         project_info = None
@@ -32,8 +32,7 @@ class ProjectSummariesChain(BaseChain):
                 # Convert relative path to absolute path from data directory
                 file_path = f"{settings.data_dir}/{readme_path}" if not readme_path.startswith(
                     "{settings.data_dir}/") else readme_path
-                with open(file_path, "r") as f:
-                    project_docs = f.read()
+                project_docs = data_files.read_text(file_path)
 
         except Exception:
             pass
@@ -46,30 +45,49 @@ class ProjectSummariesChain(BaseChain):
             "github": project_info["github"]
         }
 
+    def summarize_project(self, project_name: str, projects_data: List[dict], job_posting: str) -> str:
+        project_context = self.load_project_context(project_name, projects_data)
+
+        promptInputs = {
+            "job": job_posting,
+            "project_title": project_context["title"],
+            "project_description": project_context["description"],
+            "project_stack": ", ".join(project_context["stack"]),
+            "project_docs": project_context["documentation"][:3000],
+            "github": project_context["github"],
+        }
+
+        result = super().invoke(promptInputs)
+        return result["content"]
+
     def invoke(self, state: ResumeState) -> Dict[str, Any]:
         project_data = self.load_projects_data()
-        project_names = state["project_names"]
-        project_summaries = []
-        for project_name in project_names:
-            project_context = self.load_project_context(project_name, project_data["projects"])
+        project_names = state["project_names"] or []
+        max_workers = max(1, min(settings.project_summary_concurrency, len(project_names) or 1))
 
-            promptInputs = {
-                "job": state["job_posting"],
-                "project_title": project_context["title"],
-                "project_description": project_context["description"],
-                "project_stack": ", ".join(project_context["stack"]),
-                "project_docs": project_context["documentation"][:3000],
-                "github": project_context["github"],
-            }
+        # Summarize all selected projects at once; results keep the selection order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.summarize_project, project_name,
+                                project_data["projects"], state["job_posting"])
+                for project_name in project_names
+            ]
 
-            result = super().invoke(promptInputs)
+            project_summaries = []
+            failed_projects = []
+            for project_name, future in zip(project_names, futures):
+                try:
+                    project_summaries.append(future.result())
+                except Exception as e:
+                    # One failed project shouldn't sink the others
+                    print(f"⚠️ Failed to summarize project {project_name}: {e}")
+                    failed_projects.append(project_name)
 
-            project_summaries.append(result["content"])
-        
         combined_summaries = "\n\n".join(project_summaries)
         return {
             "project_summaries": combined_summaries,
             "metadata": {
-                "total_projects_length": len(combined_summaries)
+                "total_projects_length": len(combined_summaries),
+                "failed_projects": failed_projects
             }
-        }
\ No newline at end of file
+        }
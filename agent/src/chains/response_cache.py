@@ -0,0 +1,158 @@
+"""Exact-match cache of LLM responses backed by SQLite"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+from ..config.settings import settings
+
+
+class ResponseCache:
+    """Caches LLM responses keyed by (model, rendered prompt hash, temperature).
+
+    Entries expire after a TTL, and the least recently used entries are evicted
+    once the cache grows beyond its maximum size.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        self.path = path or settings.llm_cache_path
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.llm_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.llm_cache_max_entries
+
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._available = True
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: Optional[float]) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{model}:{temperature}:{digest}"
+
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite store on first use; caching is skipped if it can't be opened"""
+        if self._db is None and self._available:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL;")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_responses (
+                        cache_key TEXT PRIMARY KEY,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_accessed REAL NOT NULL
+                    );
+                """)
+                self._db.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed
+                    ON llm_responses (last_accessed);
+                """)
+                self._db.commit()
+            except Exception as e:
+                print(f"⚠️ LLM response cache unavailable: {e}")
+                self._available = False
+                self._db = None
+        return self._db
+
+    def get(self, model: str, prompt: str, temperature: Optional[float]) -> Optional[str]:
+        """Return the cached response, or None on a miss or expired entry"""
+        key = self.make_key(model, prompt, temperature)
+        now = time.time()
+        with self._lock:
+            db = self._get_db()
+            if db is None:
+                self._misses += 1
+                return None
+
+            try:
+                row = db.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?;", (key,)
+                ).fetchone()
+                if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                    self._misses += 1
+                    return None
+
+                db.execute("UPDATE llm_responses SET last_accessed = ? WHERE cache_key = ?;", (now, key))
+                db.commit()
+                self._hits += 1
+                return row[0]
+            except Exception as e:
+                print(f"⚠️ Error reading LLM response cache: {e}")
+                self._misses += 1
+                return None
+
+    def put(self, model: str, prompt: str, temperature: Optional[float], response: str) -> None:
+        """Store a response and evict expired and least recently used entries"""
+        key = self.make_key(model, prompt, temperature)
+        now = time.time()
+        with self._lock:
+            db = self._get_db()
+            if db is None:
+                return
+
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (cache_key, response, created_at, last_accessed) "
+                    "VALUES (?, ?, ?, ?);",
+                    (key, response, now, now)
+                )
+                evicted = 0
+                if self.ttl_seconds:
+                    evicted += db.execute(
+                        "DELETE FROM llm_responses WHERE created_at < ?;", (now - self.ttl_seconds,)
+                    ).rowcount
+                if self.max_entries:
+                    evicted += db.execute("""
+                        DELETE FROM llm_responses WHERE cache_key IN (
+                            SELECT cache_key FROM llm_responses
+                            ORDER BY last_accessed DESC
+                            LIMIT -1 OFFSET ?
+                        );
+                    """, (self.max_entries,)).rowcount
+                db.commit()
+                self._evictions += evicted
+            except Exception as e:
+                print(f"⚠️ Error writing LLM response cache: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            db = self._get_db()
+            if db is not None:
+                db.execute("DELETE FROM llm_responses;")
+                db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current size"""
+        with self._lock:
+            entries = None
+            if self._db is not None:
+                try:
+                    entries = self._db.execute("SELECT COUNT(*) FROM llm_responses;").fetchone()[0]
+                except Exception:
+                    pass
+            lookups = self._hits + self._misses
+            return {
+                "enabled": settings.llm_cache_enabled,
+                "path": self.path if self._available else None,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -2,6 +2,7 @@ import json
 from ..workflows.states import ResumeState
 from typing import Dict, Any
 from .base import BaseChain
+from .data_files import data_files
 from ..config.settings import settings
 from langchain.prompts import PromptTemplate
 from ..config.prompts import PromptTemplates
@@ -15,8 +16,7 @@ class SkillsChain(BaseChain):
         return LaTeXExtractor.extract_skills(response)
     
     def load_skills_data(self) -> dict:
-        with open(settings.skills_path, "r") as f:
-            return json.load(f)
+        return data_files.load_json(settings.skills_path)
         
     def invoke(self, state: ResumeState) -> Dict[str, Any]:
         skills_data = self.load_skills_data()
@@ -29,6 +29,10 @@ class SkillsChain(BaseChain):
 
         return {
             "skills": result["content"],
-            "raw_response": result["raw_response"]
+            "raw_response": result["raw_response"],
+            "metadata": {
+                "total_skills_available": sum(len(skills) for skills in skills_data.values()),
+                "job_posting_length": len(state["job_posting"])
+            }
         }
 
@@ -13,6 +13,24 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4o", env="OPENAI_MODEL") 
     openai_embedding_model: str = Field("text-embedding-3-large", env="OPENAI_EMBEDDING_MODEL")
+    # Chat requests per minute across the whole process (0 means unlimited)
+    openai_requests_per_minute: float = Field(500, env="OPENAI_REQUESTS_PER_MINUTE")
+    llm_rate_limit_burst: int = Field(5, env="LLM_RATE_LIMIT_BURST")
+    
+    # Client Configuration
+    http_max_connections: int = Field(20, env="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(10, env="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(60.0, env="HTTP_KEEPALIVE_EXPIRY")
+    http_timeout: float = Field(120.0, env="HTTP_TIMEOUT")
+    chroma_host: str = Field("localhost", env="CHROMA_HOST")
+    chroma_port: int = Field(8000, env="CHROMA_PORT")
+    chroma_collection: str = Field("aria-vs", env="CHROMA_COLLECTION")
+    
+    # LLM Response Cache Configuration
+    llm_cache_enabled: bool = Field(True, env="LLM_CACHE_ENABLED")
+    llm_cache_path: str = Field("./cache/llm_responses.sqlite", env="LLM_CACHE_PATH")
+    llm_cache_ttl_seconds: int = Field(7 * 24 * 3600, env="LLM_CACHE_TTL_SECONDS")
+    llm_cache_max_entries: int = Field(5000, env="LLM_CACHE_MAX_ENTRIES")
     
     # Database Configuration
     db_host: str = Field("localhost", env="DB_HOST")
@@ -34,6 +52,7 @@ class Settings(BaseSettings):
     # Application Configuration
     chunk_size: int = Field(1000, env="CHUNK_SIZE")
     chunk_overlap: int = Field(200, env="CHUNK_OVERLAP")
+    ingestion_manifest_path: str = Field("./cache/ingestion_manifest.json", env="INGESTION_MANIFEST_PATH")
     max_retries: int = Field(3, env="MAX_RETRIES")
     num_docs: int = Field(8, env="NUM_DOCS")
     
@@ -55,6 +74,36 @@ class Settings(BaseSettings):
     max_experiences: int = Field(4, env="MAX_EXPERIENCES")
     max_projects: int = Field(5, env="MAX_PROJECTS")
     max_highlights: int = Field(7, env="MAX_HIGHLIGHTS")
+    # Reuse stored sections from a past job at least this similar (set above 1 to disable)
+    resume_reuse_threshold: float = Field(0.97, env="RESUME_REUSE_THRESHOLD")
+    # Largest job_ids list answered with a dense n×n matrix (2048 jobs = 16 MB of float32)
+    similarity_dense_max_jobs: int = Field(2048, env="SIMILARITY_DENSE_MAX_JOBS")
+    similarity_topk_max_k: int = Field(100, env="SIMILARITY_TOPK_MAX_K")
+    
+    # Concurrency Configuration
+    project_summary_concurrency: int = Field(5, env="PROJECT_SUMMARY_CONCURRENCY")
+    generation_workers: int = Field(3, env="GENERATION_WORKERS")
+    generation_max_queue_depth: int = Field(20, env="GENERATION_MAX_QUEUE_DEPTH")
+    generation_job_ttl_seconds: int = Field(3600, env="GENERATION_JOB_TTL_SECONDS")
+    generation_queue_backend: str = Field("memory", env="GENERATION_QUEUE_BACKEND")
+    batch_max_concurrency: int = Field(4, env="BATCH_MAX_CONCURRENCY")
+    batch_max_items: int = Field(100, env="BATCH_MAX_ITEMS")
+    
+    # LaTeX Compilation Configuration
+    latex_compile_workers: int = Field(4, env="LATEX_COMPILE_WORKERS")
+    latex_compile_timeout: int = Field(120, env="LATEX_COMPILE_TIMEOUT")
+    latex_max_passes: int = Field(3, env="LATEX_MAX_PASSES")
+    latex_precompiled_format: bool = Field(True, env="LATEX_PRECOMPILED_FORMAT")
+    latex_format_dir: str = Field("./cache/latex_formats", env="LATEX_FORMAT_DIR")
+    latex_pdf_cache_enabled: bool = Field(True, env="LATEX_PDF_CACHE_ENABLED")
+    latex_pdf_cache_dir: str = Field("./cache/latex_pdfs", env="LATEX_PDF_CACHE_DIR")
+    latex_pdf_cache_max_mb: int = Field(256, env="LATEX_PDF_CACHE_MAX_MB")
+    latex_background_compile_ttl_seconds: int = Field(600, env="LATEX_BACKGROUND_COMPILE_TTL_SECONDS")
+    
+    # Workflow Checkpoint Configuration
+    workflow_checkpointer: str = Field("sqlite", env="WORKFLOW_CHECKPOINTER")
+    workflow_checkpoint_path: str = Field("./cache/checkpoints.sqlite", env="WORKFLOW_CHECKPOINT_PATH")
+    workflow_checkpoint_ttl_seconds: int = Field(86400, env="WORKFLOW_CHECKPOINT_TTL_SECONDS")
     
     class Config:
         env_file = ".env"
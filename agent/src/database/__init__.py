@@ -8,6 +8,11 @@ from .schema import SchemaManager
 from .embedding_service import EmbeddingService
 from .job_repository import JobRepository
 from .similarity_service import SimilarityService
+from .embedding_index import EmbeddingIndex
+from .backfill_service import BackfillService
+from .embedding_cache import EmbeddingCache
+from .embedding_batcher import EmbeddingBatcher
+from .generation_queue import GenerationQueue
 
 
 default_db = db
@@ -16,7 +21,9 @@ __all__ = [
     # New modular architecture
     'db', 'Database', 'default_db',
     'DatabaseConnection', 'SchemaManager', 'EmbeddingService', 
-    'JobRepository', 'SimilarityService',
+    'JobRepository', 'SimilarityService', 'EmbeddingIndex',
+    'BackfillService', 'EmbeddingCache', 'EmbeddingBatcher',
+    'GenerationQueue',
     
     # Legacy interface
     'db', 'Database'
@@ -0,0 +1,323 @@
+"""
+Embedding backfill module.
+Generates missing job embeddings in concurrent, token-aware batches with a resumable checkpoint.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+from psycopg2.extras import execute_values
+from .connection import DatabaseConnection
+from .embedding_service import EmbeddingService
+from .embedding_index import EmbeddingIndex
+
+
+class BackfillService:
+    """Backfills embeddings for job applications that don't have them."""
+
+    def __init__(self, db_connection: DatabaseConnection, embedding_service: EmbeddingService,
+                 embedding_index: Optional[EmbeddingIndex] = None):
+        self.db_connection = db_connection
+        self.embedding_service = embedding_service
+        self.embedding_index = embedding_index
+
+        self.batch_max_tokens = int(os.getenv('BACKFILL_BATCH_MAX_TOKENS', '100000'))
+        self.batch_max_size = int(os.getenv('BACKFILL_BATCH_MAX_SIZE', '256'))
+        self.max_concurrency = int(os.getenv('BACKFILL_MAX_CONCURRENCY', '4'))
+        self.page_size = int(os.getenv('BACKFILL_PAGE_SIZE', '1000'))
+
+        self._run_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        self._progress = self._new_progress("idle")
+
+    @property
+    def checkpoint_name(self) -> str:
+        """Checkpoints are per embedding model so switching models starts over."""
+        return f"embeddings:{self.embedding_service.model}"
+
+    def is_running(self) -> bool:
+        return self._run_lock.locked()
+
+    def run(self) -> bool:
+        """Run the backfill to completion; resumes from the last checkpoint if interrupted."""
+        if not self._run_lock.acquire(blocking=False):
+            print("⚠️ Embedding backfill is already running")
+            return False
+
+        try:
+            return self._run()
+        except Exception as e:
+            print(f"❌ Error during embedding backfill: {e}")
+            self._finish_progress("failed", str(e))
+            return False
+        finally:
+            self._run_lock.release()
+
+    def get_progress(self) -> Dict:
+        """Get progress of the current (or last) backfill run, including rows/sec and ETA."""
+        with self._progress_lock:
+            progress = dict(self._progress)
+
+        started_at = progress.get("started_at")
+        if started_at:
+            elapsed = (progress.get("finished_at") or time.time()) - started_at
+            rate = progress["processed"] / elapsed if elapsed > 0 else 0.0
+            remaining = max(progress["total"] - progress["processed"], 0)
+            progress["elapsed_seconds"] = round(elapsed, 2)
+            progress["rows_per_second"] = round(rate, 2)
+            progress["eta_seconds"] = round(remaining / rate, 1) if rate > 0 and progress["status"] == "running" else None
+
+        return progress
+
+    def _run(self) -> bool:
+        if not self._ensure_checkpoint_table():
+            self._finish_progress("failed", "Could not create checkpoint table")
+            return False
+
+        checkpoint = self._load_checkpoint()
+        total = self._count_pending(checkpoint)
+        if total is None:
+            self._finish_progress("failed", "Could not count pending jobs")
+            return False
+
+        self._start_progress(total, checkpoint)
+        if total == 0:
+            print("✅ All jobs already have embeddings")
+            self._save_checkpoint(0)
+            self._finish_progress("completed")
+            return True
+
+        resumed = f" (resuming after job {checkpoint})" if checkpoint else ""
+        print(f"🔄 Generating embeddings for {total} jobs{resumed}...")
+
+        in_flight: Deque[Tuple[Future, int]] = deque()
+        last_id = checkpoint
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while True:
+                jobs = self._fetch_pending_page(last_id)
+                if jobs is None:
+                    raise RuntimeError("Failed to fetch jobs without embeddings")
+                if not jobs:
+                    break
+                last_id = jobs[-1]['id']
+
+                texts = [
+                    self.embedding_service.create_job_embedding_text(
+                        job['company_name'], job['position_title'], job['job_description']
+                    )
+                    for job in jobs
+                ]
+                for indices in self.embedding_service.create_token_batches(
+                        texts, self.batch_max_tokens, self.batch_max_size):
+                    # Bound the number of batches in flight
+                    while len(in_flight) >= self.max_concurrency:
+                        self._complete_oldest_batch(in_flight)
+
+                    batch = [(jobs[i]['id'], texts[i]) for i in indices]
+                    in_flight.append((executor.submit(self._process_batch, batch), batch[-1][0]))
+
+            while in_flight:
+                self._complete_oldest_batch(in_flight)
+
+        # Run finished: the next run rescans from the start for rows that failed this time
+        self._save_checkpoint(0)
+        if self.embedding_index is not None:
+            self.embedding_index.invalidate()
+
+        progress = self.get_progress()
+        self._finish_progress("completed")
+        print(f"✅ Embedding backfill completed: {progress['succeeded']}/{progress['total']} successful "
+              f"({progress['rows_per_second']} rows/s)")
+        return progress['succeeded'] > 0
+
+    def _complete_oldest_batch(self, in_flight: Deque[Tuple[Future, int]]) -> None:
+        """Wait for the oldest batch and advance the checkpoint past it."""
+        future, batch_last_id = in_flight.popleft()
+        succeeded, failed = future.result()
+
+        # Batches complete in submission order here, so every job up to batch_last_id is done
+        self._save_checkpoint(batch_last_id)
+        with self._progress_lock:
+            self._progress["processed"] += succeeded + failed
+            self._progress["succeeded"] += succeeded
+            self._progress["failed"] += failed
+            self._progress["batches_completed"] += 1
+            self._progress["checkpoint_job_id"] = batch_last_id
+
+    def _process_batch(self, batch: List[Tuple[int, str]]) -> Tuple[int, int]:
+        """Embed one batch with a single API call and write it with one statement."""
+        try:
+            embeddings = self.embedding_service.get_batch_embeddings([text for _, text in batch])
+        except Exception as e:
+            print(f"  ❌ Error embedding batch ending at job {batch[-1][0]}: {e}")
+            return 0, len(batch)
+
+        rows = [
+            (job_id, text, embedding)
+            for (job_id, text), embedding in zip(batch, embeddings)
+            if embedding and self.embedding_service.validate_embedding(embedding)
+        ]
+        failed = len(batch) - len(rows)
+        if not rows:
+            return 0, failed
+
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return 0, len(batch)
+
+            try:
+                cursor = conn.cursor()
+                execute_values(cursor, """
+                    UPDATE job_applications AS j
+                    SET embedding_text = v.embedding_text, embedding = v.embedding,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(id, embedding_text, embedding)
+                    WHERE j.id = v.id;
+                """, rows, template="(%s, %s, %s::float8[])")
+                conn.commit()
+                cursor.close()
+            except Exception as e:
+                print(f"  ❌ Error writing batch ending at job {batch[-1][0]}: {e}")
+                conn.rollback()
+                return 0, len(batch)
+
+        print(f"  ✅ Generated {len(rows)} embeddings (jobs {batch[0][0]}-{batch[-1][0]})")
+        return len(rows), failed
+
+    def _fetch_pending_page(self, after_id: int) -> Optional[List[Dict]]:
+        """Keyset-paginate jobs without embeddings in id order."""
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, company_name, position_title, job_description
+                    FROM job_applications
+                    WHERE (embedding IS NULL OR embedding_text IS NULL) AND id > %s
+                    ORDER BY id
+                    LIMIT %s;
+                """, (after_id, self.page_size))
+
+                jobs = cursor.fetchall()
+                cursor.close()
+                return jobs
+
+            except Exception as e:
+                print(f"❌ Error fetching jobs without embeddings: {e}")
+                return None
+
+    def _count_pending(self, after_id: int) -> Optional[int]:
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT COUNT(*) AS pending
+                    FROM job_applications
+                    WHERE (embedding IS NULL OR embedding_text IS NULL) AND id > %s;
+                """, (after_id,))
+
+                pending = cursor.fetchone()['pending']
+                cursor.close()
+                return pending
+
+            except Exception as e:
+                print(f"❌ Error counting jobs without embeddings: {e}")
+                return None
+
+    def _ensure_checkpoint_table(self) -> bool:
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS embedding_backfill_checkpoints (
+                        name VARCHAR(255) PRIMARY KEY,
+                        last_job_id INTEGER NOT NULL DEFAULT 0,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+                """)
+                conn.commit()
+                cursor.close()
+                return True
+
+            except Exception as e:
+                print(f"❌ Error creating backfill checkpoint table: {e}")
+                conn.rollback()
+                return False
+
+    def _load_checkpoint(self) -> int:
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return 0
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT last_job_id FROM embedding_backfill_checkpoints WHERE name = %s;
+                """, (self.checkpoint_name,))
+
+                row = cursor.fetchone()
+                cursor.close()
+                return row['last_job_id'] if row else 0
+
+            except Exception as e:
+                print(f"⚠️ Error loading backfill checkpoint: {e}")
+                return 0
+
+    def _save_checkpoint(self, last_job_id: int) -> None:
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO embedding_backfill_checkpoints (name, last_job_id, updated_at)
+                    VALUES (%s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (name) DO UPDATE
+                    SET last_job_id = EXCLUDED.last_job_id, updated_at = CURRENT_TIMESTAMP;
+                """, (self.checkpoint_name, last_job_id))
+                conn.commit()
+                cursor.close()
+
+            except Exception as e:
+                print(f"⚠️ Error saving backfill checkpoint: {e}")
+                conn.rollback()
+
+    @staticmethod
+    def _new_progress(status: str) -> Dict:
+        return {
+            "status": status,
+            "total": 0,
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "batches_completed": 0,
+            "checkpoint_job_id": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None
+        }
+
+    def _start_progress(self, total: int, checkpoint: int) -> None:
+        with self._progress_lock:
+            self._progress = self._new_progress("running")
+            self._progress["total"] = total
+            self._progress["checkpoint_job_id"] = checkpoint
+            self._progress["started_at"] = time.time()
+
+    def _finish_progress(self, status: str, error: Optional[str] = None) -> None:
+        with self._progress_lock:
+            self._progress["status"] = status
+            self._progress["finished_at"] = time.time()
+            self._progress["error"] = error
@@ -1,65 +1,186 @@
 """
 Database connection management module.
-Handles PostgreSQL connections and configuration.
+Handles PostgreSQL connections, pooling and configuration.
 """
 
 import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
 import psycopg2
+from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
-from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
 class DatabaseConnection:
-    """Manages database connections and configuration."""
-    
-    def __init__(self):
+    """Manages a thread-safe pool of database connections and configuration."""
+
+    def __init__(self, min_size: Optional[int] = None, max_size: Optional[int] = None):
         self.host = os.getenv('DB_HOST', 'localhost')
         self.port = os.getenv('DB_PORT', '5432')
         self.database = os.getenv('DB_NAME', 'aria')
         self.user = os.getenv('DB_USER')
         self.password = os.getenv('DB_PASSWORD')
-        
+
+        # Pool configuration
+        self.min_size = min_size if min_size is not None else int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+        self.max_size = max_size if max_size is not None else int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        self.checkout_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+        self.health_check_interval = float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))
+
+        self._pool: Optional[pool.ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises when exhausted; the semaphore makes callers wait instead
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._last_used: Dict[int, float] = {}
+
+    def _get_pool(self) -> pool.ThreadedConnectionPool:
+        """Create the connection pool on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = pool.ThreadedConnectionPool(
+                        self.min_size,
+                        self.max_size,
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password,
+                        cursor_factory=RealDictCursor
+                    )
+        return self._pool
+
+    def _is_healthy(self, conn: psycopg2.extensions.connection) -> bool:
+        """Check that a pooled connection is still usable before handing it out."""
+        if conn.closed:
+            return False
+
+        last_used = self._last_used.get(id(conn), 0.0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        # Connection has been idle for a while, ping the server before reusing it
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
     def get_connection(self) -> Optional[psycopg2.extensions.connection]:
-        """Get a database connection with RealDictCursor."""
+        """
+        Borrow a connection with RealDictCursor from the pool.
+
+        Connections obtained here must be handed back with release_connection();
+        prefer the connection() context manager which does this automatically.
+        """
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            print(f"❌ Timed out waiting for a database connection after {self.checkout_timeout}s")
+            return None
+
         try:
-            conn = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                cursor_factory=RealDictCursor
-            )
-            return conn
+            connection_pool = self._get_pool()
+            # Replace connections that were dropped by the server while idle. The pool
+            # holds at most max_size idle ones, so after discarding that many the next
+            # getconn() opens a fresh connection
+            for _ in range(self.max_size + 1):
+                conn = connection_pool.getconn()
+                if self._is_healthy(conn):
+                    return conn
+                print("⚠️ Discarding stale database connection")
+                self._last_used.pop(id(conn), None)
+                connection_pool.putconn(conn, close=True)
+
+            print("❌ Error connecting to database: no healthy connection available")
+            self._slots.release()
+            return None
         except Exception as e:
             print(f"❌ Error connecting to database: {e}")
+            self._slots.release()
             return None
-    
-    def test_connection(self) -> bool:
-        """Test the database connection and return status."""
-        conn = self.get_connection()
-        if not conn:
-            print("❌ Failed to connect to database")
-            return False
-            
+
+    def release_connection(self, conn: Optional[psycopg2.extensions.connection]) -> None:
+        """Return a borrowed connection to the pool."""
+        if conn is None:
+            return
+
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT version();")
-            version = cursor.fetchone()
-            print(f"✅ Database connected successfully!")
-            print(f"PostgreSQL version: {version['version']}")
-            cursor.close()
-            conn.close()
-            return True
+            broken = bool(conn.closed)
+            if not broken and conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                # Never hand out a connection with a dangling transaction
+                conn.rollback()
+        except Exception:
+            broken = True
+
+        try:
+            if broken:
+                self._last_used.pop(id(conn), None)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+            self._get_pool().putconn(conn, close=broken)
         except Exception as e:
-            print(f"❌ Error testing connection: {e}")
-            if conn:
-                conn.close()
-            return False
-    
+            print(f"⚠️ Error returning connection to pool: {e}")
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[Optional[psycopg2.extensions.connection]]:
+        """
+        Context manager that borrows a pooled connection and always returns it.
+
+        Yields None when no connection could be obtained.
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            self.release_connection(conn)
+
+    def close_pool(self) -> None:
+        """Close every connection held by the pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._last_used.clear()
+
+    def test_connection(self) -> bool:
+        """Test the database connection and return status."""
+        with self.connection() as conn:
+            if not conn:
+                print("❌ Failed to connect to database")
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT version();")
+                version = cursor.fetchone()
+                print(f"✅ Database connected successfully!")
+                print(f"PostgreSQL version: {version['version']}")
+                cursor.close()
+                return True
+            except Exception as e:
+                print(f"❌ Error testing connection: {e}")
+                return False
+
+    def get_pool_info(self) -> dict:
+        """Get connection pool configuration and usage."""
+        connection_pool = self._pool
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "initialized": connection_pool is not None,
+            "in_use": len(connection_pool._used) if connection_pool else 0,
+            "idle": len(connection_pool._pool) if connection_pool else 0
+        }
+
     def get_connection_info(self) -> dict:
         """Get connection configuration info (without sensitive data)."""
         return {
@@ -67,5 +188,6 @@ class DatabaseConnection:
             "port": self.port,
             "database": self.database,
             "user": self.user,
-            "password_set": bool(self.password)
-        }
\ No newline at end of file
+            "password_set": bool(self.password),
+            "pool": self.get_pool_info()
+        }
@@ -3,12 +3,15 @@ Main database module - Industrial-grade modular database architecture.
 Orchestrates all database services and provides a unified interface.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 from .connection import DatabaseConnection
 from .schema import SchemaManager
 from .embedding_service import EmbeddingService
 from .job_repository import JobRepository
 from .similarity_service import SimilarityService
+from .embedding_index import EmbeddingIndex
+from .generation_queue import GenerationQueue
 
 
 class Database:
@@ -24,8 +27,11 @@ class Database:
         self.connection = DatabaseConnection()
         self.schema_manager = SchemaManager(self.connection)
         self.embedding_service = EmbeddingService()
-        self.job_repository = JobRepository(self.connection, self.embedding_service)
-        self.similarity_service = SimilarityService(self.connection, self.embedding_service)
+        self.embedding_index = EmbeddingIndex(self.embedding_service.embedding_dimension)
+        self.job_repository = JobRepository(self.connection, self.embedding_service, self.embedding_index)
+        self.similarity_service = SimilarityService(self.connection, self.embedding_service, self.embedding_index,
+                                                     self.schema_manager)
+        self.generation_queue = GenerationQueue(self.connection)
     
     # Connection Management
     def test_connection(self) -> bool:
@@ -45,6 +51,14 @@ class Database:
         """Add unique constraint for company_name and position_title."""
         return self.schema_manager.add_unique_constraint()
     
+    def enable_pgvector(self, index_type: str = "hnsw") -> bool:
+        """Add the pgvector column, migrate existing embeddings and build the ANN index."""
+        success = self.schema_manager.enable_pgvector(
+            self.embedding_service.embedding_dimension, index_type
+        )
+        self.similarity_service.reset_pgvector_state()
+        return success
+    
     def check_table_exists(self, table_name: str) -> bool:
         """Check if a table exists in the database."""
         return self.schema_manager.check_table_exists(table_name)
@@ -77,6 +91,10 @@ class Database:
         """Update the resume generation status for a job."""
         return self.job_repository.update_job_resume_status(job_id, resume_generated)
     
+    def save_resume_sections(self, job_id: int, sections: Dict) -> bool:
+        """Store the generated resume sections for a job."""
+        return self.job_repository.save_resume_sections(job_id, sections)
+    
     def delete_job_application(self, job_id: int) -> bool:
         """Delete a job application."""
         return self.job_repository.delete_job_application(job_id)
@@ -93,6 +111,14 @@ class Database:
             company_name, position_title, job_description, threshold, limit
         )
     
+    def find_reusable_resume(self, company_name: str, position_title: str, job_description: str,
+                             threshold: float = 0.97, exclude_job_id: Optional[int] = None) -> Optional[Dict]:
+        """Find a near-duplicate past job whose resume sections can be reused."""
+        return self.similarity_service.find_reusable_resume(
+            company_name, position_title, job_description, threshold,
+            exclude_job_id=exclude_job_id
+        )
+    
     def find_similar_jobs_basic(self, company_name: str, position_title: str, 
                                job_description: str, limit: int = 10) -> List[Dict]:
         """Fallback: Find similar job applications using basic text matching."""
@@ -104,10 +130,26 @@ class Database:
         """Calculate similarity matrix between multiple jobs."""
         return self.similarity_service.get_job_similarity_matrix(job_ids)
     
+    def get_job_similarity_array(self, job_ids: List[int]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Calculate the dense float32 similarity matrix between multiple jobs."""
+        return self.similarity_service.get_job_similarity_array(job_ids)
+    
+    def get_job_similarity_topk(self, job_ids: List[int], k: int = 10) -> Optional[Dict[int, List[Tuple[int, float]]]]:
+        """Calculate the top-k most similar jobs for each job."""
+        return self.similarity_service.get_job_similarity_topk(job_ids, k)
+    
     def backfill_embeddings(self) -> bool:
         """Generate embeddings for existing job applications that don't have them."""
         return self.similarity_service.backfill_embeddings()
     
+    def get_backfill_progress(self) -> Dict:
+        """Get progress (rows/sec, ETA) of the current or last embedding backfill."""
+        return self.similarity_service.backfill_service.get_progress()
+    
+    def is_backfill_running(self) -> bool:
+        """Check whether an embedding backfill is in progress."""
+        return self.similarity_service.backfill_service.is_running()
+    
     # Embedding Operations
     def get_embedding(self, text: str) -> Optional[List[float]]:
         """Generate OpenAI embedding for given text."""
@@ -150,12 +192,20 @@ class Database:
                 "database": {
                     "jobs": job_stats,
                     "tables": {
-                        "job_applications": self.check_table_exists("job_applications")
-                    }
+                        "job_applications": self.check_table_exists("job_applications"),
+                        "generation_jobs": self.check_table_exists("generation_jobs")
+                    },
+                    "pgvector_enabled": self.similarity_service.is_pgvector_enabled()
                 },
                 "embedding_service": {
                     "model": model_info,
-                    "available": bool(self.embedding_service.openai_client)
+                    "available": bool(self.embedding_service.openai_client),
+                    "cache": self.embedding_service.get_cache_stats(),
+                    "batching": self.embedding_service.get_batching_stats()
+                },
+                "similarity_index": {
+                    "backend": self.similarity_service.backend,
+                    **self.embedding_index.get_stats()
                 }
             }
         except Exception as e:
@@ -206,7 +256,7 @@ db = Database()
 
 # Backward compatibility aliases for existing code
 def get_connection():
-    """Backward compatibility: Get database connection."""
+    """Backward compatibility: Borrow a pooled connection (return it with db.connection.release_connection)."""
     return db.connection.get_connection()
 
 
@@ -0,0 +1,131 @@
+"""
+Embedding micro-batcher module.
+Coalesces concurrent single-text embedding requests into batched API calls.
+"""
+
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class EmbeddingBatcher:
+    """
+    Collects texts submitted from many threads and sends them as one embeddings request.
+
+    A batch is flushed when the collection window closes or when it reaches the maximum
+    number of inputs or tokens. Identical texts already waiting or in flight share a
+    single future.
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], List[List[float]]],
+                 count_tokens: Optional[Callable[[str], int]] = None,
+                 window_ms: Optional[float] = None,
+                 max_batch_size: Optional[int] = None,
+                 max_batch_tokens: Optional[int] = None,
+                 max_concurrent_requests: Optional[int] = None):
+        self.embed_fn = embed_fn
+        self.count_tokens = count_tokens or (lambda text: len(text) // 4 + 1)
+        self.window = (window_ms if window_ms is not None else float(os.getenv('EMBEDDING_BATCH_WINDOW_MS', '10'))) / 1000
+        self.max_batch_size = max_batch_size or int(os.getenv('EMBEDDING_BATCH_MAX_SIZE', '256'))
+        self.max_batch_tokens = max_batch_tokens or int(os.getenv('EMBEDDING_BATCH_MAX_TOKENS', '100000'))
+        max_concurrent_requests = max_concurrent_requests or int(os.getenv('EMBEDDING_BATCH_MAX_CONCURRENCY', '4'))
+
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._collector: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_requests,
+                                            thread_name_prefix="embedding-batch")
+
+        self._submitted = 0
+        self._deduplicated = 0
+        self._batches_sent = 0
+        self._texts_sent = 0
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for embedding and return a future for its vector."""
+        key = text.strip()
+        with self._lock:
+            self._submitted += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._deduplicated += 1
+                return future
+
+            future = Future()
+            self._in_flight[key] = future
+            self._queue.put((key, future))
+
+            if self._collector is None or not self._collector.is_alive():
+                self._collector = threading.Thread(target=self._collect, name="embedding-batcher", daemon=True)
+                self._collector.start()
+
+        return future
+
+    def _collect(self) -> None:
+        """Group queued texts into batches and hand them to the request pool."""
+        carry: Optional[Tuple[str, Future]] = None
+        while True:
+            first = carry or self._queue.get()
+            carry = None
+
+            batch = [first]
+            tokens = self.count_tokens(first[0])
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                item_tokens = self.count_tokens(item[0])
+                if tokens + item_tokens > self.max_batch_tokens:
+                    # Starts the next batch instead
+                    carry = item
+                    break
+                batch.append(item)
+                tokens += item_tokens
+
+            self._executor.submit(self._flush, batch)
+
+    def _flush(self, batch: List[Tuple[str, Future]]) -> None:
+        """Send one embeddings request and fan the results back out to the callers."""
+        texts = [text for text, _ in batch]
+        try:
+            try:
+                embeddings = self.embed_fn(texts)
+                if embeddings is None or len(embeddings) != len(texts):
+                    raise ValueError(f"Embeddings API returned {0 if embeddings is None else len(embeddings)} "
+                                     f"vectors for {len(texts)} inputs")
+            finally:
+                with self._lock:
+                    self._batches_sent += 1
+                    self._texts_sent += len(texts)
+                    for text, _ in batch:
+                        self._in_flight.pop(text, None)
+
+            for index, (_, future) in enumerate(batch):
+                future.set_result(embeddings[index])
+        except Exception as e:
+            # Every caller still waiting gets the error instead of hanging until its timeout
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def get_stats(self) -> Dict:
+        """Get coalescing metrics."""
+        with self._lock:
+            return {
+                "submitted": self._submitted,
+                "deduplicated": self._deduplicated,
+                "batches_sent": self._batches_sent,
+                "texts_sent": self._texts_sent,
+                "average_batch_size": round(self._texts_sent / self._batches_sent, 2) if self._batches_sent else 0.0,
+                "window_ms": self.window * 1000
+            }
@@ -0,0 +1,158 @@
+"""
+Embedding cache module.
+Content-addressed cache of embeddings with an in-memory LRU tier over a SQLite tier.
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class EmbeddingCache:
+    """Caches embeddings keyed by (model, sha256 of normalized text)."""
+
+    def __init__(self, path: Optional[str] = None, memory_size: Optional[int] = None):
+        self.path = path or os.getenv('EMBEDDING_CACHE_PATH', './cache/embeddings.sqlite')
+        self.memory_size = memory_size if memory_size is not None else int(os.getenv('EMBEDDING_CACHE_MEMORY_SIZE', '1024'))
+
+        self._memory: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_available = True
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse whitespace so trivially different copies of a posting share an entry."""
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, model: str, text: str) -> Tuple[str, str]:
+        digest = hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+        return model, digest
+
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite tier on first use; the cache keeps working in memory if it can't."""
+        if self._db is None and self._disk_available:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL;")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        model TEXT NOT NULL,
+                        text_hash TEXT NOT NULL,
+                        embedding BLOB NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (model, text_hash)
+                    );
+                """)
+                self._db.commit()
+            except Exception as e:
+                print(f"⚠️ Embedding disk cache unavailable, using memory only: {e}")
+                self._disk_available = False
+                self._db = None
+        return self._db
+
+    def _remember(self, key: Tuple[str, str], embedding: List[float]) -> None:
+        """Insert into the LRU tier, evicting the least recently used entry."""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Look up a single embedding."""
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up several embeddings, checking memory first and then disk."""
+        keys = [self.make_key(model, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+
+        with self._lock:
+            disk_lookups: Dict[str, List[int]] = {}
+            for index, key in enumerate(keys):
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    results[index] = embedding
+                    self._memory_hits += 1
+                else:
+                    disk_lookups.setdefault(key[1], []).append(index)
+
+            db = self._get_db() if disk_lookups else None
+            if db is not None:
+                try:
+                    hashes = list(disk_lookups)
+                    # Stay well under SQLite's bound-parameter limit
+                    for start in range(0, len(hashes), 500):
+                        chunk = hashes[start:start + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        rows = db.execute(
+                            f"SELECT text_hash, embedding FROM embeddings "
+                            f"WHERE model = ? AND text_hash IN ({placeholders});",
+                            [model, *chunk]
+                        ).fetchall()
+                        for text_hash, blob in rows:
+                            embedding = np.frombuffer(blob, dtype=np.float32).tolist()
+                            self._remember((model, text_hash), embedding)
+                            for index in disk_lookups.pop(text_hash):
+                                results[index] = embedding
+                                self._disk_hits += 1
+                except Exception as e:
+                    print(f"⚠️ Error reading embedding disk cache: {e}")
+
+            self._misses += sum(len(indices) for indices in disk_lookups.values())
+
+        return results
+
+    def put(self, model: str, text: str, embedding: List[float]) -> None:
+        """Store a single embedding."""
+        self.put_many(model, [text], [embedding])
+
+    def put_many(self, model: str, texts: Sequence[str], embeddings: Sequence[Optional[List[float]]]) -> None:
+        """Store embeddings in both tiers; None entries are skipped."""
+        rows = []
+        with self._lock:
+            for text, embedding in zip(texts, embeddings):
+                if not embedding:
+                    continue
+                key = self.make_key(model, text)
+                self._remember(key, list(embedding))
+                rows.append((model, key[1], np.asarray(embedding, dtype=np.float32).tobytes()))
+
+            db = self._get_db() if rows else None
+            if db is not None:
+                try:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, text_hash, embedding) VALUES (?, ?, ?);",
+                        rows
+                    )
+                    db.commit()
+                except Exception as e:
+                    print(f"⚠️ Error writing embedding disk cache: {e}")
+
+    def get_stats(self) -> Dict:
+        """Get hit-rate metrics for both tiers."""
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_size": self.memory_size,
+                "disk_path": self.path if self._disk_available else None,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
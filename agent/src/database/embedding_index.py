@@ -0,0 +1,196 @@
+"""
+In-memory embedding index module.
+Keeps a contiguous, pre-normalized float32 matrix of job embeddings for fast similarity queries.
+"""
+
+import time
+import threading
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class EmbeddingIndex:
+    """Thread-safe in-process matrix of normalized embeddings keyed by job id."""
+
+    def __init__(self, dimension: int = 1536, initial_capacity: int = 256):
+        self.dimension = dimension
+        self._initial_capacity = initial_capacity
+        self._lock = threading.RLock()
+        # Held for a whole rebuild (begin_load .. finish_load), so two loads never overlap
+        self.load_lock = threading.Lock()
+
+        self._matrix = np.zeros((0, dimension), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._positions: Dict[int, int] = {}
+        self._size = 0
+
+        self._loaded = False
+        self._loading = False
+        self._pending: List[Tuple[str, int, Optional[List[float]]]] = []
+        self._last_rebuild_seconds: Optional[float] = None
+        self._last_rebuild_at: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _normalize(self, embedding: Iterable[float]) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            print(f"⚠️ Embedding dimension mismatch: {vector.shape[0] if vector.ndim else 0} vs {self.dimension}")
+            return None
+
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Grow the backing arrays geometrically so appends stay amortized O(1)."""
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+
+        new_capacity = max(required, capacity * 2, self._initial_capacity)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix = matrix
+        self._ids = ids
+
+    def begin_load(self) -> None:
+        """Mark the start of a rebuild; updates received meanwhile are replayed afterwards.
+
+        Callers must hold load_lock until finish_load() or abort_load().
+        """
+        with self._lock:
+            self._loading = True
+            self._pending = []
+
+    def finish_load(self, rows: Iterable[Tuple[int, List[float]]]) -> None:
+        """Build the matrix from (job_id, embedding) pairs and replay concurrent updates."""
+        start_time = time.perf_counter()
+
+        ids = []
+        vectors = []
+        for job_id, embedding in rows:
+            vector = self._normalize(embedding) if embedding else None
+            if vector is not None:
+                ids.append(job_id)
+                vectors.append(vector)
+
+        with self._lock:
+            count = len(ids)
+            self._matrix = np.zeros((max(count, self._initial_capacity), self.dimension), dtype=np.float32)
+            self._ids = np.zeros(self._matrix.shape[0], dtype=np.int64)
+            if count:
+                self._matrix[:count] = np.vstack(vectors)
+                self._ids[:count] = ids
+            self._positions = {job_id: position for position, job_id in enumerate(ids)}
+            self._size = count
+
+            self._loaded = True
+            self._loading = False
+            pending, self._pending = self._pending, []
+            for operation, job_id, embedding in pending:
+                if operation == "upsert":
+                    self.upsert(job_id, embedding)
+                else:
+                    self.remove(job_id)
+
+            self._last_rebuild_seconds = time.perf_counter() - start_time
+            self._last_rebuild_at = time.time()
+
+        print(f"🧮 Embedding index built with {self._size} vectors in {self._last_rebuild_seconds:.3f}s")
+
+    def abort_load(self) -> None:
+        """Cancel a rebuild that failed before finish_load()."""
+        with self._lock:
+            self._loading = False
+            self._pending = []
+
+    def invalidate(self) -> None:
+        """Drop the index so the next query rebuilds it."""
+        with self._lock:
+            self._loaded = False
+
+    def upsert(self, job_id: int, embedding: List[float]) -> None:
+        """Add or replace the embedding for a job."""
+        with self._lock:
+            if self._loading:
+                self._pending.append(("upsert", job_id, embedding))
+                return
+            if not self._loaded:
+                # Nothing to keep fresh yet, the first query loads from the database
+                return
+
+            vector = self._normalize(embedding) if embedding else None
+            if vector is None:
+                self.remove(job_id)
+                return
+
+            position = self._positions.get(job_id)
+            if position is None:
+                self._ensure_capacity(self._size + 1)
+                position = self._size
+                self._ids[position] = job_id
+                self._positions[job_id] = position
+                self._size += 1
+            self._matrix[position] = vector
+
+    def remove(self, job_id: int) -> None:
+        """Remove a job from the index by swapping the last row into its slot."""
+        with self._lock:
+            if self._loading:
+                self._pending.append(("remove", job_id, None))
+                return
+
+            position = self._positions.pop(job_id, None)
+            if position is None:
+                return
+
+            last = self._size - 1
+            if position != last:
+                moved_id = int(self._ids[last])
+                self._matrix[position] = self._matrix[last]
+                self._ids[position] = moved_id
+                self._positions[moved_id] = position
+            self._size = last
+
+    def search(self, query_embedding: List[float], threshold: float, limit: int) -> List[Tuple[int, float]]:
+        """Return up to `limit` (job_id, similarity) pairs above `threshold`, best first."""
+        query = self._normalize(query_embedding)
+        if query is None or limit <= 0:
+            return []
+
+        with self._lock:
+            if self._size == 0:
+                return []
+            scores = self._matrix[:self._size] @ query
+            ids = self._ids[:self._size].copy()
+
+        candidates = np.flatnonzero(scores >= threshold)
+        if candidates.size > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def get_stats(self) -> Dict:
+        """Get size, memory use and rebuild timing of the index."""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "size": self._size,
+                "dimension": self.dimension,
+                "capacity": int(self._matrix.shape[0]),
+                "memory_bytes": int(self._matrix.nbytes + self._ids.nbytes),
+                "last_rebuild_seconds": self._last_rebuild_seconds,
+                "last_rebuild_at": self._last_rebuild_at
+            }
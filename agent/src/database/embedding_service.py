@@ -8,6 +8,13 @@ import openai
 import numpy as np
 from typing import List, Optional
 from dotenv import load_dotenv
+from .embedding_cache import EmbeddingCache
+from .embedding_batcher import EmbeddingBatcher
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
 
 load_dotenv()
 
@@ -15,58 +22,145 @@ load_dotenv()
 class EmbeddingService:
     """Handles OpenAI embeddings and vector similarity calculations."""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[EmbeddingCache] = None):
         self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.model = "text-embedding-3-small"
         self.embedding_dimension = 1536  # Dimension for text-embedding-3-small
+        self.max_batch_size = 2048  # Max inputs per embeddings request
+        self._encoding = None
+        
+        cache_enabled = os.getenv('EMBEDDING_CACHE_ENABLED', 'true').lower() == 'true'
+        self.cache = cache if cache is not None else (EmbeddingCache() if cache_enabled else None)
+        
+        # Coalesce concurrent single-text requests into batched API calls
+        batching_enabled = os.getenv('EMBEDDING_BATCHING_ENABLED', 'true').lower() == 'true'
+        self.batcher = EmbeddingBatcher(self._request_embeddings, self.count_tokens) if batching_enabled else None
+        self.batch_timeout = float(os.getenv('EMBEDDING_BATCH_TIMEOUT', '60'))
     
     def get_embedding(self, text: str) -> Optional[List[float]]:
-        """Generate OpenAI embedding for given text."""
+        """Generate OpenAI embedding for given text, consulting the cache first."""
         if not text or not text.strip():
             print("⚠️ Empty text provided for embedding")
             return None
+        
+        if self.cache is not None:
+            cached = self.cache.get(self.model, text)
+            if cached is not None:
+                return cached
             
         try:
-            response = self.openai_client.embeddings.create(
-                model=self.model,
-                input=text.strip()
-            )
-            return response.data[0].embedding
+            if self.batcher is not None:
+                embedding = self.batcher.submit(text).result(timeout=self.batch_timeout)
+            else:
+                embedding = self._request_embeddings([text.strip()])[0]
+            if self.cache is not None:
+                self.cache.put(self.model, text, embedding)
+            return embedding
         except Exception as e:
             print(f"❌ Error getting embedding: {e}")
             return None
     
     def get_batch_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
-        """Generate embeddings for multiple texts in batch."""
+        """Generate embeddings for multiple texts in batch, only sending cache misses to the API."""
         if not texts:
             return []
         
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        
         # Filter out empty texts
-        valid_texts = [text.strip() for text in texts if text and text.strip()]
-        if not valid_texts:
-            return [None] * len(texts)
+        valid_indices = [index for index, text in enumerate(texts) if text and text.strip()]
+        if not valid_indices:
+            return embeddings
+        
+        if self.cache is not None:
+            cached = self.cache.get_many(self.model, [texts[index] for index in valid_indices])
+            for index, embedding in zip(valid_indices, cached):
+                embeddings[index] = embedding
+        
+        missing_indices = [index for index in valid_indices if embeddings[index] is None]
+        if not missing_indices:
+            return embeddings
         
         try:
-            response = self.openai_client.embeddings.create(
-                model=self.model,
-                input=valid_texts
+            response_embeddings = self._request_embeddings(
+                [texts[index].strip() for index in missing_indices]
             )
             
-            embeddings = []
-            valid_index = 0
+            for index, embedding in zip(missing_indices, response_embeddings):
+                embeddings[index] = embedding
             
-            for original_text in texts:
-                if original_text and original_text.strip():
-                    embeddings.append(response.data[valid_index].embedding)
-                    valid_index += 1
-                else:
-                    embeddings.append(None)
+            if self.cache is not None:
+                self.cache.put_many(
+                    self.model,
+                    [texts[index] for index in missing_indices],
+                    [embeddings[index] for index in missing_indices]
+                )
             
             return embeddings
             
         except Exception as e:
             print(f"❌ Error getting batch embeddings: {e}")
-            return [None] * len(texts)
+            # Cache hits are still good; only the texts that failed stay None
+            return embeddings
+    
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Send one embeddings request; results are returned in input order."""
+        response = self.openai_client.embeddings.create(
+            model=self.model,
+            input=texts
+        )
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+    
+    def get_batching_stats(self) -> dict:
+        """Get micro-batcher coalescing metrics."""
+        if self.batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.batcher.get_stats()}
+    
+    def get_cache_stats(self) -> dict:
+        """Get embedding cache hit-rate metrics."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.get_stats()}
+    
+    def count_tokens(self, text: str) -> int:
+        """Count tokens for the embedding model (estimated when tiktoken is unavailable)."""
+        if not text:
+            return 0
+        
+        if tiktoken is not None:
+            if self._encoding is None:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            return len(self._encoding.encode(text))
+        
+        # Roughly 4 characters per token for English text
+        return len(text) // 4 + 1
+    
+    def create_token_batches(self, texts: List[str], max_batch_tokens: int = 100000, 
+                             max_batch_size: Optional[int] = None) -> List[List[int]]:
+        """Group text indices into batches bounded by total tokens and number of inputs."""
+        max_batch_size = min(max_batch_size or self.max_batch_size, self.max_batch_size)
+        
+        batches = []
+        current_batch = []
+        current_tokens = 0
+        for index, text in enumerate(texts):
+            tokens = self.count_tokens(text)
+            if current_batch and (current_tokens + tokens > max_batch_tokens or 
+                                  len(current_batch) >= max_batch_size):
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+            current_batch.append(index)
+            current_tokens += tokens
+        
+        if current_batch:
+            batches.append(current_batch)
+        
+        return batches
     
     def calculate_cosine_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculate cosine similarity between two embeddings."""
@@ -0,0 +1,439 @@
+"""
+Generation queue module.
+Durable Postgres-backed queue of generation jobs shared by any number of worker processes.
+"""
+
+import os
+import uuid
+from typing import Any, Dict, Optional
+from psycopg2.extras import Json
+from .connection import DatabaseConnection
+
+
+class GenerationQueue:
+    """
+    Queue of generation jobs stored in the generation_jobs table.
+
+    Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so several processes
+    on several hosts can poll the same table without handing out a job twice. A
+    claimed job is leased until locked_until; a worker that dies stops renewing the
+    lease and the job becomes claimable again once it expires. Failed attempts are
+    retried with exponential backoff until max_attempts is reached.
+
+    At most one queued or running job exists per dedup key (a hash of the kind and
+    normalized payload); submitting a duplicate returns the existing job's id.
+    """
+
+    def __init__(self, db_connection: DatabaseConnection):
+        self.db_connection = db_connection
+        self.visibility_timeout = int(os.getenv('GENERATION_QUEUE_VISIBILITY_TIMEOUT', '600'))
+        self.max_attempts = int(os.getenv('GENERATION_QUEUE_MAX_ATTEMPTS', '3'))
+        self.retry_backoff = int(os.getenv('GENERATION_QUEUE_RETRY_BACKOFF', '30'))
+        self._table_ready = False
+
+    def ensure_table(self) -> bool:
+        """Create the generation_jobs table if it does not exist yet."""
+        if self._table_ready:
+            return True
+
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS generation_jobs (
+                        id VARCHAR(32) PRIMARY KEY,
+                        kind VARCHAR(50) NOT NULL,
+                        payload JSONB NOT NULL,
+                        dedup_key VARCHAR(64) NULL,
+                        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        max_attempts INTEGER NOT NULL DEFAULT 3,
+                        available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                        locked_by VARCHAR(255) NULL,
+                        locked_until TIMESTAMP NULL,
+                        cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+                        completed_nodes JSONB NOT NULL DEFAULT '[]'::jsonb,
+                        result JSONB NULL,
+                        error TEXT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        started_at TIMESTAMP NULL,
+                        finished_at TIMESTAMP NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_generation_jobs_claimable
+                    ON generation_jobs (status, available_at);
+                """)
+                cursor.execute("""
+                    ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS dedup_key VARCHAR(64) NULL;
+                """)
+                cursor.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_generation_jobs_active_dedup
+                    ON generation_jobs (dedup_key)
+                    WHERE status IN ('queued', 'running');
+                """)
+                conn.commit()
+                cursor.close()
+                self._table_ready = True
+                return True
+
+            except Exception as e:
+                print(f"❌ Error creating generation_jobs table: {e}")
+                conn.rollback()
+                return False
+
+    def submit(self, kind: str, payload: Dict[str, Any], generation_id: Optional[str] = None) -> str:
+        """
+        Enqueue a generation and return its id (or the id of an identical active one).
+
+        Passing the id of a finished job queues that job again with fresh attempts;
+        its worker resumes from the checkpoint a failed attempt left behind.
+        """
+        if not self.ensure_table():
+            raise RuntimeError("Generation queue is unavailable")
+
+        # Imported here: the workflows package imports this one
+        from ..workflows.single_flight import generation_key
+
+        requested_id = generation_id
+        generation_id = generation_id or uuid.uuid4().hex
+        dedup_key = generation_key(kind, payload)
+        with self.db_connection.connection() as conn:
+            if not conn:
+                raise RuntimeError("Generation queue is unavailable")
+
+            try:
+                cursor = conn.cursor()
+                if requested_id:
+                    existing_id = self._requeue(cursor, requested_id, kind, payload, dedup_key)
+                    if existing_id is not None:
+                        conn.commit()
+                        cursor.close()
+                        if existing_id == requested_id:
+                            print(f"🔁 Queued {kind} generation {requested_id} again")
+                        else:
+                            print(f"🔗 Identical {kind} generation already queued as {existing_id}")
+                        return existing_id
+
+                # The partial unique index turns a concurrent duplicate into a no-op
+                cursor.execute("""
+                    INSERT INTO generation_jobs (id, kind, payload, dedup_key, max_attempts)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (dedup_key) WHERE status IN ('queued', 'running') DO NOTHING
+                    RETURNING id;
+                """, (generation_id, kind, Json(payload), dedup_key, self.max_attempts))
+
+                existing_id = None
+                if cursor.fetchone() is None:
+                    cursor.execute("""
+                        SELECT id FROM generation_jobs
+                        WHERE dedup_key = %s AND status IN ('queued', 'running');
+                    """, (dedup_key,))
+                    row = cursor.fetchone()
+                    if row is None:
+                        # The duplicate finished in between; queue this one normally
+                        cursor.execute("""
+                            INSERT INTO generation_jobs (id, kind, payload, dedup_key, max_attempts)
+                            VALUES (%s, %s, %s, %s, %s);
+                        """, (generation_id, kind, Json(payload), dedup_key, self.max_attempts))
+                    else:
+                        existing_id = row['id']
+
+                conn.commit()
+                cursor.close()
+
+            except Exception as e:
+                print(f"❌ Error enqueueing generation: {e}")
+                conn.rollback()
+                raise
+
+        if existing_id is not None:
+            print(f"🔗 Identical {kind} generation already queued as {existing_id}")
+            return existing_id
+
+        print(f"📥 Queued {kind} generation {generation_id}")
+        return generation_id
+
+    def _requeue(self, cursor, generation_id: str, kind: str, payload: Dict[str, Any],
+                 dedup_key: str) -> Optional[str]:
+        """
+        Put a finished job back in the queue under its own id.
+
+        Returns the id the caller should use: this one when requeued or still
+        active, an identical active job's id, or None when no such job exists yet.
+        """
+        cursor.execute("""
+            UPDATE generation_jobs
+            SET kind = %s, payload = %s, dedup_key = %s, status = 'queued',
+                attempts = 0, max_attempts = %s, available_at = CURRENT_TIMESTAMP,
+                locked_by = NULL, locked_until = NULL, cancel_requested = FALSE,
+                completed_nodes = '[]'::jsonb, result = NULL, error = NULL,
+                started_at = NULL, finished_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status NOT IN ('queued', 'running')
+              AND NOT EXISTS (
+                  SELECT 1 FROM generation_jobs
+                  WHERE dedup_key = %s AND status IN ('queued', 'running')
+              )
+            RETURNING id;
+        """, (kind, Json(payload), dedup_key, self.max_attempts, generation_id, dedup_key))
+        if cursor.fetchone() is not None:
+            return generation_id
+
+        cursor.execute("""
+            SELECT id FROM generation_jobs
+            WHERE (id = %s OR dedup_key = %s) AND status IN ('queued', 'running')
+            ORDER BY id = %s DESC
+            LIMIT 1;
+        """, (generation_id, dedup_key, generation_id))
+        row = cursor.fetchone()
+        return row['id'] if row else None
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next available job to this worker.
+
+        Picks queued jobs whose backoff has elapsed and running jobs whose lease
+        expired. Returns the job (id, kind, payload, attempts) or None.
+        """
+        if not self.ensure_table():
+            return None
+
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+
+                # Jobs whose worker vanished on the last allowed attempt (or after a
+                # cancellation request) won't be retried
+                cursor.execute("""
+                    UPDATE generation_jobs
+                    SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'failed' END,
+                        error = CASE WHEN cancel_requested THEN error
+                                     ELSE COALESCE(error, 'Worker lease expired') END,
+                        locked_by = NULL, locked_until = NULL,
+                        finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE status = 'running' AND locked_until < CURRENT_TIMESTAMP
+                      AND (attempts >= max_attempts OR cancel_requested);
+                """)
+
+                cursor.execute("""
+                    UPDATE generation_jobs
+                    SET status = 'running', attempts = attempts + 1,
+                        completed_nodes = '[]'::jsonb, locked_by = %s,
+                        locked_until = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                        started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = (
+                        SELECT id FROM generation_jobs
+                        WHERE NOT cancel_requested AND (
+                            (status = 'queued' AND available_at <= CURRENT_TIMESTAMP) OR
+                            (status = 'running' AND locked_until < CURRENT_TIMESTAMP)
+                        )
+                        ORDER BY available_at, created_at
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, kind, payload, attempts, max_attempts;
+                """, (worker_id, self.visibility_timeout))
+
+                job = cursor.fetchone()
+                conn.commit()
+                cursor.close()
+                return dict(job) if job else None
+
+            except Exception as e:
+                print(f"❌ Error claiming generation job: {e}")
+                conn.rollback()
+                return None
+
+    def heartbeat(self, generation_id: str, worker_id: str,
+                  completed_node: Optional[str] = None) -> Optional[bool]:
+        """
+        Extend this worker's lease and optionally record a finished node.
+
+        Returns whether cancellation was requested, or None if the lease was lost
+        (the job was reclaimed by another worker).
+        """
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE generation_jobs
+                    SET locked_until = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                        completed_nodes = CASE WHEN %s::text IS NULL THEN completed_nodes
+                                               ELSE completed_nodes || to_jsonb(%s::text) END,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND locked_by = %s AND status = 'running'
+                    RETURNING cancel_requested;
+                """, (self.visibility_timeout, completed_node, completed_node, generation_id, worker_id))
+
+                row = cursor.fetchone()
+                conn.commit()
+                cursor.close()
+                return row['cancel_requested'] if row else None
+
+            except Exception as e:
+                print(f"⚠️ Error renewing generation lease: {e}")
+                conn.rollback()
+                return False
+
+    def complete(self, generation_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a job succeeded and store its result."""
+        return self._finish(generation_id, worker_id, "succeeded", result=result)
+
+    def mark_cancelled(self, generation_id: str, worker_id: str) -> bool:
+        """Mark a running job cancelled after the worker stopped it."""
+        return self._finish(generation_id, worker_id, "cancelled")
+
+    def fail(self, generation_id: str, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; requeue with exponential backoff unless attempts are used up."""
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE generation_jobs
+                    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                        available_at = CURRENT_TIMESTAMP
+                            + make_interval(secs => %s * power(2, GREATEST(attempts - 1, 0))),
+                        finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE CURRENT_TIMESTAMP END,
+                        error = %s, locked_by = NULL, locked_until = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND locked_by = %s
+                    RETURNING status, attempts;
+                """, (self.retry_backoff, error, generation_id, worker_id))
+
+                row = cursor.fetchone()
+                conn.commit()
+                cursor.close()
+
+                if row and row['status'] == 'queued':
+                    print(f"🔁 Generation {generation_id} failed attempt {row['attempts']}, will retry")
+                elif row:
+                    print(f"❌ Generation {generation_id} failed after {row['attempts']} attempts")
+                return row is not None
+
+            except Exception as e:
+                print(f"❌ Error recording generation failure: {e}")
+                conn.rollback()
+                return False
+
+    def cancel(self, generation_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs are cancelled immediately; running jobs are flagged
+        and stopped by their worker at the next workflow step.
+        """
+        if not self.ensure_table():
+            return False
+
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE generation_jobs
+                    SET cancel_requested = TRUE,
+                        status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                        finished_at = CASE WHEN status = 'queued' THEN CURRENT_TIMESTAMP ELSE finished_at END,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND status IN ('queued', 'running');
+                """, (generation_id,))
+
+                cancelled = cursor.rowcount > 0
+                conn.commit()
+                cursor.close()
+                return cancelled
+
+            except Exception as e:
+                print(f"❌ Error cancelling generation: {e}")
+                conn.rollback()
+                return False
+
+    def get(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's status, progress and result."""
+        if not self.ensure_table():
+            return None
+
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, kind, status, attempts, max_attempts, completed_nodes, result, error,
+                           EXTRACT(EPOCH FROM created_at)::float8 AS created_at,
+                           EXTRACT(EPOCH FROM started_at)::float8 AS started_at,
+                           EXTRACT(EPOCH FROM finished_at)::float8 AS finished_at
+                    FROM generation_jobs
+                    WHERE id = %s;
+                """, (generation_id,))
+
+                job = cursor.fetchone()
+                cursor.close()
+                return dict(job) if job else None
+
+            except Exception as e:
+                print(f"❌ Error fetching generation: {e}")
+                return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status."""
+        stats = {"backend": "postgres", "visibility_timeout": self.visibility_timeout}
+        if not self.ensure_table():
+            return stats
+
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return stats
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT status, COUNT(*) AS count FROM generation_jobs GROUP BY status;
+                """)
+                stats.update({row['status']: row['count'] for row in cursor.fetchall()})
+                cursor.close()
+
+            except Exception as e:
+                print(f"❌ Error fetching generation queue stats: {e}")
+
+        return stats
+
+    def _finish(self, generation_id: str, worker_id: str, status: str,
+                result: Optional[Dict[str, Any]] = None) -> bool:
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE generation_jobs
+                    SET status = %s, result = %s, error = NULL,
+                        locked_by = NULL, locked_until = NULL,
+                        finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND locked_by = %s;
+                """, (status, Json(result) if result is not None else None, generation_id, worker_id))
+
+                finished = cursor.rowcount > 0
+                conn.commit()
+                cursor.close()
+                return finished
+
+            except Exception as e:
+                print(f"❌ Error finishing generation: {e}")
+                conn.rollback()
+                return False
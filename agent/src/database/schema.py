@@ -15,44 +15,49 @@ class SchemaManager:
     
     def initialize_schema(self) -> bool:
         """Initialize the complete database schema."""
-        conn = self.db_connection.get_connection()
-        if not conn:
-            return False
-        
-        try:
-            cursor = conn.cursor()
-            
-            # Create job_applications table with embedding column
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS job_applications (
-                    id SERIAL PRIMARY KEY,
-                    company_name VARCHAR(255) NOT NULL,
-                    position_title VARCHAR(255) NOT NULL,
-                    job_description TEXT NOT NULL,
-                    embedding_text TEXT NOT NULL,
-                    embedding FLOAT8[] NULL,
-                    resume_generated BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    CONSTRAINT unique_company_position UNIQUE (company_name, position_title)
-                );
-            """)
-            
-            # Create indexes for performance
-            self._create_indexes(cursor)
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
             
-            conn.commit()
-            cursor.close()
-            conn.close()
-            print("✅ Database schema initialized successfully!")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error initializing schema: {e}")
-            conn.rollback()
-            conn.close()
-            return False
-    
+            try:
+                cursor = conn.cursor()
+                
+                # Create job_applications table with embedding column
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS job_applications (
+                        id SERIAL PRIMARY KEY,
+                        company_name VARCHAR(255) NOT NULL,
+                        position_title VARCHAR(255) NOT NULL,
+                        job_description TEXT NOT NULL,
+                        embedding_text TEXT NOT NULL,
+                        embedding FLOAT8[] NULL,
+                        resume_generated BOOLEAN DEFAULT FALSE,
+                        resume_sections JSONB NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        CONSTRAINT unique_company_position UNIQUE (company_name, position_title)
+                    );
+                """)
+                
+                # Tables created before resume sections were stored
+                cursor.execute("""
+                    ALTER TABLE job_applications
+                    ADD COLUMN IF NOT EXISTS resume_sections JSONB NULL;
+                """)
+                
+                # Create indexes for performance
+                self._create_indexes(cursor)
+                
+                conn.commit()
+                cursor.close()
+                print("✅ Database schema initialized successfully!")
+                return True
+                
+            except Exception as e:
+                print(f"❌ Error initializing schema: {e}")
+                conn.rollback()
+                return False
+        
     def _create_indexes(self, cursor) -> None:
         """Create database indexes for performance optimization."""
         indexes = [
@@ -66,114 +71,205 @@ class SchemaManager:
                 CREATE INDEX IF NOT EXISTS {index_name} ON {index_definition};
             """)
     
-    def add_unique_constraint(self) -> bool:
-        """Add unique constraint for company_name and position_title if it doesn't exist."""
-        conn = self.db_connection.get_connection()
-        if not conn:
+    def enable_pgvector(self, dimension: int = 1536, index_type: str = "hnsw") -> bool:
+        """
+        Add a pgvector storage path next to the FLOAT8[] embedding column.
+
+        Creates the vector extension, an embedding_vector column populated from the
+        existing embeddings, a trigger keeping it in sync on insert/update, and an
+        approximate nearest-neighbour index for cosine distance.
+        """
+        if index_type not in ("hnsw", "ivfflat"):
+            print(f"❌ Unsupported pgvector index type: {index_type}")
             return False
         
-        try:
-            cursor = conn.cursor()
-            
-            # Check if the constraint already exists
-            cursor.execute("""
-                SELECT constraint_name 
-                FROM information_schema.table_constraints 
-                WHERE table_name = 'job_applications' 
-                AND constraint_type = 'UNIQUE' 
-                AND constraint_name = 'unique_company_position';
-            """)
-            
-            existing_constraint = cursor.fetchone()
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
             
-            if not existing_constraint:
-                print("🔧 Adding unique constraint for company_name and position_title...")
+            try:
+                cursor = conn.cursor()
                 
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+                cursor.execute(f"""
+                    ALTER TABLE job_applications
+                    ADD COLUMN IF NOT EXISTS embedding_vector vector({int(dimension)}) NULL;
+                """)
+                
+                # Migrate existing FLOAT8[] data
                 cursor.execute("""
-                    ALTER TABLE job_applications 
-                    ADD CONSTRAINT unique_company_position 
-                    UNIQUE (company_name, position_title);
+                    UPDATE job_applications
+                    SET embedding_vector = embedding::vector
+                    WHERE embedding IS NOT NULL AND embedding_vector IS NULL;
                 """)
+                migrated_rows = cursor.rowcount
+                
+                # Keep embedding_vector in sync with every write to the FLOAT8[] column
+                cursor.execute("""
+                    CREATE OR REPLACE FUNCTION sync_job_embedding_vector() RETURNS trigger AS $$
+                    BEGIN
+                        IF NEW.embedding IS NULL THEN
+                            NEW.embedding_vector := NULL;
+                        ELSE
+                            NEW.embedding_vector := NEW.embedding::vector;
+                        END IF;
+                        RETURN NEW;
+                    END;
+                    $$ LANGUAGE plpgsql;
+                """)
+                cursor.execute("DROP TRIGGER IF EXISTS trg_sync_job_embedding_vector ON job_applications;")
+                cursor.execute("""
+                    CREATE TRIGGER trg_sync_job_embedding_vector
+                    BEFORE INSERT OR UPDATE OF embedding ON job_applications
+                    FOR EACH ROW EXECUTE FUNCTION sync_job_embedding_vector();
+                """)
+                
+                if index_type == "hnsw":
+                    cursor.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_embedding_vector_hnsw
+                        ON job_applications USING hnsw (embedding_vector vector_cosine_ops);
+                    """)
+                else:
+                    cursor.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_embedding_vector_ivfflat
+                        ON job_applications USING ivfflat (embedding_vector vector_cosine_ops)
+                        WITH (lists = 100);
+                    """)
                 
                 conn.commit()
-                print("✅ Unique constraint added successfully!")
-            else:
-                print("✅ Unique constraint already exists")
-            
-            cursor.close()
-            conn.close()
-            return True
+                cursor.close()
+                print(f"✅ pgvector enabled ({index_type} index, {migrated_rows} embeddings migrated)")
+                return True
+                
+            except Exception as e:
+                print(f"❌ Error enabling pgvector: {e}")
+                conn.rollback()
+                return False
+    
+    def check_column_exists(self, table_name: str, column_name: str) -> Optional[bool]:
+        """Check if a column exists on a table; None when the database couldn't be asked."""
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
             
-        except Exception as e:
-            print(f"❌ Error adding unique constraint: {e}")
-            conn.rollback()
-            conn.close()
-            return False
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.columns
+                        WHERE table_name = %s AND column_name = %s
+                    );
+                """, (table_name, column_name))
+                
+                exists = cursor.fetchone()['exists']
+                cursor.close()
+                return exists
+                
+            except Exception as e:
+                print(f"❌ Error checking column existence: {e}")
+                conn.rollback()
+                return None
     
+    def add_unique_constraint(self) -> bool:
+        """Add unique constraint for company_name and position_title if it doesn't exist."""
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
+            
+            try:
+                cursor = conn.cursor()
+                
+                # Check if the constraint already exists
+                cursor.execute("""
+                    SELECT constraint_name 
+                    FROM information_schema.table_constraints 
+                    WHERE table_name = 'job_applications' 
+                    AND constraint_type = 'UNIQUE' 
+                    AND constraint_name = 'unique_company_position';
+                """)
+                
+                existing_constraint = cursor.fetchone()
+                
+                if not existing_constraint:
+                    print("🔧 Adding unique constraint for company_name and position_title...")
+                    
+                    cursor.execute("""
+                        ALTER TABLE job_applications 
+                        ADD CONSTRAINT unique_company_position 
+                        UNIQUE (company_name, position_title);
+                    """)
+                    
+                    conn.commit()
+                    print("✅ Unique constraint added successfully!")
+                else:
+                    print("✅ Unique constraint already exists")
+                
+                cursor.close()
+                return True
+                
+            except Exception as e:
+                print(f"❌ Error adding unique constraint: {e}")
+                conn.rollback()
+                return False
+        
     def check_table_exists(self, table_name: str) -> bool:
         """Check if a table exists in the database."""
-        conn = self.db_connection.get_connection()
-        if not conn:
-            return False
-        
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = %s
-                );
-            """, (table_name,))
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return False
             
-            exists = cursor.fetchone()['exists']
-            cursor.close()
-            conn.close()
-            return exists
-            
-        except Exception as e:
-            print(f"❌ Error checking table existence: {e}")
-            if conn:
-                conn.close()
-            return False
-    
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_name = %s
+                    );
+                """, (table_name,))
+                
+                exists = cursor.fetchone()['exists']
+                cursor.close()
+                return exists
+                
+            except Exception as e:
+                print(f"❌ Error checking table existence: {e}")
+                return False
+        
     def get_table_info(self, table_name: str) -> Optional[dict]:
         """Get detailed information about a table structure."""
-        conn = self.db_connection.get_connection()
-        if not conn:
-            return None
-        
-        try:
-            cursor = conn.cursor()
-            
-            # Get column information
-            cursor.execute("""
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM information_schema.columns
-                WHERE table_name = %s
-                ORDER BY ordinal_position;
-            """, (table_name,))
-            
-            columns = cursor.fetchall()
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
             
-            # Get constraints
-            cursor.execute("""
-                SELECT constraint_name, constraint_type
-                FROM information_schema.table_constraints
-                WHERE table_name = %s;
-            """, (table_name,))
-            
-            constraints = cursor.fetchall()
-            
-            cursor.close()
-            conn.close()
-            
-            return {
-                "columns": [dict(col) for col in columns],
-                "constraints": [dict(const) for const in constraints]
-            }
-            
-        except Exception as e:
-            print(f"❌ Error getting table info: {e}")
-            if conn:
-                conn.close()
-            return None
\ No newline at end of file
+            try:
+                cursor = conn.cursor()
+                
+                # Get column information
+                cursor.execute("""
+                    SELECT column_name, data_type, is_nullable, column_default
+                    FROM information_schema.columns
+                    WHERE table_name = %s
+                    ORDER BY ordinal_position;
+                """, (table_name,))
+                
+                columns = cursor.fetchall()
+                
+                # Get constraints
+                cursor.execute("""
+                    SELECT constraint_name, constraint_type
+                    FROM information_schema.table_constraints
+                    WHERE table_name = %s;
+                """, (table_name,))
+                
+                constraints = cursor.fetchall()
+                
+                cursor.close()
+                
+                return {
+                    "columns": [dict(col) for col in columns],
+                    "constraints": [dict(const) for const in constraints]
+                }
+                
+            except Exception as e:
+                print(f"❌ Error getting table info: {e}")
+                return None
\ No newline at end of file
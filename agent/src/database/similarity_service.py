@@ -3,73 +3,155 @@ Similarity service module.
 Handles job similarity search and matching operations.
 """
 
-from typing import List, Dict, Optional
+import os
+import numpy as np
+from typing import Iterator, List, Dict, Optional, Tuple
 from urllib.parse import quote
 from .connection import DatabaseConnection
+from .schema import SchemaManager
 from .embedding_service import EmbeddingService
+from .embedding_index import EmbeddingIndex
+from .backfill_service import BackfillService
+
+
+# Upper bound on the size of each E[rows] @ E.T block computed at once
+DEFAULT_MAX_BLOCK_BYTES = 64 * 1024 * 1024
 
 
 class SimilarityService:
     """Handles job similarity search using vector embeddings and fallback methods."""
     
-    def __init__(self, db_connection: DatabaseConnection, embedding_service: EmbeddingService):
+    def __init__(self, db_connection: DatabaseConnection, embedding_service: EmbeddingService,
+                 embedding_index: Optional[EmbeddingIndex] = None,
+                 schema_manager: Optional[SchemaManager] = None):
         self.db_connection = db_connection
+        self.schema_manager = schema_manager or SchemaManager(db_connection)
         self.embedding_service = embedding_service
+        self.embedding_index = embedding_index or EmbeddingIndex(embedding_service.embedding_dimension)
+        self.backfill_service = BackfillService(db_connection, embedding_service, self.embedding_index)
+        # auto: pgvector when the column exists, otherwise the in-memory index
+        self.backend = os.getenv('SIMILARITY_BACKEND', 'auto').lower()
+        self._pgvector_enabled: Optional[bool] = None
+    
+    def is_pgvector_enabled(self) -> bool:
+        """Check (once) whether the pgvector embedding_vector column is available."""
+        if self._pgvector_enabled is None:
+            exists = self.schema_manager.check_column_exists('job_applications', 'embedding_vector')
+            if exists is None:
+                # Transient failure: don't remember it, the next query asks again
+                return False
+            self._pgvector_enabled = exists
+        
+        return self._pgvector_enabled
+    
+    def reset_pgvector_state(self) -> None:
+        """Forget the cached pgvector availability (e.g. after running the migration)."""
+        self._pgvector_enabled = None
     
     def find_similar_jobs(self, company_name: str, position_title: str, job_description: str, 
                          threshold: float = 0.75, limit: int = 10) -> List[Dict]:
         """Find similar job applications using vector embeddings (only jobs with resumes)."""
-        conn = self.db_connection.get_connection()
-        if not conn:
-            return []
+        # Generate embedding for the query job before borrowing a connection,
+        # so the pool is not held for the duration of the OpenAI round trip
+        query_text = self.embedding_service.create_job_embedding_text(
+            company_name, position_title, job_description
+        )
+        query_embedding = self.embedding_service.get_embedding(query_text)
         
-        try:
-            # Generate embedding for the query job
-            query_text = self.embedding_service.create_job_embedding_text(
-                company_name, position_title, job_description
-            )
-            query_embedding = self.embedding_service.get_embedding(query_text)
-            
-            if not query_embedding:
-                print("❌ Failed to generate embedding for query")
-                return self._fallback_similarity_search(company_name, position_title, job_description, limit)
-            
-            cursor = conn.cursor()
-            
-            # Get only jobs with embeddings AND resume_generated = true
-            cursor.execute("""
-                SELECT id, company_name, position_title, job_description, 
-                       embedding, resume_generated, created_at
-                FROM job_applications
-                WHERE embedding IS NOT NULL AND resume_generated = TRUE
-                ORDER BY created_at DESC;
-            """)
-            
-            existing_jobs = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            if not existing_jobs:
-                print("📝 No jobs with generated resumes found for comparison")
-                return []
-            
-            # Calculate similarities and filter
-            similar_jobs = self._calculate_job_similarities(
-                query_embedding, existing_jobs, threshold
-            )
-            
-            # Sort by similarity score (highest first) and limit results
-            similar_jobs.sort(key=lambda x: x['similarity_score'], reverse=True)
-            result = similar_jobs[:limit]
-            
-            print(f"🔍 Found {len(result)} similar jobs with resumes above {threshold} threshold")
-            return result
-            
-        except Exception as e:
-            print(f"❌ Error finding similar jobs: {e}")
-            if conn:
-                conn.close()
+        if not query_embedding:
+            print("❌ Failed to generate embedding for query")
+            return self._fallback_similarity_search(company_name, position_title, job_description, limit)
+        
+        result = self._vector_search(query_embedding, threshold, limit)
+        if result is None:
             return self._fallback_similarity_search(company_name, position_title, job_description, limit)
+        
+        print(f"🔍 Found {len(result)} similar jobs with resumes above {threshold} threshold")
+        return result
+    
+    def find_reusable_resume(self, company_name: str, position_title: str, job_description: str,
+                             threshold: float = 0.97, limit: int = 5,
+                             exclude_job_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Find the most similar past job whose generated resume sections were stored.
+        
+        Only embedding matches count: the text-matching fallback is never precise
+        enough to reuse content from. The job being generated (exclude_job_id) and
+        earlier applications to the same company and position are skipped, since
+        regenerating a posting should produce fresh sections. Returns None when
+        nothing qualifies.
+        """
+        query_text = self.embedding_service.create_job_embedding_text(
+            company_name, position_title, job_description
+        )
+        query_embedding = self.embedding_service.get_embedding(query_text)
+        if not query_embedding:
+            return None
+        
+        matches = self._vector_search(query_embedding, threshold, limit)
+        if not matches:
+            return None
+        
+        same_posting = (company_name.strip().casefold(), position_title.strip().casefold())
+        matches = [
+            job for job in matches
+            if job['id'] != exclude_job_id
+            and (job['company_name'].strip().casefold(), job['position_title'].strip().casefold()) != same_posting
+        ]
+        if not matches:
+            return None
+        
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, resume_sections
+                    FROM job_applications
+                    WHERE id = ANY(%s) AND resume_sections IS NOT NULL;
+                """, ([job['id'] for job in matches],))
+                
+                sections = {row['id']: row['resume_sections'] for row in cursor.fetchall()}
+                cursor.close()
+                
+            except Exception as e:
+                print(f"❌ Error fetching stored resume sections: {e}")
+                conn.rollback()
+                return None
+        
+        # Matches are sorted best first
+        for job in matches:
+            if job['id'] in sections:
+                return {
+                    'job_id': job['id'],
+                    'company_name': job['company_name'],
+                    'position_title': job['position_title'],
+                    'similarity_score': job['similarity_score'],
+                    'sections': sections[job['id']]
+                }
+        
+        return None
+    
+    def _vector_search(self, query_embedding: List[float], threshold: float, limit: int) -> Optional[List[Dict]]:
+        """Nearest jobs with resumes above the threshold, or None if no vector backend is usable."""
+        # Let Postgres do the nearest-neighbour search when pgvector is available
+        if self.backend != 'memory' and self.is_pgvector_enabled():
+            result = self._find_similar_jobs_pgvector(query_embedding, threshold, limit)
+            if result is not None:
+                return result
+        
+        # Otherwise search the in-process embedding matrix
+        if not self._ensure_index_loaded():
+            return None
+        
+        if len(self.embedding_index) == 0:
+            print("📝 No jobs with generated resumes found for comparison")
+            return []
+        
+        matches = self.embedding_index.search(query_embedding, threshold, limit)
+        return self._fetch_similar_job_rows(matches)
     
     def find_similar_jobs_basic(self, company_name: str, position_title: str, 
                                job_description: str, limit: int = 10) -> List[Dict]:
@@ -78,216 +160,327 @@ class SimilarityService:
     
     def get_job_similarity_matrix(self, job_ids: List[int]) -> Dict[int, Dict[int, float]]:
         """Calculate similarity matrix between multiple jobs."""
-        conn = self.db_connection.get_connection()
-        if not conn:
+        result = self.get_job_similarity_array(job_ids)
+        if result is None:
             return {}
         
-        try:
-            cursor = conn.cursor()
-            
-            # Get embeddings for specified jobs
-            placeholders = ','.join(['%s'] * len(job_ids))
-            cursor.execute(f"""
-                SELECT id, embedding
-                FROM job_applications
-                WHERE id IN ({placeholders}) AND embedding IS NOT NULL;
-            """, job_ids)
-            
-            jobs = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            if len(jobs) < 2:
-                print("⚠️ Need at least 2 jobs with embeddings for similarity matrix")
-                return {}
+        ids, matrix = result
+        id_list = ids.tolist()
+        return {
+            job_id: dict(zip(id_list, row.tolist()))
+            for job_id, row in zip(id_list, matrix)
+        }
+    
+    def get_job_similarity_array(self, job_ids: List[int], 
+                                 max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Calculate the dense float32 similarity matrix between multiple jobs.
+        
+        Returns (ids, matrix) where row/column i of the matrix belongs to ids[i]
+        (jobs without embeddings are dropped), or None if fewer than 2 jobs qualify.
+        """
+        loaded = self._load_normalized_embeddings(job_ids)
+        if loaded is None:
+            return None
+        
+        ids, embeddings = loaded
+        matrix = np.empty((len(ids), len(ids)), dtype=np.float32)
+        for start, block in self._iter_similarity_blocks(embeddings, max_block_bytes):
+            matrix[start:start + block.shape[0]] = block
+        
+        return ids, matrix
+    
+    def get_job_similarity_topk(self, job_ids: List[int], k: int = 10, 
+                                max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES) -> Optional[Dict[int, List[Tuple[int, float]]]]:
+        """
+        Calculate the k most similar jobs for each job without materializing the full matrix.
+        
+        Returns {job_id: [(neighbour_id, similarity), ...]} sorted best first, excluding the job itself.
+        """
+        loaded = self._load_normalized_embeddings(job_ids)
+        if loaded is None:
+            return None
+        
+        ids, embeddings = loaded
+        k = min(k, len(ids) - 1)
+        if k <= 0:
+            return {int(job_id): [] for job_id in ids}
+        
+        neighbours = {}
+        for start, block in self._iter_similarity_blocks(embeddings, max_block_bytes):
+            rows = np.arange(block.shape[0])
+            # Exclude self-similarity from the neighbour lists
+            block[rows, start + rows] = -np.inf
             
-            # Calculate similarity matrix
-            similarity_matrix = {}
-            for i, job1 in enumerate(jobs):
-                similarity_matrix[job1['id']] = {}
-                for j, job2 in enumerate(jobs):
-                    if i == j:
-                        similarity_matrix[job1['id']][job2['id']] = 1.0
-                    else:
-                        similarity = self.embedding_service.calculate_cosine_similarity(
-                            job1['embedding'], job2['embedding']
-                        )
-                        similarity_matrix[job1['id']][job2['id']] = similarity
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
             
-            return similarity_matrix
+            for row in rows:
+                neighbours[int(ids[start + row])] = [
+                    (int(ids[column]), round(float(score), 4))
+                    for column, score in zip(top[row], top_scores[row])
+                ]
+        
+        return neighbours
+    
+    def _load_normalized_embeddings(self, job_ids: List[int]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Fetch embeddings for the given jobs as an (ids, unit-norm float32 matrix) pair."""
+        if not job_ids:
+            return None
+        
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
             
-        except Exception as e:
-            print(f"❌ Error calculating similarity matrix: {e}")
-            if conn:
-                conn.close()
-            return {}
+            try:
+                cursor = conn.cursor()
+                
+                # Get embeddings for specified jobs
+                cursor.execute("""
+                    SELECT id, embedding
+                    FROM job_applications
+                    WHERE id = ANY(%s) AND embedding IS NOT NULL
+                    ORDER BY id;
+                """, (list(job_ids),))
+                
+                jobs = cursor.fetchall()
+                cursor.close()
+                
+            except Exception as e:
+                print(f"❌ Error calculating similarity matrix: {e}")
+                return None
+        
+        if len(jobs) < 2:
+            print("⚠️ Need at least 2 jobs with embeddings for similarity matrix")
+            return None
+        
+        ids = np.fromiter((job['id'] for job in jobs), dtype=np.int64, count=len(jobs))
+        embeddings = np.asarray([job['embedding'] for job in jobs], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        # Zero vectors stay zero so they score 0.0 against everything
+        norms[norms == 0] = 1.0
+        embeddings /= norms
+        
+        return ids, embeddings
+    
+    @staticmethod
+    def _iter_similarity_blocks(embeddings: np.ndarray, max_block_bytes: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (row_offset, E[rows] @ E.T) blocks, each no larger than max_block_bytes."""
+        count = embeddings.shape[0]
+        rows_per_block = max(1, max_block_bytes // (count * np.dtype(np.float32).itemsize))
+        
+        for start in range(0, count, rows_per_block):
+            block = embeddings[start:start + rows_per_block] @ embeddings.T
+            rows = np.arange(block.shape[0])
+            block[rows, start + rows] = 1.0
+            yield start, block
     
     def backfill_embeddings(self) -> bool:
         """Generate embeddings for existing job applications that don't have them."""
-        conn = self.db_connection.get_connection()
-        if not conn:
-            return False
-        
-        try:
-            cursor = conn.cursor()
-            
-            # Get jobs without embeddings
-            cursor.execute("""
-                SELECT id, company_name, position_title, job_description
-                FROM job_applications
-                WHERE embedding IS NULL OR embedding_text IS NULL;
-            """)
-            
-            jobs_without_embeddings = cursor.fetchall()
+        return self.backfill_service.run()
+    
+    def _find_similar_jobs_pgvector(self, query_embedding: List[float], 
+                                    threshold: float, limit: int) -> Optional[List[Dict]]:
+        """Top-k cosine search inside Postgres; returns None if the query fails."""
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
             
-            if not jobs_without_embeddings:
-                print("✅ All jobs already have embeddings")
+            try:
+                cursor = conn.cursor()
+                
+                # <=> is cosine distance, so similarity >= threshold means distance <= 1 - threshold
+                cursor.execute("""
+                    SELECT id, company_name, position_title, job_description, 
+                           resume_generated, created_at,
+                           1 - (embedding_vector <=> %(query)s::vector) AS similarity_score
+                    FROM job_applications
+                    WHERE embedding_vector IS NOT NULL AND resume_generated = TRUE
+                      AND (embedding_vector <=> %(query)s::vector) <= %(max_distance)s
+                    ORDER BY embedding_vector <=> %(query)s::vector
+                    LIMIT %(limit)s;
+                """, {
+                    'query': self._to_vector_literal(query_embedding),
+                    'max_distance': 1 - threshold,
+                    'limit': limit
+                })
+                
+                rows = cursor.fetchall()
                 cursor.close()
-                conn.close()
+                
+            except Exception as e:
+                print(f"❌ Error in pgvector similarity search: {e}")
+                return None
+        
+        result = []
+        for row in rows:
+            job_dict = dict(row)
+            job_dict['similarity_score'] = round(float(row['similarity_score']), 4)
+            job_dict['resume_path'] = self._build_resume_url(row['company_name'], row['position_title'])
+            result.append(job_dict)
+        
+        return result
+    
+    @staticmethod
+    def _to_vector_literal(embedding: List[float]) -> str:
+        """Format an embedding as a pgvector text literal."""
+        return '[' + ','.join(repr(float(value)) for value in embedding) + ']'
+    
+    @staticmethod
+    def _build_resume_url(company_name: str, position_title: str) -> str:
+        """Construct API URL for resume access with URL encoding."""
+        resume_api_path = f"{quote(company_name)}/{quote(position_title)}.pdf"
+        return f"http://localhost:8080/api/resumes/generated/{resume_api_path}"
+    
+    def _ensure_index_loaded(self) -> bool:
+        """Load the in-memory embedding index from the database on first use."""
+        if self.embedding_index.is_loaded:
+            return True
+        
+        # Concurrent first queries wait for a single load instead of racing their own
+        with self.embedding_index.load_lock:
+            if self.embedding_index.is_loaded:
                 return True
             
-            print(f"🔄 Generating embeddings for {len(jobs_without_embeddings)} jobs...")
-            
-            success_count = 0
-            for job in jobs_without_embeddings:
+            self.embedding_index.begin_load()
+            with self.db_connection.connection() as conn:
+                if not conn:
+                    self.embedding_index.abort_load()
+                    return False
+                
                 try:
-                    # Create embedding text and generate embedding
-                    embedding_text = self.embedding_service.create_job_embedding_text(
-                        job['company_name'], 
-                        job['position_title'], 
-                        job['job_description']
-                    )
-                    embedding = self.embedding_service.get_embedding(embedding_text)
+                    cursor = conn.cursor()
+                    
+                    # Only jobs with embeddings AND resume_generated = true are searchable
+                    cursor.execute("""
+                        SELECT id, embedding
+                        FROM job_applications
+                        WHERE embedding IS NOT NULL AND resume_generated = TRUE;
+                    """)
+                    
+                    rows = cursor.fetchall()
+                    cursor.close()
                     
-                    if embedding and self.embedding_service.validate_embedding(embedding):
-                        # Update the job with embedding
-                        cursor.execute("""
-                            UPDATE job_applications 
-                            SET embedding_text = %s, embedding = %s, updated_at = CURRENT_TIMESTAMP
-                            WHERE id = %s;
-                        """, (embedding_text, embedding, job['id']))
-                        
-                        success_count += 1
-                        print(f"  ✅ Generated embedding for job {job['id']}")
-                    else:
-                        print(f"  ❌ Failed to generate valid embedding for job {job['id']}")
-                        
                 except Exception as e:
-                    print(f"  ❌ Error processing job {job['id']}: {e}")
-                    continue
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            print(f"✅ Embedding backfill completed: {success_count}/{len(jobs_without_embeddings)} successful")
-            return success_count > 0
+                    print(f"❌ Error loading embedding index: {e}")
+                    conn.rollback()
+                    self.embedding_index.abort_load()
+                    return False
             
-        except Exception as e:
-            print(f"❌ Error during embedding backfill: {e}")
-            conn.rollback()
-            conn.close()
-            return False
+            self.embedding_index.finish_load((row['id'], row['embedding']) for row in rows)
+            return True
     
-    def _calculate_job_similarities(self, query_embedding: List[float], 
-                                  existing_jobs: List[Dict], threshold: float) -> List[Dict]:
-        """Calculate similarities between query embedding and existing jobs."""
-        similar_jobs = []
+    def _fetch_similar_job_rows(self, matches: List[Tuple[int, float]]) -> Optional[List[Dict]]:
+        """Fetch the display columns for the winning job ids, preserving score order."""
+        if not matches:
+            return []
         
-        for job in existing_jobs:
-            if not job['embedding']:
-                continue
-                
-            # Calculate cosine similarity
-            similarity = self.embedding_service.calculate_cosine_similarity(
-                query_embedding, job['embedding']
-            )
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return None
             
-            if similarity >= threshold:
-                # Construct API URL for resume access with URL encoding
-                resume_api_path = f"{quote(job['company_name'])}/{quote(job['position_title'])}.pdf"
-                resume_url = f"http://localhost:8080/api/resumes/generated/{resume_api_path}"
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, company_name, position_title, job_description, 
+                           resume_generated, created_at
+                    FROM job_applications
+                    WHERE id = ANY(%s);
+                """, ([job_id for job_id, _ in matches],))
                 
-                job_dict = {
-                    'id': job['id'],
-                    'company_name': job['company_name'],
-                    'position_title': job['position_title'],
-                    'job_description': job['job_description'],
-                    'resume_generated': job['resume_generated'],
-                    'created_at': job['created_at'],
-                    'similarity_score': round(similarity, 4),
-                    'resume_path': resume_url
-                }
-                similar_jobs.append(job_dict)
+                rows = {row['id']: row for row in cursor.fetchall()}
+                cursor.close()
+                
+            except Exception as e:
+                print(f"❌ Error fetching similar jobs: {e}")
+                return None
+        
+        similar_jobs = []
+        for job_id, similarity in matches:
+            job = rows.get(job_id)
+            if not job:
+                # Deleted since the index was built
+                self.embedding_index.remove(job_id)
+                continue
+            
+            similar_jobs.append({
+                'id': job['id'],
+                'company_name': job['company_name'],
+                'position_title': job['position_title'],
+                'job_description': job['job_description'],
+                'resume_generated': job['resume_generated'],
+                'created_at': job['created_at'],
+                'similarity_score': round(similarity, 4),
+                'resume_path': self._build_resume_url(job['company_name'], job['position_title'])
+            })
         
         return similar_jobs
     
     def _fallback_similarity_search(self, company_name: str, position_title: str, 
                                    job_description: str, limit: int) -> List[Dict]:
         """Fallback similarity search using basic text matching."""
-        conn = self.db_connection.get_connection()
-        if not conn:
-            return []
-        
-        try:
-            cursor = conn.cursor()
-            
-            # Simple similarity search using ILIKE (case-insensitive LIKE)
-            cursor.execute("""
-                SELECT 
-                    id, 
-                    company_name, 
-                    position_title, 
-                    job_description, 
-                    resume_generated,
-                    created_at,
-                    CASE 
-                        WHEN LOWER(company_name) = LOWER(%s) AND LOWER(position_title) = LOWER(%s) THEN 0.9
-                        WHEN LOWER(company_name) = LOWER(%s) THEN 0.7
-                        WHEN LOWER(position_title) ILIKE LOWER(%s) THEN 0.6
-                        ELSE 0.3
-                    END as similarity_score
-                FROM job_applications
-                WHERE 
-                    resume_generated = TRUE AND (
-                        LOWER(company_name) ILIKE LOWER(%s) OR
-                        LOWER(position_title) ILIKE LOWER(%s) OR
-                        LOWER(job_description) ILIKE LOWER(%s)
-                    )
-                ORDER BY similarity_score DESC, created_at DESC
-                LIMIT %s;
-            """, (
-                company_name, position_title,  # For exact match scoring
-                company_name,  # For company match scoring
-                f'%{position_title}%',  # For position match scoring
-                f'%{company_name}%',  # For ILIKE searches
-                f'%{position_title}%',
-                f'%{job_description[:100]}%',  # First 100 chars for basic description match
-                limit
-            ))
-            
-            similar_jobs = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            # Filter jobs with similarity > 0.5 (50%) and add resume URLs
-            result = []
-            for job in similar_jobs:
-                if job['similarity_score'] > 0.5:
-                    job_dict = dict(job)
-                    
-                    # Add resume URL if resume was generated
-                    if job['resume_generated']:
-                        resume_api_path = f"{quote(job['company_name'])}/{quote(job['position_title'])}.pdf"
-                        job_dict['resume_path'] = f"http://localhost:8080/api/resumes/generated/{resume_api_path}"
-                    
-                    result.append(job_dict)
-            
-            print(f"🔍 Fallback search found {len(result)} similar jobs")
-            return result
+        with self.db_connection.connection() as conn:
+            if not conn:
+                return []
             
-        except Exception as e:
-            print(f"❌ Error in fallback similarity search: {e}")
-            if conn:
-                conn.close()
-            return []
\ No newline at end of file
+            try:
+                cursor = conn.cursor()
+                
+                # Simple similarity search using ILIKE (case-insensitive LIKE)
+                cursor.execute("""
+                    SELECT 
+                        id, 
+                        company_name, 
+                        position_title, 
+                        job_description, 
+                        resume_generated,
+                        created_at,
+                        CASE 
+                            WHEN LOWER(company_name) = LOWER(%s) AND LOWER(position_title) = LOWER(%s) THEN 0.9
+                            WHEN LOWER(company_name) = LOWER(%s) THEN 0.7
+                            WHEN LOWER(position_title) ILIKE LOWER(%s) THEN 0.6
+                            ELSE 0.3
+                        END as similarity_score
+                    FROM job_applications
+                    WHERE 
+                        resume_generated = TRUE AND (
+                            LOWER(company_name) ILIKE LOWER(%s) OR
+                            LOWER(position_title) ILIKE LOWER(%s) OR
+                            LOWER(job_description) ILIKE LOWER(%s)
+                        )
+                    ORDER BY similarity_score DESC, created_at DESC
+                    LIMIT %s;
+                """, (
+                    company_name, position_title,  # For exact match scoring
+                    company_name,  # For company match scoring
+                    f'%{position_title}%',  # For position match scoring
+                    f'%{company_name}%',  # For ILIKE searches
+                    f'%{position_title}%',
+                    f'%{job_description[:100]}%',  # First 100 chars for basic description match
+                    limit
+                ))
+                
+                similar_jobs = cursor.fetchall()
+                cursor.close()
+                
+                # Filter jobs with similarity > 0.5 (50%) and add resume URLs
+                result = []
+                for job in similar_jobs:
+                    if job['similarity_score'] > 0.5:
+                        job_dict = dict(job)
+                        
+                        # Add resume URL if resume was generated
+                        if job['resume_generated']:
+                            job_dict['resume_path'] = self._build_resume_url(job['company_name'], job['position_title'])
+                        
+                        result.append(job_dict)
+                
+                print(f"🔍 Fallback search found {len(result)} similar jobs")
+                return result
+                
+            except Exception as e:
+                print(f"❌ Error in fallback similarity search: {e}")
+                return []
\ No newline at end of file
@@ -1,48 +1,200 @@
 import os
+import re
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+from ..config.settings import settings
+from .latex_format import preamble_formats
+from .pdf_cache import pdf_build_cache
 
 
 class LatexCompiler:
+    """Compiles LaTeX to PDF without touching the process working directory.
+
+    Each compile runs pdflatex in its own temporary build directory (created next to
+    the output so the final move is an atomic rename), so concurrent requests never
+    see each other's auxiliary files or half-written PDFs. At most
+    LATEX_COMPILE_WORKERS pdflatex processes run at once.
+
+    Callers that pass the document's preamble get it precompiled into a pdflatex
+    format once (see PreambleFormatCache), and every later compile starts from it.
+    A source that was compiled before is served from the PDF build cache.
+
+    pdflatex is only rerun while the log asks for it or the auxiliary files are still
+    changing, up to LATEX_MAX_PASSES; the resume and cover letter usually need one.
+    """
+
+    # Name of the document inside each build directory; pdflatex is happiest with
+    # a plain job name, whatever the company or position looks like
+    JOB_NAME = "document"
+
+    # Log messages from LaTeX and common packages asking for another run
+    RERUN_PATTERN = re.compile(
+        r"Rerun to get|Please rerun|Label\(s\) may have changed|Rerun LaTeX|rerunfilecheck Warning"
+    )
+    # Auxiliary files whose content feeds back into the next pass
+    FEEDBACK_EXTENSIONS = (".aux", ".toc", ".out")
+
+    _slots = threading.BoundedSemaphore(settings.latex_compile_workers)
+    _executor = None
+    _executor_lock = threading.Lock()
 
     @staticmethod
-    def compile_latex(latex_code: str, output_dir: str, latex_filename: str):
+    def compile_latex(latex_code: str, output_dir: str, latex_filename: str,
+                      preamble: Optional[str] = None):
         os.makedirs(output_dir, exist_ok=True)
         latex_filepath = os.path.join(output_dir, latex_filename)
+        base_name = os.path.splitext(latex_filename)[0]
+        pdf_filepath = os.path.join(output_dir, f"{base_name}.pdf")
+
+        LatexCompiler._write_atomic(latex_filepath, latex_code)
 
-        with open(latex_filepath, "w", encoding="utf-8") as f:
-            f.write(latex_code)
+        cache_key = None
+        if settings.latex_pdf_cache_enabled:
+            cache_key = pdf_build_cache.make_key(latex_code, LatexCompiler._build_version(preamble))
+            if pdf_build_cache.get(cache_key, pdf_filepath):
+                print(f"♻️ Reused cached PDF for {latex_filepath}")
+                return {
+                    "latex_file": latex_filepath,
+                    "pdf_file": pdf_filepath,
+                    "cached": True,
+                    "passes": []
+                }
 
-        pdf_filepath = None
+        compiled = False
+        pass_seconds: List[float] = []
+        build_dir = tempfile.mkdtemp(prefix=".latex-build-", dir=output_dir)
         try:
-            # Change to output directory for compilation
-            original_cwd = os.getcwd()
-            os.chdir(output_dir)
+            with open(os.path.join(build_dir, f"{LatexCompiler.JOB_NAME}.tex"), "w", encoding="utf-8") as f:
+                f.write(latex_code)
 
-            # Run pdflatex twice for proper references
-            for _ in range(2):
-                subprocess.run(["pdflatex", "-interaction=nonstopmode", latex_filename],
-                               check=True, capture_output=True, text=True)
+            format_name = None
+            if preamble and settings.latex_precompiled_format:
+                format_name = preamble_formats.get_format(preamble)
 
-            # Clean up auxiliary files
-            base_name = os.path.splitext(latex_filename)[0]
-            aux_extensions = ['.aux', '.log', '.out', '.fdb_latexmk', '.fls']
-            for ext in aux_extensions:
-                aux_file = base_name + ext
-                if os.path.exists(aux_file):
-                    os.remove(aux_file)
+            with LatexCompiler._slots:
+                try:
+                    pass_seconds = LatexCompiler._run_passes(build_dir, format_name)
+                except subprocess.CalledProcessError:
+                    if format_name is None:
+                        raise
+                    print(f"⚠️ Compiling with format {format_name} failed, retrying without it")
+                    pass_seconds = LatexCompiler._run_passes(build_dir)
 
-            pdf_filepath = os.path.join(output_dir, f"{base_name}.pdf")
+            built_pdf = os.path.join(build_dir, f"{LatexCompiler.JOB_NAME}.pdf")
+            if cache_key:
+                pdf_build_cache.put(cache_key, built_pdf)
+            os.replace(built_pdf, pdf_filepath)
+            compiled = True
+            print(f"📄 Compiled {latex_filepath} in {len(pass_seconds)} pass(es), {sum(pass_seconds):.2f}s")
 
         except subprocess.CalledProcessError as e:
             print(f"LaTeX compilation failed: {e}")
             print(f"Error output: {e.stderr}")
+        except subprocess.TimeoutExpired:
+            print(f"LaTeX compilation timed out after {settings.latex_compile_timeout}s")
         except FileNotFoundError:
             print("pdflatex not found. Please install LaTeX (e.g., MacTeX on macOS)")
         finally:
-            # Return to original directory
-            os.chdir(original_cwd)
+            # Auxiliary files never leave the build directory
+            shutil.rmtree(build_dir, ignore_errors=True)
 
         return {
             "latex_file": latex_filepath,
-            "pdf_file": pdf_filepath if pdf_filepath and os.path.exists(pdf_filepath) else None
+            "pdf_file": pdf_filepath if compiled else None,
+            "cached": False,
+            "passes": [round(seconds, 3) for seconds in pass_seconds]
         }
+
+    @staticmethod
+    def submit(latex_code: str, output_dir: str, latex_filename: str,
+               preamble: Optional[str] = None) -> Future:
+        """Compile in the background; the future resolves to compile_latex's result"""
+        with LatexCompiler._executor_lock:
+            if LatexCompiler._executor is None:
+                LatexCompiler._executor = ThreadPoolExecutor(
+                    max_workers=settings.latex_compile_workers,
+                    thread_name_prefix="latex"
+                )
+        return LatexCompiler._executor.submit(
+            LatexCompiler.compile_latex, latex_code, output_dir, latex_filename, preamble)
+
+    @staticmethod
+    def _build_version(preamble: Optional[str]) -> str:
+        """Everything besides the source that changes the PDF: TeX version and format"""
+        version = preamble_formats.tex_version()
+        if preamble and settings.latex_precompiled_format:
+            version += f"|{preamble_formats.format_name(preamble)}"
+        return version
+
+    @staticmethod
+    def _run_passes(build_dir: str, format_name: Optional[str] = None) -> List[float]:
+        """Run pdflatex until the output is stable and return the duration of each pass"""
+        pass_seconds = []
+        feedback = LatexCompiler._feedback_digest(build_dir)
+        while True:
+            start_time = time.perf_counter()
+            LatexCompiler._run_pdflatex(build_dir, format_name)
+            pass_seconds.append(time.perf_counter() - start_time)
+
+            previous_feedback, feedback = feedback, LatexCompiler._feedback_digest(build_dir)
+            if len(pass_seconds) >= settings.latex_max_passes:
+                break
+            # The first pass always writes fresh auxiliary files, so only the log counts
+            if not LatexCompiler._log_requests_rerun(build_dir) and (
+                    len(pass_seconds) == 1 or feedback == previous_feedback):
+                break
+
+        return pass_seconds
+
+    @staticmethod
+    def _log_requests_rerun(build_dir: str) -> bool:
+        log_path = os.path.join(build_dir, f"{LatexCompiler.JOB_NAME}.log")
+        try:
+            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+                return LatexCompiler.RERUN_PATTERN.search(f.read()) is not None
+        except OSError:
+            return False
+
+    @staticmethod
+    def _feedback_digest(build_dir: str) -> str:
+        digest = hashlib.sha256()
+        for extension in LatexCompiler.FEEDBACK_EXTENSIONS:
+            path = os.path.join(build_dir, f"{LatexCompiler.JOB_NAME}{extension}")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    digest.update(extension.encode("utf-8"))
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _run_pdflatex(build_dir: str, format_name: Optional[str] = None) -> subprocess.CompletedProcess:
+        command = ["pdflatex", "-interaction=nonstopmode", f"-output-directory={build_dir}"]
+        env = None
+        if format_name:
+            command.append(f"-fmt={format_name}")
+            env = preamble_formats.env()
+        command.append(f"{LatexCompiler.JOB_NAME}.tex")
+
+        return subprocess.run(
+            command, cwd=build_dir, env=env, check=True, capture_output=True, text=True,
+            timeout=settings.latex_compile_timeout
+        )
+
+    @staticmethod
+    def _write_atomic(path: str, content: str) -> None:
+        """Write via a temporary file and rename, so readers never see a partial file"""
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
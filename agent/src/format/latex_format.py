@@ -0,0 +1,130 @@
+"""Precompiled pdflatex formats for document preambles"""
+
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from typing import Any, Dict, Optional
+from ..config.settings import settings
+
+# Marker a preamble places after the packages that can be dumped into a format
+END_OF_DUMP = "\\csname endofdump\\endcsname"
+
+
+class PreambleFormatCache:
+    """Builds a pdflatex format per preamble with mylatexformat and caches it on disk.
+
+    Loading fontawesome5, titlesec, babel and friends dominates the compile time of
+    a short document. A format holds them already loaded: pdflatex started with
+    -fmt skips the preamble up to endofdump and goes straight to the document.
+    Formats are named after a hash of the dumped preamble and the pdflatex version,
+    so editing the template or upgrading TeX builds a new one.
+    """
+
+    def __init__(self, format_dir: str):
+        self.format_dir = os.path.abspath(format_dir)
+        self._formats: Dict[str, Optional[str]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._tex_version = None
+        self._stats = {"builds": 0, "build_failures": 0, "build_seconds": 0.0}
+
+    def get_format(self, preamble: str) -> Optional[str]:
+        """
+        Return the format name for this preamble, building it on first use.
+
+        None means the preamble has no endofdump marker or the format can't be built
+        (e.g. mylatexformat isn't installed); compile normally in that case.
+        """
+        if END_OF_DUMP not in preamble:
+            return None
+
+        name = self.format_name(preamble)
+        with self._lock:
+            if name in self._formats:
+                return self._formats[name]
+            build_lock = self._locks.setdefault(name, threading.Lock())
+
+        # Only one thread builds a given format; the others wait for it
+        with build_lock:
+            with self._lock:
+                if name in self._formats:
+                    return self._formats[name]
+
+            if os.path.exists(os.path.join(self.format_dir, f"{name}.fmt")):
+                built = name
+            else:
+                built = self._build(name, preamble)
+
+            with self._lock:
+                self._formats[name] = built
+            return built
+
+    def format_name(self, preamble: str) -> str:
+        """Name of the format for a preamble (also identifies the template version)"""
+        dumped = preamble.split(END_OF_DUMP, 1)[0]
+        digest = hashlib.sha256(f"{self.tex_version()}\n{dumped}".encode("utf-8")).hexdigest()
+        return f"aria-{digest[:16]}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Format builds so far and the formats in use"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["build_seconds"] = round(stats["build_seconds"], 3)
+            stats["formats"] = {name: built is not None for name, built in self._formats.items()}
+        stats["format_dir"] = self.format_dir
+        return stats
+
+    def env(self) -> Dict[str, str]:
+        """Environment that lets pdflatex -fmt find the cached formats"""
+        # The trailing separator keeps the default search path after ours
+        return {**os.environ, "TEXFORMATS": f"{self.format_dir}{os.pathsep}"}
+
+    def _build(self, name: str, preamble: str) -> Optional[str]:
+        os.makedirs(self.format_dir, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix=".format-build-", dir=self.format_dir)
+        start_time = time.perf_counter()
+        try:
+            with open(os.path.join(build_dir, f"{name}.tex"), "w", encoding="utf-8") as f:
+                f.write(preamble)
+                f.write("\n\\begin{document}\n\\end{document}\n")
+
+            subprocess.run(
+                ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={name}",
+                 "&pdflatex", "mylatexformat.ltx", f"{name}.tex"],
+                cwd=build_dir, check=True, capture_output=True, text=True,
+                timeout=settings.latex_compile_timeout
+            )
+            os.replace(os.path.join(build_dir, f"{name}.fmt"), os.path.join(self.format_dir, f"{name}.fmt"))
+
+            build_seconds = time.perf_counter() - start_time
+            with self._lock:
+                self._stats["builds"] += 1
+                self._stats["build_seconds"] += build_seconds
+            print(f"⚙️ Built LaTeX format {name} in {build_seconds:.2f}s")
+            return name
+
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError, OSError) as e:
+            with self._lock:
+                self._stats["build_failures"] += 1
+            print(f"⚠️ Could not build LaTeX format {name}, compiling without it: {e}")
+            return None
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def tex_version(self) -> str:
+        """First line of pdflatex --version (empty if pdflatex is missing)"""
+        if self._tex_version is None:
+            try:
+                result = subprocess.run(["pdflatex", "--version"], capture_output=True, text=True, timeout=30)
+                self._tex_version = result.stdout.splitlines()[0] if result.stdout else ""
+            except (OSError, subprocess.TimeoutExpired):
+                self._tex_version = ""
+        return self._tex_version
+
+
+# Global format cache
+preamble_formats = PreambleFormatCache(settings.latex_format_dir)
@@ -2,7 +2,13 @@
 class LatexFormatter:
 
     @staticmethod
-    def format_resume(highlights : str = "", experiences : str = "", skills: str = "", projects: str = ""):
+    def resume_preamble():
+        """
+        Preamble shared by every resume.
+
+        Everything before endofdump can be precompiled into a pdflatex format (see
+        LatexCompiler); the rest can't be dumped and is read on every compile.
+        """
         return f"""
 \\documentclass[letterpaper,11pt]{{article}}
 \\usepackage{{latexsym}}
@@ -12,15 +18,17 @@ class LatexFormatter:
 \\usepackage[usenames,dvipsnames]{{color}}
 \\usepackage{{verbatim}}
 \\usepackage{{enumitem}}
-\\usepackage[hidelinks]{{hyperref}}
 \\usepackage{{fancyhdr}}
 \\usepackage[english]{{babel}}
 \\usepackage{{tabularx}}
 \\usepackage{{fontawesome5}}
-\\input{{glyphtounicode}}
 
 \\usepackage{{lmodern}}
 
+\\csname endofdump\\endcsname
+\\usepackage[hidelinks]{{hyperref}}
+\\input{{glyphtounicode}}
+
 \\pagestyle{{fancy}}
 \\fancyhf{{}}
 \\fancyfoot{{}}
@@ -79,6 +87,11 @@ class LatexFormatter:
 \\newcommand{{\\resumeSubHeadingListEnd}}{{\\end{{itemize}}}}
 \\newcommand{{\\resumeItemListStart}}{{\\begin{{itemize}}}}
 \\newcommand{{\\resumeItemListEnd}}{{\\end{{itemize}}\\vspace{{-5pt}}}}
+"""
+
+    @staticmethod
+    def format_resume(highlights : str = "", experiences : str = "", skills: str = "", projects: str = ""):
+        return LatexFormatter.resume_preamble() + f"""
 
 %-------------------------------------------
 %%%%%%  RESUME STARTS HERE  %%%%%%%%%%%%%%%%%%%%%%%%%%%%
@@ -0,0 +1,155 @@
+"""Content-addressed cache of compiled PDFs"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from ..config.settings import settings
+
+
+class PdfBuildCache:
+    """Caches compiled PDFs keyed by the sha256 of the LaTeX source and build version.
+
+    Identical sources (LLM cache hits, retries, re-saves) get the stored PDF back
+    instead of running pdflatex again. PDFs live as <key>.pdf files in cache_dir;
+    the least recently used ones are evicted once they take up more than max_bytes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or settings.latex_pdf_cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else settings.latex_pdf_cache_max_mb * 1024 * 1024
+
+        self._lock = threading.Lock()
+        # Key -> size in bytes, least recently used first
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(latex_code: str, version: str = "") -> str:
+        """Key for a source; version covers whatever else shapes the PDF (template, format, TeX)"""
+        return hashlib.sha256(f"{version}\n{latex_code}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str, destination: str) -> bool:
+        """Copy the cached PDF for key to destination; False on a miss"""
+        with self._lock:
+            entries = self._load_entries()
+            if key not in entries:
+                self._misses += 1
+                return False
+            entries.move_to_end(key)
+
+        try:
+            self._copy_atomic(self._path(key), destination)
+            # Keeps the LRU order when the index is rebuilt after a restart
+            os.utime(self._path(key))
+        except OSError:
+            # Removed from disk behind our back
+            with self._lock:
+                self._forget(key)
+                self._misses += 1
+            return False
+
+        with self._lock:
+            self._hits += 1
+        return True
+
+    def put(self, key: str, pdf_path: str) -> None:
+        """Store a freshly compiled PDF and evict old ones beyond the size limit"""
+        try:
+            size = os.path.getsize(pdf_path)
+            if size > self.max_bytes:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._copy_atomic(pdf_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️ Could not cache PDF: {e}")
+            return
+
+        with self._lock:
+            entries = self._load_entries()
+            self._forget(key)
+            entries[key] = size
+            self._size += size
+            self._stores += 1
+
+            while self._size > self.max_bytes and len(entries) > 1:
+                oldest, _ = next(iter(entries.items()))
+                self._forget(oldest)
+                self._evictions += 1
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_entries()):
+                self._forget(key)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._load_entries()
+            lookups = self._hits + self._misses
+            return {
+                "enabled": settings.latex_pdf_cache_enabled,
+                "cache_dir": self.cache_dir,
+                "entries": len(entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions
+            }
+
+    def _load_entries(self) -> "OrderedDict[str, int]":
+        """Index the PDFs already on disk on first use, oldest first (called with the lock held)"""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if os.path.isdir(self.cache_dir):
+                files = []
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".pdf"):
+                        stat = os.stat(os.path.join(self.cache_dir, name))
+                        files.append((stat.st_mtime, name[:-4], stat.st_size))
+                for _, key, size in sorted(files):
+                    self._entries[key] = size
+                    self._size += size
+        return self._entries
+
+    def _forget(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    @staticmethod
+    def _copy_atomic(source: str, destination: str) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(destination) or ".")
+        try:
+            with os.fdopen(fd, "wb") as out, open(source, "rb") as src:
+                shutil.copyfileobj(src, out)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Global PDF build cache instance
+pdf_build_cache = PdfBuildCache()
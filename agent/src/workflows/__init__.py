@@ -3,5 +3,17 @@
 # from .resume_workflow import ResumeWorkflow
 from .states import ResumeState
 from .nodes import Nodes
+from .registry import WorkflowRegistry, workflow_registry
+from .runner import GenerationRunner, GenerationCancelled
+from .job_manager import GenerationJobManager, QueueFullError
 
-__all__ = ["ResumeState", "Nodes"]
+__all__ = [
+    "ResumeState",
+    "Nodes",
+    "WorkflowRegistry",
+    "workflow_registry",
+    "GenerationRunner",
+    "GenerationCancelled",
+    "GenerationJobManager",
+    "QueueFullError"
+]
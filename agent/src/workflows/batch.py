@@ -0,0 +1,105 @@
+"""Runs many generations at once for batch requests"""
+
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .runner import GenerationRunner, GenerationCancelled
+from .registry import workflow_registry
+from ..chains.clients import clients
+from ..chains.data_files import data_files
+from ..config.settings import settings
+
+
+class BatchRunner:
+    """Runs a list of generations concurrently and yields each result as it finishes.
+
+    Every batch in the process shares BATCH_MAX_CONCURRENCY slots, so two batches
+    started together don't double the load on the LLM provider; the per-provider
+    rate limit on the chat model caps the request rate on top of that. Clients,
+    compiled workflows and the data files are prepared once before the first item.
+    """
+
+    _slots = threading.BoundedSemaphore(settings.batch_max_concurrency)
+
+    @staticmethod
+    def prepare() -> None:
+        """Build the shared clients, workflows and data files before the items start"""
+        clients.get_chat_model()
+        workflow_registry.warm_up()
+        for path in (settings.experiences_path, settings.skills_path, settings.projects_path):
+            try:
+                data_files.load_json(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not preload {path}: {e}")
+
+    @staticmethod
+    def run(items: List[Dict[str, Any]], concurrency: Optional[int] = None,
+            should_cancel: Optional[Callable[[], bool]] = None,
+            keep_alive_seconds: Optional[float] = None) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Run items ({"kind": ..., "payload": ...}, see GenerationRunner.run_job).
+
+        Yields {"index", "status", "generation_id", ...} per item in completion
+        order. With keep_alive_seconds, also yields None whenever nothing finished
+        for that long. Closing the generator cancels the items that haven't finished.
+        """
+        if not items:
+            return
+
+        BatchRunner.prepare()
+        workers = max(1, min(concurrency or settings.batch_max_concurrency,
+                             settings.batch_max_concurrency, len(items)))
+        cancelled = threading.Event()
+
+        def is_cancelled() -> bool:
+            return cancelled.is_set() or bool(should_cancel and should_cancel())
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+        try:
+            pending = {
+                executor.submit(BatchRunner._run_item, index, item, is_cancelled): index
+                for index, item in enumerate(items)
+            }
+            while pending:
+                done, _ = wait(pending, timeout=keep_alive_seconds, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield None
+                    continue
+                for future in done:
+                    del pending[future]
+                    yield future.result()
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _run_item(index: int, item: Dict[str, Any], should_cancel: Callable[[], bool]) -> Dict[str, Any]:
+        generation_id = item.get("generation_id") or uuid.uuid4().hex
+        start_time = time.perf_counter()
+
+        with BatchRunner._slots:
+            if should_cancel():
+                return {"index": index, "status": "cancelled", "generation_id": generation_id}
+            try:
+                result = GenerationRunner.run_job(item["kind"], item["payload"],
+                                                  should_cancel=should_cancel,
+                                                  generation_id=generation_id)
+            except GenerationCancelled:
+                return {"index": index, "status": "cancelled", "generation_id": generation_id}
+            except Exception as e:
+                print(f"❌ Batch item {index} failed: {e}")
+                return {
+                    "index": index,
+                    "status": "error",
+                    "message": str(e),
+                    "generation_id": generation_id,
+                    "seconds": round(time.perf_counter() - start_time, 2)
+                }
+
+        return {
+            "index": index,
+            **result,
+            "seconds": round(time.perf_counter() - start_time, 2)
+        }
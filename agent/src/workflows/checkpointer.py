@@ -0,0 +1,93 @@
+"""Checkpoint storage for resuming failed workflow runs"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from ..config.settings import settings
+
+BACKENDS = ("sqlite", "postgres", "memory", "none")
+
+
+def _postgres_conn_string() -> str:
+    if settings.database_url:
+        return settings.database_url
+    return (f"postgresql://{settings.db_user}:{settings.db_password}"
+            f"@{settings.db_host}:{settings.db_port}/{settings.db_name}")
+
+
+def create_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """
+    Build the checkpointer selected by WORKFLOW_CHECKPOINTER.
+
+    "sqlite" (default) and "postgres" need the langgraph-checkpoint-sqlite and
+    langgraph-checkpoint-postgres packages; without them the run state is kept in
+    memory, which still lets a retry in the same process resume. "memory" keeps
+    them in memory on purpose, "none" disables checkpointing entirely.
+    """
+    backend = settings.workflow_checkpointer.lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown WORKFLOW_CHECKPOINTER '{settings.workflow_checkpointer}' "
+                         f"(expected one of: {', '.join(BACKENDS)})")
+    if backend == "none":
+        return None
+    if backend == "memory":
+        print("💾 Workflow checkpoints kept in memory")
+        return InMemorySaver()
+
+    try:
+        if backend == "postgres":
+            from psycopg import Connection
+            from psycopg.rows import dict_row
+            from langgraph.checkpoint.postgres import PostgresSaver
+
+            conn = Connection.connect(_postgres_conn_string(), autocommit=True,
+                                      prepare_threshold=0, row_factory=dict_row)
+            checkpointer = PostgresSaver(conn)
+            checkpointer.setup()
+            print("💾 Workflow checkpoints stored in Postgres")
+            return checkpointer
+
+        if backend == "sqlite":
+            from langgraph.checkpoint.sqlite import SqliteSaver
+
+            directory = os.path.dirname(settings.workflow_checkpoint_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(settings.workflow_checkpoint_path, check_same_thread=False)
+            checkpointer = SqliteSaver(conn)
+            checkpointer.setup()
+            print(f"💾 Workflow checkpoints stored in {settings.workflow_checkpoint_path}")
+            return checkpointer
+
+    except ImportError as e:
+        print(f"⚠️ {backend} checkpointer unavailable ({e}), keeping checkpoints in memory")
+    except Exception as e:
+        print(f"⚠️ Could not open {backend} checkpointer ({e}), keeping checkpoints in memory")
+
+    return InMemorySaver()
+
+
+def prune_checkpoints(checkpointer: BaseCheckpointSaver, max_age_seconds: int) -> int:
+    """
+    Delete the threads whose latest checkpoint is older than max_age_seconds.
+
+    Successful runs delete their own checkpoints; this catches the runs that failed
+    and were never retried. Returns the number of threads deleted.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+    latest: Dict[str, datetime] = {}
+    for item in checkpointer.list(None):
+        thread_id = item.config["configurable"]["thread_id"]
+        saved_at = datetime.fromisoformat(item.checkpoint["ts"])
+        if saved_at.tzinfo is None:
+            saved_at = saved_at.replace(tzinfo=timezone.utc)
+        if thread_id not in latest or saved_at > latest[thread_id]:
+            latest[thread_id] = saved_at
+
+    stale = [thread_id for thread_id, saved_at in latest.items() if saved_at < cutoff]
+    for thread_id in stale:
+        checkpointer.delete_thread(thread_id)
+    return len(stale)
@@ -0,0 +1,191 @@
+"""Bounded background execution of generation workflows"""
+
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from .runner import GenerationRunner, GenerationCancelled
+from .single_flight import generation_key
+
+
+class QueueFullError(Exception):
+    """Raised when a generation is submitted while the queue is at its depth limit"""
+    pass
+
+
+class GenerationJobManager:
+    """Runs generations on a fixed pool of worker threads and tracks their status.
+
+    At most max_workers generations run at once and at most max_queue_depth wait
+    behind them; further submissions are rejected rather than queued without bound.
+    Finished jobs are kept for job_ttl_seconds so clients can poll for the result.
+    Submitting a generation identical to one still queued or running returns the
+    existing job's id instead of starting another.
+    """
+
+    def __init__(self, max_workers: int = 3, max_queue_depth: int = 20, job_ttl_seconds: int = 3600):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.job_ttl_seconds = job_ttl_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._futures = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        # Dedup key -> id of the queued or running job with those inputs
+        self._active_keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, payload: Dict[str, Any], generation_id: Optional[str] = None) -> str:
+        """
+        Queue a generation (see GenerationRunner.run_job) and return its id.
+
+        Passing the id of a finished generation runs it again under that id, so a
+        retry of a failed run resumes from its checkpoint.
+        """
+        key = generation_key(kind, payload)
+        with self._lock:
+            self._prune_finished()
+            if generation_id in self._futures:
+                print(f"🔗 Generation {generation_id} is already queued")
+                return generation_id
+
+            existing_id = self._active_keys.get(key)
+            if existing_id is not None:
+                print(f"🔗 Identical {kind} generation already queued as {existing_id}")
+                return existing_id
+
+            if self._waiting() >= self.max_queue_depth:
+                raise QueueFullError(f"Generation queue is full ({self.max_queue_depth} waiting)")
+
+            generation_id = generation_id or uuid.uuid4().hex
+            cancel_event = threading.Event()
+            self._jobs[generation_id] = {
+                "id": generation_id,
+                "kind": kind,
+                "status": "queued",
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "completed_nodes": [],
+                "result": None,
+                "error": None,
+                "dedup_key": key
+            }
+            self._cancel_events[generation_id] = cancel_event
+            self._active_keys[key] = generation_id
+            self._futures[generation_id] = self._executor.submit(
+                self._execute, generation_id, kind, payload, cancel_event
+            )
+
+        print(f"📥 Queued {kind} generation {generation_id}")
+        return generation_id
+
+    def get(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a snapshot of a generation's status and result"""
+        with self._lock:
+            job = self._jobs.get(generation_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot.pop("dedup_key", None)
+            snapshot["completed_nodes"] = list(job["completed_nodes"])
+            return snapshot
+
+    def cancel(self, generation_id: str) -> bool:
+        """
+        Cancel a generation.
+
+        A queued generation never starts; a running one stops at the next workflow
+        step. Returns False if the generation is unknown or already finished.
+        """
+        with self._lock:
+            job = self._jobs.get(generation_id)
+            if job is None or job["status"] not in ("queued", "running"):
+                return False
+
+            self._cancel_events[generation_id].set()
+            # A new identical submission should start afresh, not attach to this one
+            self._forget_key(generation_id)
+            if self._futures[generation_id].cancel():
+                job["status"] = "cancelled"
+                job["finished_at"] = time.time()
+                self._release(generation_id)
+
+        print(f"🛑 Cancellation requested for generation {generation_id}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and worker usage"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "queued": self._count("queued"),
+                "waiting": self._waiting(),
+                "running": self._count("running"),
+                "tracked_jobs": len(self._jobs)
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _execute(self, generation_id: str, kind: str, payload: Dict[str, Any],
+                 cancel_event: threading.Event) -> None:
+        with self._lock:
+            job = self._jobs[generation_id]
+            job["status"] = "running"
+            job["started_at"] = time.time()
+
+        def on_node(node_name: str) -> None:
+            with self._lock:
+                job["completed_nodes"].append(node_name)
+
+        try:
+            result = GenerationRunner.run_job(kind, payload, on_node=on_node,
+                                              should_cancel=cancel_event.is_set,
+                                              generation_id=generation_id)
+            status, error = "succeeded", None
+        except GenerationCancelled:
+            result, status, error = None, "cancelled", None
+        except Exception as e:
+            print(f"❌ Generation {generation_id} failed: {e}")
+            result, status, error = None, "failed", str(e)
+
+        with self._lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = time.time()
+            self._release(generation_id)
+
+        print(f"🏁 Generation {generation_id} {status}")
+
+    def _release(self, generation_id: str) -> None:
+        self._futures.pop(generation_id, None)
+        self._cancel_events.pop(generation_id, None)
+        self._forget_key(generation_id)
+
+    def _forget_key(self, generation_id: str) -> None:
+        key = self._jobs[generation_id]["dedup_key"]
+        if self._active_keys.get(key) == generation_id:
+            del self._active_keys[key]
+
+    def _waiting(self) -> int:
+        """Jobs that will not get a worker straight away"""
+        active = self._count("queued") + self._count("running")
+        return max(active - self.max_workers, 0)
+
+    def _count(self, status: str) -> int:
+        return sum(1 for job in self._jobs.values() if job["status"] == status)
+
+    def _prune_finished(self) -> None:
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.job_ttl_seconds
+        expired: List[str] = [
+            generation_id for generation_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for generation_id in expired:
+            del self._jobs[generation_id]
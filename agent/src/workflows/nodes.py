@@ -1,3 +1,9 @@
+import os
+import time
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+from langchain_core.runnables import RunnableConfig
 from .states import ResumeState, CoverLetterState
 from ..format.latex_formatter import LatexFormatter
 from ..format.latex_compiler import LatexCompiler
@@ -6,9 +12,60 @@ from langchain.docstore.document import Document
 from pypdf import PdfReader
 from ..database import db
 
+# Resume PDFs compiling in the background, keyed by the run's thread id
+_resume_compiles: Dict[str, Tuple[Future, float]] = {}
+_resume_compiles_lock = threading.Lock()
+
+
 class Nodes:
     @staticmethod
-    def generate_experiences_node(state: ResumeState) -> ResumeState:
+    def check_reusable_resume_node(state: ResumeState) -> dict:
+        """Pull stored sections from a near-identical past posting, if there is one"""
+        if settings.resume_reuse_threshold > 1 or not state.get("reuse", True):
+            return {}
+
+        print("🔁 Checking for a near-duplicate resume...")
+        try:
+            match = db.find_reusable_resume(
+                state["company"], state["position"], state["job_posting"],
+                threshold=settings.resume_reuse_threshold,
+                exclude_job_id=state.get("job_id")
+            )
+        except Exception as e:
+            print(f"⚠️ Resume reuse check failed: {e}")
+            match = None
+
+        if not match:
+            return {}
+
+        sections = match["sections"]
+        if not all(sections.get(key) for key in ("experiences", "skills", "project_summaries")):
+            return {}
+
+        print(f"♻️ Reusing sections from job {match['job_id']} "
+              f"({match['position_title']} at {match['company_name']}, similarity {match['similarity_score']})")
+        return {
+            "experiences": sections["experiences"],
+            "skills": sections["skills"],
+            "project_names": sections.get("project_names", []),
+            "project_summaries": sections["project_summaries"],
+            "generation_metadata": {
+                "reused_from": {
+                    "job_id": match["job_id"],
+                    "similarity_score": match["similarity_score"]
+                }
+            }
+        }
+
+    @staticmethod
+    def route_resume_generation(state: ResumeState):
+        """Skip straight to highlights when sections were reused"""
+        if state.get("generation_metadata", {}).get("reused_from"):
+            return "generate_highlights"
+        return ["generate_experiences", "generate_skills", "select_projects"]
+
+    @staticmethod
+    def generate_experiences_node(state: ResumeState) -> dict:
         print("📝 Generating experiences...")
 
         from ..chains.experience_chain import ExperienceChain
@@ -17,11 +74,15 @@ class Nodes:
             "job_posting": state["job_posting"]
         })
 
-        state["experiences"] = result["experiences"]
-        return state
+        # Runs in parallel with the skills and project branches, so only
+        # return the keys this node owns
+        return {
+            "experiences": result["experiences"],
+            "generation_metadata": {"experiences": result["metadata"]}
+        }
 
     @staticmethod
-    def generate_skills_node(state: ResumeState) -> ResumeState:
+    def generate_skills_node(state: ResumeState) -> dict:
         print("📝 Generating skills...")
 
         from ..chains.skills_chain import SkillsChain
@@ -30,11 +91,13 @@ class Nodes:
             "job_posting": state["job_posting"]
         })
 
-        state["skills"] = result["skills"]
-        return state
+        return {
+            "skills": result["skills"],
+            "generation_metadata": {"skills": result["metadata"]}
+        }
 
     @staticmethod
-    def select_projects_node(state: ResumeState) -> ResumeState:
+    def select_projects_node(state: ResumeState) -> dict:
         print("📝 Selecting projects...")
 
         from ..chains.project_selection_chain import ProjectSelectionChain
@@ -43,11 +106,13 @@ class Nodes:
             "job_posting": state["job_posting"]
         })
 
-        state["project_names"] = result["project_names"]
-        return state
+        return {
+            "project_names": result["project_names"],
+            "generation_metadata": {"project_selection": result["metadata"]}
+        }
 
     @staticmethod
-    def generate_project_summaries_node(state: ResumeState) -> ResumeState:
+    def generate_project_summaries_node(state: ResumeState) -> dict:
         print("📝 Summarizing projects...")
 
         from ..chains.project_summaries_chain import ProjectSummariesChain
@@ -57,8 +122,10 @@ class Nodes:
             "project_names": state["project_names"]
         })
 
-        state["project_summaries"] = result["project_summaries"]
-        return state
+        return {
+            "project_summaries": result["project_summaries"],
+            "generation_metadata": {"project_summaries": result["metadata"]}
+        }
 
     @staticmethod
     def generate_highlights_node(state: ResumeState) -> ResumeState:
@@ -78,21 +145,72 @@ class Nodes:
     @staticmethod
     def save_resume_node(state: ResumeState) -> ResumeState:
         print("✅ Saving resume...")
-        resume_latex = LatexFormatter.format_resume(
-            highlights=state["highlights"],
-            experiences=state["experiences"],
-            skills=state["skills"],
-            projects=state["project_summaries"]
-        )
+        resume_latex = Nodes._format_resume(state)
         output_dir = f"{settings.resumes_dir}/{state['company']}"
         latex_filename = f"{state['position']}.tex"
         result = LatexCompiler.compile_latex(
-            resume_latex, output_dir, latex_filename)
+            resume_latex, output_dir, latex_filename,
+            preamble=LatexFormatter.resume_preamble())
         state["resume_latex"] = resume_latex
         state["resume_latex_file"] = result["latex_file"]
         state["resume_pdf_file"] = result["pdf_file"]
         return state
 
+    @staticmethod
+    def start_resume_pdf_node(state: ResumeState, config: RunnableConfig) -> dict:
+        """Format the resume and compile its PDF in the background; await_resume_pdf joins it"""
+        print("✅ Saving resume (compiling in the background)...")
+        resume_latex = Nodes._format_resume(state)
+        output_dir = f"{settings.resumes_dir}/{state['company']}"
+        latex_filename = f"{state['position']}.tex"
+        latex_filepath = os.path.join(output_dir, latex_filename)
+
+        future = LatexCompiler.submit(resume_latex, output_dir, latex_filename,
+                                      preamble=LatexFormatter.resume_preamble())
+        with _resume_compiles_lock:
+            # Drop compiles whose run failed before joining them
+            cutoff = time.time() - settings.latex_background_compile_ttl_seconds
+            for key, (pending, submitted_at) in list(_resume_compiles.items()):
+                if pending.done() and submitted_at < cutoff:
+                    del _resume_compiles[key]
+            _resume_compiles[Nodes._resume_compile_key(config, latex_filepath)] = (future, time.time())
+
+        return {"resume_latex": resume_latex, "resume_latex_file": latex_filepath}
+
+    @staticmethod
+    def await_resume_pdf_node(state: ResumeState, config: RunnableConfig) -> dict:
+        """Wait for the background resume compile started by start_resume_pdf"""
+        latex_filepath = state["resume_latex_file"]
+        with _resume_compiles_lock:
+            pending = _resume_compiles.pop(Nodes._resume_compile_key(config, latex_filepath), None)
+
+        if pending is not None:
+            result = pending[0].result()
+        else:
+            # Resumed from a checkpoint in another process: compile here instead
+            result = LatexCompiler.compile_latex(
+                state["resume_latex"], os.path.dirname(latex_filepath),
+                os.path.basename(latex_filepath), preamble=LatexFormatter.resume_preamble())
+
+        print("📄 Resume PDF ready")
+        return {"resume_pdf_file": result["pdf_file"]}
+
+    @staticmethod
+    def _resume_compile_key(config: Optional[RunnableConfig], latex_filepath: str) -> str:
+        """The run's thread id, so two runs for the same company and position never
+        join each other's compile; the .tex path only for runs invoked without one"""
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+        return f"thread:{thread_id}" if thread_id else f"file:{latex_filepath}"
+
+    @staticmethod
+    def _format_resume(state: ResumeState) -> str:
+        return LatexFormatter.format_resume(
+            highlights=state["highlights"],
+            experiences=state["experiences"],
+            skills=state["skills"],
+            projects=state["project_summaries"]
+        )
+
     @staticmethod
     def retrieve_context_node(state: ResumeState) -> ResumeState:
         print("🔎 Retrieving context...")
@@ -144,12 +262,12 @@ class Nodes:
 
     @staticmethod
     def add_cover_letter_context_node(state: ResumeState) -> ResumeState:
-        from ..chains.context_retrieval_chain import ContextRetrievalChain
+        from ..chains.context_retrieval_chain import ContextRetrievalChain, COVER_LETTER_SOURCE
         context_retrieval_chain = ContextRetrievalChain()
         document = Document(
             page_content=state["cover_letter"],
             metadata={
-                "source": "cover letter",
+                "source": COVER_LETTER_SOURCE,
                 "position": state["position"],
                 "company": state["company"]
             })
@@ -208,10 +326,20 @@ class Nodes:
         # Check if this is a ResumeState by looking for keys unique to ResumeState
         resume_generated = "resume_latex" in state or "experiences" in state
         
-        db.save_job_application(
+        job_id = db.save_job_application(
             company_name=company_name,
             position_title=position_title,
             job_description=job_posting,
             resume_generated=resume_generated
         )
+
+        # Keep the generated sections so near-duplicate postings can reuse them
+        if job_id and resume_generated and state.get("experiences"):
+            db.save_resume_sections(job_id, {
+                "experiences": state["experiences"],
+                "skills": state["skills"],
+                "project_names": state.get("project_names", []),
+                "project_summaries": state["project_summaries"],
+                "highlights": state.get("highlights", "")
+            })
         return state
\ No newline at end of file
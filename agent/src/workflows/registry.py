@@ -0,0 +1,124 @@
+"""Registry of compiled LangGraph workflows shared across requests"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+from .workflows import Worlflows
+from .checkpointer import create_checkpointer, prune_checkpoints
+from ..config.settings import settings
+
+
+class WorkflowRegistry:
+    """Compiles each workflow once and hands the same compiled graph to every caller.
+
+    Compiled graphs hold no per-run state, so a single instance can be invoked
+    from many request threads at the same time. All graphs share one checkpointer;
+    runs are kept apart by their thread_id (the generation id).
+    """
+
+    # How often abandoned checkpoints are looked for
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[..., Any]] = {
+            "resume": Worlflows.create_resume_workflow,
+            "resume_cover_letter": Worlflows.create_resume_cover_letter_workflow,
+            "cover_letter": Worlflows.create_cover_letter_worklflow,
+        }
+        self._compiled: Dict[str, Any] = {}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._checkpointer = None
+        self._checkpointer_created = False
+        self._last_prune = 0.0
+
+    @property
+    def checkpointer(self):
+        """Checkpointer shared by every compiled workflow (None when disabled)"""
+        with self._lock:
+            return self._get_checkpointer_locked()
+
+    def register(self, name: str, factory: Callable[..., Any]) -> None:
+        """Register (or replace) a workflow factory; it is compiled on next use"""
+        with self._lock:
+            self._factories[name] = factory
+            self._compiled.pop(name, None)
+            self._metrics.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the compiled workflow, compiling it on first use"""
+        compiled = self._ensure_compiled(name)
+        with self._lock:
+            self._metrics[name]["uses"] += 1
+        return compiled
+
+    def _ensure_compiled(self, name: str) -> Any:
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(name)
+                if compiled is None:
+                    compiled = self._compile(name)
+        return compiled
+
+    def _compile(self, name: str) -> Any:
+        if name not in self._factories:
+            raise KeyError(f"Unknown workflow: {name}")
+
+        start_time = time.perf_counter()
+        compiled = self._factories[name](checkpointer=self._get_checkpointer_locked())
+        compile_seconds = time.perf_counter() - start_time
+
+        self._compiled[name] = compiled
+        self._metrics[name] = {
+            "compile_seconds": round(compile_seconds, 4),
+            "compiled_at": time.time(),
+            "uses": 0
+        }
+        print(f"⚙️ Compiled workflow '{name}' in {compile_seconds:.3f}s")
+        return compiled
+
+    def _get_checkpointer_locked(self):
+        # Called with self._lock held, so the property can't be used here
+        if not self._checkpointer_created:
+            self._checkpointer = create_checkpointer()
+            self._checkpointer_created = True
+        return self._checkpointer
+
+    def maybe_prune_checkpoints(self) -> None:
+        """Drop checkpoints older than WORKFLOW_CHECKPOINT_TTL_SECONDS, at most hourly, in the background"""
+        if settings.workflow_checkpoint_ttl_seconds <= 0:
+            return
+        with self._lock:
+            if time.time() - self._last_prune < self.PRUNE_INTERVAL_SECONDS:
+                return
+            self._last_prune = time.time()
+            checkpointer = self._get_checkpointer_locked()
+        if checkpointer is None:
+            return
+
+        def prune():
+            try:
+                removed = prune_checkpoints(checkpointer, settings.workflow_checkpoint_ttl_seconds)
+                if removed:
+                    print(f"🧹 Deleted checkpoints of {removed} abandoned generation(s)")
+            except Exception as e:
+                print(f"⚠️ Could not prune workflow checkpoints: {e}")
+
+        threading.Thread(target=prune, name="checkpoint-prune", daemon=True).start()
+
+    def warm_up(self) -> float:
+        """Compile every registered workflow up front and return the total time taken"""
+        start_time = time.perf_counter()
+        for name in list(self._factories):
+            self._ensure_compiled(name)
+        return time.perf_counter() - start_time
+
+    def get_metrics(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Compile time and usage count per workflow (None if not compiled yet)"""
+        return {name: (dict(self._metrics[name]) if name in self._metrics else None)
+                for name in self._factories}
+
+
+# Global registry instance
+workflow_registry = WorkflowRegistry()
@@ -0,0 +1,258 @@
+"""Runs the generation workflows end to end for the API and background workers"""
+
+import os
+import uuid
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Dict, Optional
+from .states import ResumeState, CoverLetterState
+from .registry import workflow_registry
+from .single_flight import generation_flights, generation_key
+from ..database import db
+
+# Called with an event name and a JSON-serializable payload
+EventCallback = Callable[[str, Dict[str, Any]], None]
+
+# Nodes whose LLM output is streamed token by token through on_event
+TOKEN_STREAM_NODES = {"generate_cover_letter", "generate_only_cover_letter"}
+
+
+class GenerationCancelled(Exception):
+    """Raised between workflow steps when a generation has been cancelled"""
+    pass
+
+
+class GenerationLeaseLost(Exception):
+    """Raised by a queue worker's should_cancel once another worker owns the job.
+
+    Unlike a cancellation the run's checkpoints are kept, since the new owner
+    resumes from them.
+    """
+    pass
+
+
+class GenerationRunner:
+    @staticmethod
+    def generate_resume_and_cover_letter(job_posting: str, company: str, position: str,
+                                         on_node: Optional[Callable[[str], None]] = None,
+                                         should_cancel: Optional[Callable[[], bool]] = None,
+                                         on_event: Optional[EventCallback] = None,
+                                         generation_id: Optional[str] = None,
+                                         reuse: bool = True) -> Dict[str, Any]:
+        """Generate both resume and cover letter; returns the API response payload.
+
+        With reuse=False the sections are always generated, even when a
+        near-identical past posting has stored ones.
+        """
+        # Save the job application to database with resume_generated = True
+        job_id = None
+        try:
+            job_id = db.save_job_application(company, position, job_posting, True)
+            print(f"💾 Saved job application to database with ID: {job_id}")
+        except Exception as e:
+            print(f"⚠️ Failed to save job application: {e}")
+
+        state = ResumeState(
+            job_posting=job_posting,
+            company=company,
+            position=position,
+            job_id=job_id,
+            reuse=reuse,
+            experiences="",
+            skills="",
+            project_names=[],
+            project_summaries="",
+            highlights="",
+            resume_latex="",
+            tex_file=None,
+            pdf_file=None,
+            context=[],
+            generation_metadata={}
+        )
+
+        print(f"🚀 Generating resume and cover letter for {position} at {company}")
+        result = GenerationRunner._run("resume_cover_letter", state, on_node, should_cancel,
+                                      on_event, generation_id)
+        cwd = os.getcwd()
+        print("🎁 Resume and cover letter created.")
+
+        return {
+            "status": "success",
+            "resume_path": os.path.abspath(os.path.join(cwd, result["resume_pdf_file"])),
+            "cover_letter_path": os.path.abspath(os.path.join(cwd, result["cover_letter_pdf_file"])),
+            "job_id": job_id,
+            "generation_id": generation_id
+        }
+
+    @staticmethod
+    def generate_cover_letter(job_posting: str, company: str, position: str,
+                              resume_file_path: str, resume_pdf_file: str,
+                              on_node: Optional[Callable[[str], None]] = None,
+                              should_cancel: Optional[Callable[[], bool]] = None,
+                              on_event: Optional[EventCallback] = None,
+                              generation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Generate only a cover letter from an existing (already resolved) resume file"""
+        # Queued jobs may run on another host than the one that resolved the path
+        if not os.path.exists(resume_file_path):
+            raise FileNotFoundError(f"Resume file not found on this host: {resume_file_path}")
+
+        # Save the job application to database with resume_generated = False (cover letter only)
+        job_id = None
+        try:
+            job_id = db.save_job_application(company, position, job_posting, False)
+            print(f"💾 Saved cover letter job application to database with ID: {job_id}")
+        except Exception as e:
+            print(f"⚠️ Failed to save job application: {e}")
+
+        state = CoverLetterState(
+            job_posting=job_posting,
+            company=company,
+            position=position,
+            resume_pdf_file=resume_file_path,  # Use the local file path
+            resume="",
+            cover_letter="",
+            cover_letter_latex="",
+            cover_letter_latex_file=None,
+            cover_letter_pdf_file=None,
+            context=[]
+        )
+
+        print(f"📝 Generating cover letter for {position} at {company}")
+        result = GenerationRunner._run("cover_letter", state, on_node, should_cancel,
+                                      on_event, generation_id)
+        cwd = os.getcwd()
+        print("📄 Cover letter created.")
+
+        return {
+            "status": "success",
+            "cover_letter_path": os.path.abspath(os.path.join(cwd, result["cover_letter_pdf_file"])),
+            "resume_path": resume_pdf_file,  # Return the original URL for frontend use
+            "job_id": job_id,
+            "generation_id": generation_id
+        }
+
+    @staticmethod
+    def run_job(kind: str, payload: Dict[str, Any],
+                on_node: Optional[Callable[[str], None]] = None,
+                should_cancel: Optional[Callable[[], bool]] = None,
+                on_event: Optional[EventCallback] = None,
+                generation_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run a generation described by a JSON-serializable kind and payload.
+
+        Runs that share a generation_id share checkpoints: if an earlier run with
+        the same id failed part-way, this one resumes from the failed node.
+
+        Identical requests (same kind and normalized payload) arriving while one is
+        already running attach to it and get its result instead of running the
+        workflow again and racing on the same output files.
+        """
+        runners = {
+            "resume_cover_letter": GenerationRunner.generate_resume_and_cover_letter,
+            "cover_letter": GenerationRunner.generate_cover_letter,
+        }
+        if kind not in runners:
+            raise ValueError(f"Unknown generation kind: {kind}")
+
+        key = generation_key(kind, payload)
+        future, leader = generation_flights.join(key)
+        if not leader:
+            print(f"🔗 Identical {kind} generation already running, waiting for its result")
+            if on_event:
+                on_event("attached", {"reason": "duplicate_in_flight"})
+            try:
+                return generation_flights.wait(key, future, should_cancel)
+            except CancelledError:
+                raise GenerationCancelled(f"{kind} generation was cancelled")
+
+        def cancel_requested() -> bool:
+            # Callers attached to this run still want its result
+            return bool(should_cancel and should_cancel()) and generation_flights.followers(key) == 0
+
+        try:
+            result = runners[kind](**payload, on_node=on_node, should_cancel=cancel_requested,
+                                   on_event=on_event, generation_id=generation_id or uuid.uuid4().hex)
+        except BaseException as e:
+            generation_flights.finish(key, future, error=e)
+            raise
+
+        generation_flights.finish(key, future, result=result)
+        return result
+
+    @staticmethod
+    def _run(workflow_name: str, state: dict,
+             on_node: Optional[Callable[[str], None]],
+             should_cancel: Optional[Callable[[], bool]],
+             on_event: Optional[EventCallback] = None,
+             generation_id: Optional[str] = None) -> dict:
+        """
+        Invoke a compiled workflow, reporting progress and checking for cancellation.
+
+        on_node is called with each finished node's name. on_event receives
+        ("node_started" | "node_finished", {"node", ...}) and, for the cover letter
+        nodes, ("token", {"node", "content"}) as the LLM streams its answer.
+        """
+        workflow = workflow_registry.get(workflow_name)
+        workflow_registry.maybe_prune_checkpoints()
+
+        # Nodes key per-run background work by the thread id, so it's set with or
+        # without a checkpointer
+        config = {"configurable": {"thread_id": generation_id}} if generation_id else None
+        run_input = state
+        if config is not None and workflow.checkpointer is not None:
+            snapshot = workflow.get_state(config)
+            if snapshot.next:
+                # An earlier attempt stopped before finishing: continue from its checkpoint
+                print(f"⏯️ Resuming generation {generation_id} at {', '.join(snapshot.next)}")
+                run_input = None
+
+        if on_node is None and should_cancel is None and on_event is None:
+            result = workflow.invoke(run_input, config)
+            GenerationRunner._discard_checkpoints(workflow, generation_id)
+            return result
+
+        stream_mode = ["tasks", "values"]
+        if on_event is not None:
+            stream_mode.append("messages")
+
+        result = state
+        stream = workflow.stream(run_input, config, stream_mode=stream_mode)
+        for mode, chunk in stream:
+            if mode == "values":
+                result = chunk
+            elif mode == "tasks":
+                finished = "result" in chunk
+                if finished and on_node is not None:
+                    on_node(chunk["name"])
+                if on_event is not None:
+                    if finished:
+                        error = chunk.get("error")
+                        on_event("node_finished", {
+                            "node": chunk["name"],
+                            "error": str(error) if error else None
+                        })
+                    else:
+                        on_event("node_started", {"node": chunk["name"]})
+            elif mode == "messages":
+                message, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if node in TOKEN_STREAM_NODES and message.content:
+                    on_event("token", {"node": node, "content": message.content})
+
+            if should_cancel is not None and should_cancel():
+                # A cancelled run is never resumed, so its checkpoints can go now
+                stream.close()
+                GenerationRunner._discard_checkpoints(workflow, generation_id)
+                raise GenerationCancelled(f"{workflow_name} generation was cancelled")
+
+        GenerationRunner._discard_checkpoints(workflow, generation_id)
+        return result
+
+    @staticmethod
+    def _discard_checkpoints(workflow, generation_id: Optional[str]) -> None:
+        """Checkpoints only matter until a run succeeds or is cancelled, so drop them afterwards"""
+        if not generation_id or workflow.checkpointer is None:
+            return
+        try:
+            workflow.checkpointer.delete_thread(generation_id)
+        except Exception as e:
+            print(f"⚠️ Could not delete checkpoints for generation {generation_id}: {e}")
@@ -0,0 +1,51 @@
+"""Checks that queue workers see the same files as the API server"""
+
+import os
+import json
+import socket
+import time
+from typing import List
+from ..config.settings import settings
+
+# Written into OUTPUT_DIR by the API server; a worker that can't see it is
+# looking at a different filesystem
+MARKER_FILE = ".aria-shared-storage"
+
+
+class SharedStorage:
+    """Queued jobs carry paths, not files: the resume a cover letter is based on and
+    the output PDFs are read and written by whichever worker claims the job. Every
+    worker must therefore see the API server's OUTPUT_DIR at the same path.
+    """
+
+    @staticmethod
+    def marker_path() -> str:
+        return os.path.join(settings.output_dir, MARKER_FILE)
+
+    @staticmethod
+    def mark() -> None:
+        """Record, from the API server, which output directory jobs will refer to"""
+        os.makedirs(settings.output_dir, exist_ok=True)
+        with open(SharedStorage.marker_path(), "w") as f:
+            json.dump({"host": socket.gethostname(), "output_dir": os.path.abspath(settings.output_dir),
+                       "marked_at": time.time()}, f)
+
+    @staticmethod
+    def problems() -> List[str]:
+        """Reasons this process can't run queued jobs; empty when the storage is shared"""
+        problems = []
+        if not os.path.exists(SharedStorage.marker_path()):
+            problems.append(
+                f"{SharedStorage.marker_path()} not found: start the API server with "
+                f"GENERATION_QUEUE_BACKEND=postgres first, and mount its OUTPUT_DIR at "
+                f"{os.path.abspath(settings.output_dir)} on this host"
+            )
+        for directory in (settings.resumes_dir, settings.cover_letters_dir):
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                problems.append(f"cannot create {directory}: {e}")
+                continue
+            if not os.access(directory, os.W_OK):
+                problems.append(f"{directory} is not writable")
+        return problems
@@ -0,0 +1,109 @@
+"""Single-flight de-duplication of identical concurrent generations"""
+
+import json
+import hashlib
+import threading
+from concurrent.futures import CancelledError, Future, TimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def generation_key(kind: str, payload: Dict[str, Any]) -> str:
+    """
+    Hash of a generation's normalized inputs.
+
+    Whitespace is collapsed everywhere and company/position are case-folded, so a
+    double-click or a re-trigger from the extension with slightly different spacing
+    maps to the same key.
+    """
+    normalized = {}
+    for field, value in payload.items():
+        if isinstance(value, str):
+            value = " ".join(value.split())
+            if field in ("company", "position"):
+                value = value.casefold()
+        normalized[field] = value
+
+    encoded = json.dumps({"kind": kind, "payload": normalized}, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one execution and its result."""
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._followers: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: str) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller is its leader"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._followers[key] += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self._followers[key] = 0
+            return future, True
+
+    def wait(self, key: str, future: Future, should_cancel: Optional[Callable[[], bool]] = None,
+             poll_interval: float = 0.5) -> Any:
+        """
+        Wait as a follower for the leader's result.
+
+        Checks should_cancel every poll_interval; once it is true the caller stops
+        counting as a follower (so the leader can be cancelled when nobody else is
+        waiting) and CancelledError is raised.
+        """
+        while True:
+            try:
+                return future.result(timeout=poll_interval if should_cancel else None)
+            except TimeoutError:
+                if should_cancel():
+                    self.leave(key, future)
+                    raise CancelledError()
+
+    def leave(self, key: str, future: Future) -> None:
+        """Stop waiting on the leader's result"""
+        with self._lock:
+            if self._calls.get(key) is future and self._followers[key] > 0:
+                self._followers[key] -= 1
+
+    def followers(self, key: str) -> int:
+        """How many callers are waiting on the leader's result"""
+        with self._lock:
+            return self._followers.get(key, 0)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn, or wait for the identical call already running and return its result"""
+        future, leader = self.join(key)
+        if not leader:
+            return self.wait(key, future)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+
+        self.finish(key, future, result=result)
+        return result
+
+    def finish(self, key: str, future: Future, result: Any = None,
+               error: Optional[BaseException] = None) -> None:
+        """Hand the leader's outcome to every follower and let the next call run afresh"""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+                del self._followers[key]
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+# Global single-flight group for generations in this process
+generation_flights = SingleFlight()
@@ -1,10 +1,15 @@
 """State definitions for LangGraph workflows"""
 
 from typing import List, Optional
-from typing_extensions import TypedDict
+from typing_extensions import Annotated, TypedDict
 from langchain_core.documents import Document
 
 
+def merge_metadata(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer that merges metadata written by nodes running in the same step"""
+    return {**(left or {}), **(right or {})}
+
+
 class ResumeState(TypedDict):
     """State definition for resume generation workflow"""
     
@@ -12,6 +17,8 @@ class ResumeState(TypedDict):
     job_posting: str
     company: str
     position: str
+    job_id: Optional[int]
+    reuse: bool
     
     # Intermediate results
     experiences: str
@@ -32,8 +39,8 @@ class ResumeState(TypedDict):
     # RAG context (for cover letters)
     context: List[Document]
     
-    # Metadata
-    generation_metadata: dict
+    # Metadata (merged across parallel branches)
+    generation_metadata: Annotated[dict, merge_metadata]
 
 
 class CoverLetterState(TypedDict):
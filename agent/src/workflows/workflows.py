@@ -1,60 +1,81 @@
-from langgraph.graph import StateGraph
+from langgraph.graph import StateGraph, START
 from .states import ResumeState, CoverLetterState
 from .nodes import Nodes
 
 
 class Worlflows:
-    def create_resume_workflow():
-        workflow = StateGraph(ResumeState)
+    def _add_resume_generation_nodes(workflow: StateGraph):
+        """
+        Add the resume content nodes, ending at generate_highlights.
 
+        Experiences, skills and project selection only depend on the job posting,
+        so they fan out and run concurrently. generate_highlights joins the three
+        branches once experiences, skills and project summaries are done. When a
+        near-identical past posting has stored sections, check_reusable_resume
+        fills them in and routes straight to generate_highlights instead.
+        """
+        workflow.add_node("check_reusable_resume", Nodes.check_reusable_resume_node)
         workflow.add_node("generate_experiences", Nodes.generate_experiences_node)
         workflow.add_node("generate_skills", Nodes.generate_skills_node)
         workflow.add_node("select_projects", Nodes.select_projects_node)
         workflow.add_node("generate_project_summaries", Nodes.generate_project_summaries_node)
         workflow.add_node("generate_highlights", Nodes.generate_highlights_node)
-        workflow.add_node("save_resume", Nodes.save_resume_node)
 
-        workflow.set_entry_point("generate_experiences")
-        workflow.add_edge("generate_experiences", "generate_skills")
-        workflow.add_edge("generate_skills", "select_projects")
+        workflow.add_edge(START, "check_reusable_resume")
+        workflow.add_conditional_edges(
+            "check_reusable_resume",
+            Nodes.route_resume_generation,
+            ["generate_experiences", "generate_skills", "select_projects", "generate_highlights"]
+        )
         workflow.add_edge("select_projects", "generate_project_summaries")
-        workflow.add_edge("generate_project_summaries", "generate_highlights")
+        workflow.add_edge(
+            ["generate_experiences", "generate_skills", "generate_project_summaries"],
+            "generate_highlights"
+        )
+
+    def create_resume_workflow(checkpointer=None):
+        workflow = StateGraph(ResumeState)
+
+        Worlflows._add_resume_generation_nodes(workflow)
+        workflow.add_node("save_resume", Nodes.save_resume_node)
+
         workflow.add_edge("generate_highlights", "save_resume")
         workflow.set_finish_point("save_resume")
 
-        return workflow.compile()
-    
-    def create_resume_cover_letter_workflow():
+        return workflow.compile(checkpointer=checkpointer)
+
+    def create_resume_cover_letter_workflow(checkpointer=None):
+        """
+        Resume and cover letter in one run.
+
+        The cover letter only needs the resume sections, not the PDF, so
+        start_resume_pdf hands pdflatex to a background worker and the run moves on
+        to context retrieval and the cover letter. await_resume_pdf joins the
+        compile after the cover letter is saved.
+        """
         workflow = StateGraph(ResumeState)
 
-        workflow.add_node("generate_experiences", Nodes.generate_experiences_node)
-        workflow.add_node("generate_skills", Nodes.generate_skills_node)
-        workflow.add_node("select_projects", Nodes.select_projects_node)
-        workflow.add_node("generate_project_summaries", Nodes.generate_project_summaries_node)
-        workflow.add_node("generate_highlights", Nodes.generate_highlights_node)
-        workflow.add_node("save_resume", Nodes.save_resume_node)
+        Worlflows._add_resume_generation_nodes(workflow)
+        workflow.add_node("start_resume_pdf", Nodes.start_resume_pdf_node)
         workflow.add_node("retrieve_context", Nodes.retrieve_context_node)
         workflow.add_node("generate_cover_letter", Nodes.generate_cover_letter_node)
         workflow.add_node("save_cover_letter", Nodes.save_cover_letter_node)
+        workflow.add_node("await_resume_pdf", Nodes.await_resume_pdf_node)
         workflow.add_node("add_cover_letter_context", Nodes.add_cover_letter_context_node)
         workflow.add_node("save_job_application", Nodes.save_job_application_node)
 
-        workflow.set_entry_point("generate_experiences")
-        workflow.add_edge("generate_experiences", "generate_skills")
-        workflow.add_edge("generate_skills", "select_projects")
-        workflow.add_edge("select_projects", "generate_project_summaries")
-        workflow.add_edge("generate_project_summaries", "generate_highlights")
-        workflow.add_edge("generate_highlights", "save_resume")
-        workflow.add_edge("save_resume", "retrieve_context")
+        workflow.add_edge("generate_highlights", "start_resume_pdf")
+        workflow.add_edge("start_resume_pdf", "retrieve_context")
         workflow.add_edge("retrieve_context", "generate_cover_letter")
         workflow.add_edge("generate_cover_letter", "save_cover_letter")
-        workflow.add_edge("save_cover_letter", "add_cover_letter_context")
+        workflow.add_edge("save_cover_letter", "await_resume_pdf")
+        workflow.add_edge("await_resume_pdf", "add_cover_letter_context")
         workflow.add_edge("add_cover_letter_context", "save_job_application")
         workflow.set_finish_point("save_job_application")
 
-        return workflow.compile()
-    
-    def create_cover_letter_worklflow():
+        return workflow.compile(checkpointer=checkpointer)
+
+    def create_cover_letter_worklflow(checkpointer=None):
         workflow = StateGraph(CoverLetterState)
 
         workflow.add_node("load_resume", Nodes.load_resume_node)
@@ -63,7 +84,7 @@ class Worlflows:
         workflow.add_node("save_cover_letter", Nodes.save_cover_letter_node)
         workflow.add_node("add_cover_letter_context", Nodes.add_cover_letter_context_node)
         workflow.add_node("save_job_application", Nodes.save_job_application_node)
-        
+
         workflow.set_entry_point("load_resume")
         workflow.add_edge("load_resume", "retrieve_context_only_cover_letter")
         workflow.add_edge("retrieve_context_only_cover_letter", "generate_only_cover_letter")
@@ -72,4 +93,4 @@ class Worlflows:
         workflow.add_edge("add_cover_letter_context", "save_job_application")
         workflow.set_finish_point("save_job_application")
 
-        return workflow.compile()
\ No newline at end of file
+        return workflow.compile(checkpointer=checkpointer)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Aria Generation Worker - Runs queued generations from the generation_jobs table.
+
+Start any number of these, on any number of hosts, next to an API server running
+with GENERATION_QUEUE_BACKEND=postgres. Workers claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so each job is handed to exactly one of them.
+
+Jobs refer to files by path (the resume a cover letter is based on, the output
+PDFs), so every worker must see the API server's OUTPUT_DIR at the same path,
+e.g. on a shared volume. The worker checks this before claiming anything.
+"""
+
+import os
+import sys
+import signal
+import socket
+import argparse
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.database import db
+from src.workflows.runner import GenerationRunner, GenerationCancelled, GenerationLeaseLost
+from src.workflows.shared_storage import SharedStorage
+
+
+class GenerationWorker:
+    """Polls the generation queue and runs claimed jobs, renewing their lease while they run."""
+
+    def __init__(self, worker_id: str, concurrency: int = 1, poll_interval: float = 2.0):
+        self.worker_id = worker_id
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.queue = db.generation_queue
+        # Renew well before the visibility timeout runs out
+        self.heartbeat_interval = max(self.queue.visibility_timeout / 3, 1)
+        self._stopping = threading.Event()
+
+    def stop(self, *_):
+        if not self._stopping.is_set():
+            print("🛑 Stopping after the current jobs finish...")
+        self._stopping.set()
+
+    def run(self) -> None:
+        problems = SharedStorage.problems()
+        if problems:
+            raise RuntimeError("Output storage isn't shared with the API server: " + "; ".join(problems))
+        if not self.queue.ensure_table():
+            raise RuntimeError("Could not create the generation_jobs table")
+
+        print(f"👷 Worker {self.worker_id} started with {self.concurrency} slot(s)")
+        threads = [
+            threading.Thread(target=self._poll, name=f"worker-{slot}", args=(f"{self.worker_id}/{slot}",))
+            for slot in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"👋 Worker {self.worker_id} stopped")
+
+    def _poll(self, slot_id: str) -> None:
+        while not self._stopping.is_set():
+            job = self.queue.claim(slot_id)
+            if job is None:
+                self._stopping.wait(self.poll_interval)
+                continue
+            self._process(slot_id, job)
+
+    def _process(self, slot_id: str, job: dict) -> None:
+        generation_id = job['id']
+        print(f"⚙️ {slot_id} running {job['kind']} generation {generation_id} "
+              f"(attempt {job['attempts']}/{job['max_attempts']})")
+
+        cancel_requested = threading.Event()
+        lease_lost = threading.Event()
+        finished = threading.Event()
+
+        def renew(completed_node=None):
+            state = self.queue.heartbeat(generation_id, slot_id, completed_node)
+            # None means the lease was lost to another worker
+            if state is None:
+                lease_lost.set()
+            elif state:
+                cancel_requested.set()
+
+        def should_cancel() -> bool:
+            if lease_lost.is_set():
+                # Stop without touching the job row or the checkpoints the new owner resumes from
+                raise GenerationLeaseLost(f"Lost the lease on generation {generation_id}")
+            return cancel_requested.is_set()
+
+        def keep_alive():
+            while not finished.wait(self.heartbeat_interval):
+                renew()
+
+        heartbeat = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat.start()
+        try:
+            result = GenerationRunner.run_job(
+                job['kind'], job['payload'],
+                on_node=renew,
+                should_cancel=should_cancel,
+                # Retries of this job resume from the node that failed
+                generation_id=generation_id
+            )
+            self.queue.complete(generation_id, slot_id, result)
+            print(f"🏁 Generation {generation_id} succeeded")
+        except GenerationLeaseLost:
+            print(f"⚠️ Generation {generation_id} was taken over by another worker, stopping")
+        except GenerationCancelled:
+            self.queue.mark_cancelled(generation_id, slot_id)
+            print(f"🛑 Generation {generation_id} cancelled")
+        except Exception as e:
+            print(f"❌ Generation {generation_id} failed: {e}")
+            self.queue.fail(generation_id, slot_id, str(e))
+        finally:
+            finished.set()
+            heartbeat.join()
+
+
+def main():
+    """
+    Main entry point for the Aria generation worker.
+    """
+    parser = argparse.ArgumentParser(description="Run queued Aria generations")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv('GENERATION_WORKER_CONCURRENCY', '1')),
+                        help="Generations to run at once in this process")
+    parser.add_argument("--poll-interval", type=float, default=float(os.getenv('GENERATION_WORKER_POLL_INTERVAL', '2')),
+                        help="Seconds to wait when the queue is empty")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}",
+                        help="Identifier recorded on claimed jobs")
+    args = parser.parse_args()
+
+    worker = GenerationWorker(args.worker_id, args.concurrency, args.poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+
+    try:
+        worker.run()
+    except Exception as e:
+        print(f"❌ Worker failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
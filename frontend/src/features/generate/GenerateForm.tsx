@@ -37,6 +37,7 @@ export default function GenerateForm({ extensionJobData }: GenerateFormProps) {
     similarJobs,
     isLoading,
     isLoadingSimilarJobs,
+    progress,
     error,
     
     // Handlers
@@ -97,6 +98,7 @@ export default function GenerateForm({ extensionJobData }: GenerateFormProps) {
             isLoading={isLoading}
             resumeStrategy={resumeStrategy}
             selectedTemplate={selectedTemplate}
+            progress={progress}
           />
         );
       case 'results':
@@ -1,15 +1,25 @@
 import { 
   Typography, 
   CircularProgress,
-  Stack
+  Stack,
+  List,
+  ListItem,
+  ListItemIcon,
+  ListItemText,
+  Paper
 } from "@mui/material";
+import { CheckCircle, RadioButtonUnchecked } from "@mui/icons-material";
 import type { GeneratingProps } from "../types";
+import { GENERATION_NODE_LABELS } from "../constants";
 
 export default function Generating({ 
   isLoading, 
   resumeStrategy, 
-  selectedTemplate 
+  selectedTemplate,
+  progress
 }: GeneratingProps) {
+  const steps = progress ? [...progress.completedNodes, ...progress.activeNodes] : [];
+
   return (
     <Stack spacing={3} alignItems="center" sx={{ py: 8 }}>
       <CircularProgress size={60} />
@@ -26,6 +36,28 @@ export default function Generating({
             : 'Creating custom resume...'}
         </Typography>
       )}
+      {steps.length > 0 && (
+        <List dense sx={{ width: '100%', maxWidth: 420 }}>
+          {steps.map(node => {
+            const done = progress!.completedNodes.includes(node);
+            return (
+              <ListItem key={node}>
+                <ListItemIcon>
+                  {done ? <CheckCircle color="success" /> : <RadioButtonUnchecked color="action" />}
+                </ListItemIcon>
+                <ListItemText primary={GENERATION_NODE_LABELS[node] || node} />
+              </ListItem>
+            );
+          })}
+        </List>
+      )}
+      {progress?.coverLetterPreview && (
+        <Paper variant="outlined" sx={{ p: 2, width: '100%', maxHeight: 240, overflow: 'auto' }}>
+          <Typography variant="body2" sx={{ whiteSpace: 'pre-wrap', fontFamily: 'monospace' }}>
+            {progress.coverLetterPreview}
+          </Typography>
+        </Paper>
+      )}
     </Stack>
   );
-}
\ No newline at end of file
+}
@@ -36,12 +36,31 @@ export const STEPPER_STEPS = ['Job Details', 'Personalization', 'Similar Jobs',
 
 export const API_ENDPOINTS = {
   GENERATE: 'http://localhost:8080/api/generate/',
+  GENERATE_STREAM: 'http://localhost:8080/api/generate/stream',
   GENERATE_COVER_LETTER: 'http://localhost:8080/api/generate/cover-letter/',
   SIMILAR_JOBS: 'http://localhost:8080/api/jobs/similar',
   RESUME_PREVIEW: 'http://localhost:8080/api/resumes/preview',
   GENERATED_RESUMES: 'http://localhost:8080/api/resumes/generated'
 } as const;
 
+// Human-readable labels for the workflow nodes reported while generating
+export const GENERATION_NODE_LABELS: Record<string, string> = {
+  check_reusable_resume: 'Checking for similar past resumes',
+  generate_experiences: 'Tailoring experiences',
+  generate_skills: 'Selecting skills',
+  select_projects: 'Choosing projects',
+  generate_project_summaries: 'Summarizing projects',
+  generate_highlights: 'Writing highlights',
+  save_resume: 'Compiling resume PDF',
+  start_resume_pdf: 'Compiling resume PDF in the background',
+  retrieve_context: 'Retrieving background context',
+  generate_cover_letter: 'Writing cover letter',
+  save_cover_letter: 'Compiling cover letter PDF',
+  await_resume_pdf: 'Finishing resume PDF',
+  add_cover_letter_context: 'Saving cover letter for future context',
+  save_job_application: 'Saving job application'
+};
+
 // Resume preview URL mapping
 export const RESUME_PREVIEW_MAPPING: Record<string, string> = {
   'ml-engineering': `${API_ENDPOINTS.RESUME_PREVIEW}/ml-engineering`,
@@ -6,7 +6,8 @@ import type {
   Step, 
   GeneratedPaths,
   SimilarJob,
-  SimilarJobsResponse
+  SimilarJobsResponse,
+  GenerationProgress
 } from "../types";
 import { API_ENDPOINTS, RESUME_PREVIEW_MAPPING } from "../constants";
 
@@ -34,6 +35,48 @@ const convertPathToUrl = (filePath: string): string => {
   return `${API_ENDPOINTS.GENERATED_RESUMES}/${encodeURIComponent(filename)}`;
 };
 
+// Ids match the backend's (32 hex characters), so they fit the queue's id column
+const newGenerationId = (): string => crypto.randomUUID().replace(/-/g, "");
+
+const EMPTY_PROGRESS: GenerationProgress = {
+  activeNodes: [],
+  completedNodes: [],
+  coverLetterPreview: ""
+};
+
+// Read a Server-Sent Events response body, calling onEvent for each complete event
+const readEventStream = async (
+  response: Response,
+  onEvent: (event: string, data: any) => void
+): Promise<void> => {
+  if (!response.body) throw new Error("Streaming is not supported by this browser");
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let event = "message";
+      let data = "";
+      for (const line of rawEvent.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      if (data) onEvent(event, JSON.parse(data));
+    }
+  }
+};
+
 interface ExtensionJobData {
   title?: string;
   company?: string;
@@ -64,7 +107,10 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
   const [similarJobs, setSimilarJobs] = useState<SimilarJob[]>([]);
   const [isLoadingSimilarJobs, setIsLoadingSimilarJobs] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
+  const [progress, setProgress] = useState<GenerationProgress>(EMPTY_PROGRESS);
   const [error, setError] = useState<string | null>(null);
+  // Kept after a failed run so "Generate" again resumes it from its checkpoint
+  const [generationId, setGenerationId] = useState<string | null>(null);
 
   // Handle Chrome extension job data
   useEffect(() => {
@@ -91,6 +137,8 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
       ...prev,
       [field]: event.target.value
     }));
+    // A different posting is a new generation, not a retry
+    setGenerationId(null);
   };
 
   const handleStartPersonalization = () => {
@@ -259,15 +307,21 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
     setError(null);
     setCurrentStep('generating');
     setIsLoading(true);
+    setProgress(EMPTY_PROGRESS);
+
+    const currentGenerationId = generationId ?? newGenerationId();
+    setGenerationId(currentGenerationId);
     
     try {
       const payload = {
         ...formData,
         strategy: resumeStrategy,
-        template: resumeStrategy === 'template' ? selectedTemplate : undefined
+        template: resumeStrategy === 'template' ? selectedTemplate : undefined,
+        generationId: currentGenerationId
       };
 
-      const response = await fetch(API_ENDPOINTS.GENERATE, {
+      // Stream node progress and cover letter tokens while the workflow runs
+      const response = await fetch(API_ENDPOINTS.GENERATE_STREAM, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(payload)
@@ -278,7 +332,28 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
         throw new Error(errorData.message || `HTTP ${response.status}`);
       }
       
-      const result = await response.json();
+      let result: any = null;
+      await readEventStream(response, (event, data) => {
+        if (event === 'node_started') {
+          setProgress(prev => ({ ...prev, activeNodes: [...prev.activeNodes, data.node] }));
+        } else if (event === 'node_finished') {
+          setProgress(prev => ({
+            ...prev,
+            activeNodes: prev.activeNodes.filter(node => node !== data.node),
+            completedNodes: [...prev.completedNodes, data.node]
+          }));
+        } else if (event === 'token') {
+          setProgress(prev => ({ ...prev, coverLetterPreview: prev.coverLetterPreview + data.content }));
+        } else if (event === 'error') {
+          throw new Error(data.message || 'Generation failed');
+        } else if (event === 'result') {
+          result = data;
+        }
+      });
+
+      if (!result) {
+        throw new Error('Generation ended without a result');
+      }
 
       setPaths({
         resumePath: convertPathToUrl(result["resume_path"]),
@@ -286,6 +361,7 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
       });
       console.log('Generation result:', result);
       
+      setGenerationId(null);
       setCurrentStep('results');
     } catch (error) {
       console.error('Generation error:', error);
@@ -370,6 +446,7 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
     setCurrentStep('input');
     setFormData({ jobDescription: "", companyName: "", positionTitle: "" });
     setPaths({ resumePath: "", coverLetterPath: "" });
+    setGenerationId(null);
     setError(null);
   };
 
@@ -383,6 +460,7 @@ export function useGenerateForm(extensionJobData?: ExtensionJobData | null) {
     similarJobs,
     isLoading,
     isLoadingSimilarJobs,
+    progress,
     error,
     
     // Handlers
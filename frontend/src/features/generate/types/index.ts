@@ -64,10 +64,17 @@ export interface TemplateSelectionProps {
   onBack: () => void;
 }
 
+export interface GenerationProgress {
+  activeNodes: string[];
+  completedNodes: string[];
+  coverLetterPreview: string;
+}
+
 export interface GeneratingProps {
   isLoading: boolean;
   resumeStrategy: ResumeStrategy;
   selectedTemplate: TemplateType;
+  progress?: GenerationProgress;
 }
 
 export interface ResultsProps {